@@ -16,6 +16,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/Duggyboi/agentic-infrastructure-framework",
     packages=find_packages(),
+    package_data={"src.analysis": ["taxonomy.json"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.10",
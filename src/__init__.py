@@ -6,8 +6,14 @@ Main package initialization
 __version__ = "0.1.0"
 __author__ = "DuggyBoi"
 
-from src.config import load_config
-from src.agents import create_agent
+from src.utils.lazy import lazy_attributes
+
+# Loaded on first use: src.agents pulls in crewai and langchain, which would
+# otherwise be paid by every ``import src.<anything>``
+__getattr__ = lazy_attributes(__name__, {
+    "load_config": ".config",
+    "create_agent": ".agents",
+})
 
 __all__ = [
     "load_config",
@@ -2,14 +2,18 @@
 Analysis package for video processing and insights extraction.
 """
 
-from .pipeline import AnalysisPipeline
-from .agents import (
-    TranscriptionAgent,
-    SummaryAgent,
-    ResearchAgent,
-    CategorizationAgent,
-    MatchingAgent
-)
+from src.utils.lazy import lazy_attributes
+
+# Agents and the pipeline are imported on first access so that light modules
+# (segmentation, corpus_stats, ...) can be used without loading them
+__getattr__ = lazy_attributes(__name__, {
+    "AnalysisPipeline": ".pipeline",
+    "TranscriptionAgent": ".agents",
+    "SummaryAgent": ".agents",
+    "ResearchAgent": ".agents",
+    "CategorizationAgent": ".agents",
+    "MatchingAgent": ".agents",
+})
 
 __all__ = [
     "AnalysisPipeline",
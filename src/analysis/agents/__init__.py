@@ -1,13 +1,18 @@
 """
 Analysis agents for video content analysis
 """
-from .base_agent import BaseAgent
-from .transcription_agent import TranscriptionAgent
-from .summary_agent import SummaryAgent
-from .research_agent import ResearchAgent
-from .categorization_agent import CategorizationAgent
-from .matching_agent import MatchingAgent
-from .proofreader_agent import ProofreaderAgent
+from src.utils.lazy import lazy_attributes
+
+# Each agent module is imported the first time its class is used
+__getattr__ = lazy_attributes(__name__, {
+    "BaseAgent": ".base_agent",
+    "TranscriptionAgent": ".transcription_agent",
+    "SummaryAgent": ".summary_agent",
+    "ResearchAgent": ".research_agent",
+    "CategorizationAgent": ".categorization_agent",
+    "MatchingAgent": ".matching_agent",
+    "ProofreaderAgent": ".proofreader_agent",
+})
 
 __all__ = [
     "BaseAgent",
@@ -3,10 +3,10 @@ Categorization Agent - Intelligent content classification using multi-source con
 Phase 2: Premium Implementation
 """
 from src.analysis.agents.base_agent import BaseAgent
-from typing import Dict, Any, List
+from src.analysis.taxonomy import load_taxonomy
+from typing import Dict, Any, List, Optional
 import logging
 import re
-from collections import Counter
 
 logger = logging.getLogger(__name__)
 
@@ -17,71 +17,30 @@ class CategorizationAgent(BaseAgent):
     
     Leverages research areas identified and summary insights for improved categorization.
     Assigns multiple categories with confidence scores and relevant tags.
-    """
-    
-    DEFAULT_CATEGORIES = [
-        "Educational",
-        "Entertainment", 
-        "News",
-        "Tutorial",
-        "Review",
-        "How-to",
-        "Vlog",
-        "Comedy",
-        "Technology",
-        "Business",
-        "Lifestyle",
-        "Gaming",
-        "Sports",
-        "Music",
-        "Art",
-        "Science",
-        "Politics",
-        "Health",
-        "Food",
-        "Travel"
-    ]
     
-    # Keywords associated with each category
-    CATEGORY_KEYWORDS = {
-        "Educational": ["learn", "explain", "teach", "course", "lesson", "education", "knowledge", "study", "understand", "concepts", "principles"],
-        "Entertainment": ["fun", "entertainment", "enjoy", "watch", "show", "amusing", "entertaining", "funny", "humor"],
-        "News": ["news", "report", "breaking", "happening", "current", "events", "update", "latest", "announcement"],
-        "Tutorial": ["tutorial", "guide", "how to", "step", "instruction", "demo", "walkthrough", "learn how"],
-        "Review": ["review", "opinion", "rating", "recommend", "verdict", "thoughts", "critique", "assessment"],
-        "How-to": ["how to", "guide", "process", "method", "technique", "procedure", "steps", "build", "create"],
-        "Vlog": ["vlog", "vlogging", "day in my life", "personal", "journal", "daily", "follow along"],
-        "Comedy": ["funny", "laugh", "comic", "joke", "humor", "hilarious", "comedy", "comedic"],
-        "Technology": ["tech", "software", "hardware", "code", "coding", "programming", "app", "digital", "algorithm", "system"],
-        "Business": ["business", "company", "corporate", "money", "finance", "marketing", "sales", "enterprise", "startup", "strategy"],
-        "Lifestyle": ["lifestyle", "routine", "wellness", "habit", "productivity", "self-improvement", "daily", "living"],
-        "Gaming": ["game", "gaming", "video game", "console", "esports", "stream", "gameplay", "gamer", "play"],
-        "Sports": ["sport", "athletic", "team", "competition", "athlete", "championship", "match", "tournament", "game"],
-        "Music": ["music", "song", "track", "musical", "instrument", "concert", "rhythm", "melody", "artist"],
-        "Art": ["art", "paint", "draw", "creative", "design", "aesthetic", "artist", "visual", "creative process"],
-        "Science": ["science", "scientific", "research", "experiment", "study", "data", "discovery", "theory", "hypothesis"],
-        "Politics": ["politics", "political", "election", "government", "policy", "parliament", "vote", "congress"],
-        "Health": ["health", "medical", "doctor", "disease", "fitness", "exercise", "wellness", "nutrition", "healthcare"],
-        "Food": ["food", "recipe", "cook", "cooking", "cuisine", "culinary", "eat", "restaurant", "dish"],
-        "Travel": ["travel", "journey", "destination", "trip", "explore", "adventure", "tourism", "visit", "location"]
-    }
+    Categories, keywords and boost rules come from the compiled taxonomy
+    (see src/analysis/taxonomy.py); ``taxonomy_path`` selects a custom file.
     
-    # Map research areas to categories
-    RESEARCH_AREA_CATEGORY_MAP = {
-        "Machine Learning": ["Technology", "Science", "Educational"],
-        "Data Science": ["Science", "Technology", "Educational"],
-        "Software Engineering": ["Technology", "How-to", "Tutorial"],
-        "Web Technology": ["Technology", "Tutorial", "How-to"],
-        "Product Development": ["Business", "Technology", "How-to"],
-        "Research & Innovation": ["Science", "Educational", "Technology"],
-        "Business & Strategy": ["Business", "Educational", "News"]
-    }
+    The creator's caption and hashtags (video metadata captured at download)
+    are classified along with the transcript and lead the tags.
+    """
     
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
-        self.categories = config.get("categories", self.DEFAULT_CATEGORIES) if config else self.DEFAULT_CATEGORIES
+        self.taxonomy = load_taxonomy(
+            self.config.get("taxonomy_path"),
+            cache_dir=self.config.get("taxonomy_cache_dir")
+        )
+        self.categories = self.config.get("categories", list(self.taxonomy.categories))
+        self._last_match = None
     
-    def execute(self, transcription_text: str, research_results: Dict[str, Any] = None, summary_results: Dict[str, Any] = None) -> Dict[str, Any]:
+    def execute(
+        self,
+        transcription_text: str,
+        research_results: Dict[str, Any] = None,
+        summary_results: Dict[str, Any] = None,
+        video_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Categorize and tag video content using multi-source context.
         
@@ -89,10 +48,15 @@ class CategorizationAgent(BaseAgent):
             transcription_text: Full transcription from TranscriptionAgent
             research_results: Research findings from ResearchAgent (optional)
             summary_results: Summary results from SummaryAgent (optional)
+            video_metadata: Caption and hashtags of the video (optional)
             
         Returns:
             Dict with categories, tags, and confidence scores
         """
+        metadata_text = self.metadata_text(video_metadata)
+        if metadata_text:
+            transcription_text = f"{transcription_text}\n{metadata_text}" if transcription_text else metadata_text
+        
         if not self._validate_input(transcription_text):
             return {
                 "categories": [],
@@ -107,7 +71,7 @@ class CategorizationAgent(BaseAgent):
             categories = self.classify(transcription_text, research_results, summary_results)
             
             # Extract tags
-            tags = self.extract_tags(transcription_text, research_results, summary_results)
+            tags = self.extract_tags(transcription_text, research_results, summary_results, video_metadata=video_metadata)
             
             # Determine primary category
             primary = categories[0]["name"] if categories else None
@@ -142,26 +106,13 @@ class CategorizationAgent(BaseAgent):
             List of categories with confidence scores (0-100)
         """
         try:
-            text_lower = text.lower()
+            taxonomy = self.taxonomy
             category_scores = {}
             
             # 1. Base scoring from keyword matches with minimum thresholds
-            for category, keywords in self.CATEGORY_KEYWORDS.items():
-                score = 0
-                matched_keywords = 0
-                
-                for keyword in keywords:
-                    # Use word boundary matching for more accuracy
-                    if self._is_keyword_present(text_lower, keyword):
-                        count = text_lower.count(keyword)
-                        score += min(count, 3)  # Cap at 3 per keyword
-                        matched_keywords += 1
-                
-                # Only include categories with meaningful keyword presence
-                # Weak categories (Music, Entertainment, Vlog) need stronger evidence
-                weak_categories = {"Music", "Entertainment", "Vlog", "Comedy"}
-                min_keywords = 3 if category in weak_categories else 1
-                
+            # Weak categories (Music, Entertainment, Vlog) need stronger evidence
+            for category, (score, matched_keywords) in taxonomy.category_scores(self._match(text)).items():
+                min_keywords = taxonomy.weak_min_keywords if category in taxonomy.weak_categories else 1
                 if matched_keywords >= min_keywords:
                     category_scores[category] = score
             
@@ -172,67 +123,43 @@ class CategorizationAgent(BaseAgent):
                 if research_areas:
                     research_domain = research_areas[0]  # Primary domain
             
-            # 3. Boost technical categories if research domain is tech-focused
-            if research_domain in ["Machine Learning", "Data Science", "Software Engineering", "Web Technology"]:
-                # Suppress non-technical categories
-                for weak_cat in ["Music", "Entertainment", "Comedy", "Vlog", "Art", "Food", "Travel"]:
+            # 3. Suppress off-domain categories and boost on-domain ones
+            rule = taxonomy.rule_for_domain(research_domain)
+            if rule:
+                for weak_cat in rule.suppress:
                     if weak_cat in category_scores:
-                        category_scores[weak_cat] = category_scores[weak_cat] * 0.3  # Reduce to 30%
+                        category_scores[weak_cat] = category_scores[weak_cat] * rule.suppress_factor
                 
-                # Boost technical categories
-                category_scores["Technology"] = category_scores.get("Technology", 0) + 40
-                category_scores["Science"] = category_scores.get("Science", 0) + 30
-                category_scores["Educational"] = category_scores.get("Educational", 0) + 25
+                for category, boost in rule.boost:
+                    category_scores[category] = category_scores.get(category, 0) + boost
             
-            # 4. Boost business categories if research domain is business
-            elif research_domain == "Business & Strategy":
-                for weak_cat in ["Music", "Entertainment", "Comedy", "Vlog"]:
-                    if weak_cat in category_scores:
-                        category_scores[weak_cat] = category_scores[weak_cat] * 0.2
-                
-                category_scores["Business"] = category_scores.get("Business", 0) + 40
-                category_scores["Educational"] = category_scores.get("Educational", 0) + 20
-            
-            # 5. Boost based on research topics
+            # 4. Boost based on research topics
             if research_results and "topics_extracted" in research_results:
                 topics = research_results.get("topics_extracted", [])
-                topic_str = " ".join(topics).lower()
+                topic_counts = taxonomy.match(" ".join(topics))
                 
-                # Tech/science indicators
-                tech_keywords = ["ai", "llm", "model", "algorithm", "code", "software", "data", "system", "optimization"]
-                science_keywords = ["research", "study", "experiment", "analysis", "theory", "hypothesis"]
-                business_keywords = ["business", "market", "strategy", "product", "company"]
-                
-                tech_count = sum(1 for kw in tech_keywords if kw in topic_str)
-                science_count = sum(1 for kw in science_keywords if kw in topic_str)
-                business_count = sum(1 for kw in business_keywords if kw in topic_str)
-                
-                if tech_count >= 2:
-                    category_scores["Technology"] = category_scores.get("Technology", 0) + 25
-                if science_count >= 2:
-                    category_scores["Science"] = category_scores.get("Science", 0) + 25
-                if business_count >= 2:
-                    category_scores["Business"] = category_scores.get("Business", 0) + 25
+                for topic_boost in taxonomy.topic_boosts:
+                    if len(topic_boost.keyword_ids.intersection(topic_counts)) >= topic_boost.min_matches:
+                        category_scores[topic_boost.category] = category_scores.get(topic_boost.category, 0) + topic_boost.boost
             
-            # 6. Boost educational content if summary has key takeaways
-            if summary_results and "key_takeaways" in summary_results:
+            # 5. Boost educational content if summary has key takeaways
+            if taxonomy.takeaway_category and summary_results and "key_takeaways" in summary_results:
                 takeaways = summary_results.get("key_takeaways", [])
-                if len(takeaways) >= 3:
-                    category_scores["Educational"] = category_scores.get("Educational", 0) + 30
+                if len(takeaways) >= taxonomy.takeaway_min:
+                    category_scores[taxonomy.takeaway_category] = category_scores.get(taxonomy.takeaway_category, 0) + taxonomy.takeaway_boost
             
-            # 7. Remove unreliable categories if they have very low scores relative to top category
+            # 6. Remove unreliable categories if they have very low scores relative to top category
             if category_scores:
                 max_score = max(category_scores.values())
-                threshold = max_score * 0.15  # Remove categories with <15% of max score
+                threshold = max_score * taxonomy.weak_relative_threshold
                 
-                weak_cats_to_check = ["Music", "Entertainment", "Comedy", "Vlog"]
-                for cat in weak_cats_to_check:
+                for cat in taxonomy.weak_categories:
                     if cat in category_scores and category_scores[cat] < threshold:
                         del category_scores[cat]
             
             # Fallback
             if not category_scores:
-                category_scores[self.DEFAULT_CATEGORIES[0]] = 20
+                category_scores[self.taxonomy.fallback_category] = 20
             
             # Normalize scores to confidence (0-100)
             max_score = max(category_scores.values()) if category_scores else 1
@@ -250,27 +177,19 @@ class CategorizationAgent(BaseAgent):
             logger.error(f"Classification error: {e}")
             return []
     
-    def _is_keyword_present(self, text: str, keyword: str) -> bool:
-        """
-        Check if keyword is present with word boundary awareness.
-        
-        Args:
-            text: Text to search in
-            keyword: Keyword to find
-            
-        Returns:
-            True if keyword is found
-        """
-        # For multi-word keywords, just check substring
-        if " " in keyword:
-            return keyword in text
-        
-        # For single words, use word boundary matching
-        import re
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        return bool(re.search(pattern, text))
+    def _match(self, text: str):
+        """Keyword counts for text; classify() and extract_tags() share one scan."""
+        if self._last_match is None or self._last_match[0] is not text:
+            self._last_match = (text, self.taxonomy.match(text))
+        return self._last_match[1]
     
-    def categorize(self, transcription: str, research_results: Dict[str, Any] = None, summary_results: Dict[str, Any] = None) -> Dict[str, Any]:
+    def categorize(
+        self,
+        transcription: str,
+        research_results: Dict[str, Any] = None,
+        summary_results: Dict[str, Any] = None,
+        video_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Categorize transcription with optional context (pipeline-compatible method).
         
@@ -278,13 +197,36 @@ class CategorizationAgent(BaseAgent):
             transcription: Text to categorize
             research_results: Research findings for context
             summary_results: Summary for context
+            video_metadata: Caption and hashtags of the video
             
         Returns:
             Dictionary with categories and tags (alias for execute)
         """
-        return self.execute(transcription, research_results, summary_results)
+        return self.execute(transcription, research_results, summary_results, video_metadata)
+    
+    @staticmethod
+    def metadata_text(video_metadata: Optional[Dict[str, Any]]) -> str:
+        """
+        Caption and hashtags as text for keyword matching.
+        
+        CamelCase hashtags are split into words ("#MealPrep" -> "Meal Prep")
+        so they match taxonomy keywords.
+        """
+        if not video_metadata:
+            return ""
+        
+        hashtags = [re.sub(r'(?<=[a-z0-9])(?=[A-Z])', ' ', tag) for tag in video_metadata.get("hashtags") or []]
+        parts = [video_metadata.get("title") or "", video_metadata.get("caption") or "", " ".join(hashtags)]
+        return "\n".join(part for part in parts if part)
     
-    def extract_tags(self, text: str, research_results: Dict[str, Any] = None, summary_results: Dict[str, Any] = None, num_tags: int = 12) -> List[str]:
+    def extract_tags(
+        self,
+        text: str,
+        research_results: Dict[str, Any] = None,
+        summary_results: Dict[str, Any] = None,
+        num_tags: int = 12,
+        video_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         """
         Extract relevant tags and hashtags from text and research context.
         
@@ -293,6 +235,7 @@ class CategorizationAgent(BaseAgent):
             research_results: Research findings to extract tags from
             summary_results: Summary to extract tags from
             num_tags: Maximum number of tags to extract
+            video_metadata: Video metadata whose hashtags become the first tags
             
         Returns:
             List of tag strings
@@ -300,7 +243,9 @@ class CategorizationAgent(BaseAgent):
         try:
             tags = []
             
-            # 1. Extract existing hashtags
+            # 1. The creator's own hashtags, then any in the text
+            if video_metadata:
+                tags.extend(tag.lower() for tag in video_metadata.get("hashtags") or [])
             hashtags = re.findall(r'#\w+', text)
             tags.extend([tag[1:].lower() for tag in hashtags])
             
@@ -309,11 +254,9 @@ class CategorizationAgent(BaseAgent):
             tags.extend([p.lower() for p in phrases if len(p) > 2])
             
             # 3. Extract keywords from all category keywords that appear in text
-            text_lower = text.lower()
-            for category, keywords in self.CATEGORY_KEYWORDS.items():
-                for keyword in keywords:
-                    if keyword in text_lower and keyword not in tags and len(keyword) > 2:
-                        tags.append(keyword)
+            for keyword in self.taxonomy.category_keywords_found(self._match(text)):
+                if keyword not in tags and len(keyword) > 2:
+                    tags.append(keyword)
             
             # 4. Add research topics as tags
             if research_results and "topics_extracted" in research_results:
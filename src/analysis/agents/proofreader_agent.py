@@ -6,10 +6,13 @@ Phase 2: Premium Implementation
 from src.analysis.agents.base_agent import BaseAgent
 from typing import Dict, Any, Optional
 import logging
-import requests
 import json
 from datetime import datetime
 
+from src.utils.lazy import lazy_module
+
+requests = lazy_module("requests")
+
 logger = logging.getLogger(__name__)
 
 
@@ -126,6 +129,13 @@ class ProofreaderAgent(BaseAgent):
             char_count = len(transcription)
             word_count = len(transcription.split())
             
+            # Reuse the pipeline's sentence spans rather than re-splitting
+            sentence_spans = results.get("sentence_spans")
+            if sentence_spans is None:
+                from src.analysis.segmentation import split_sentences
+                sentence_spans = split_sentences(transcription)
+            sentence_count = len(sentence_spans)
+            
             # Check for reasonable length
             quality_score = 100
             issues = []
@@ -163,6 +173,7 @@ Provide a brief quality assessment:"""
                 "quality_score": max(0, quality_score),
                 "char_count": char_count,
                 "word_count": word_count,
+                "sentence_count": sentence_count,
                 "issues": issues,
                 "ollama_assessment": assessment
             }
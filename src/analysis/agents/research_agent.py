@@ -3,7 +3,10 @@ Research Agent - Extract topics and generate intelligent research findings
 Phase 2: Premium Implementation
 """
 from src.analysis.agents.base_agent import BaseAgent
-from typing import Dict, Any, List, Tuple
+from src.analysis.corpus_stats import get_corpus_stats
+from src.analysis.segmentation import split_sentences, sentence_texts
+from src.analysis.taxonomy import load_taxonomy
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import re
 from collections import Counter
@@ -39,13 +42,20 @@ class ResearchAgent(BaseAgent):
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
         self.max_results = config.get("max_research_results", 8) if config else 8
+        self._corpus = get_corpus_stats(self.config.get("results_dir", "results"))
+        self.taxonomy = load_taxonomy(
+            self.config.get("taxonomy_path"),
+            cache_dir=self.config.get("taxonomy_cache_dir")
+        )
     
-    def execute(self, transcription_text: str) -> Dict[str, Any]:
+    def execute(self, transcription_text: str, sentence_spans: Optional[List] = None) -> Dict[str, Any]:
         """
         Extract topics and generate research findings from transcription.
         
         Args:
             transcription_text: Full transcription from TranscriptionAgent
+            sentence_spans: Precomputed sentence spans over the transcription
+                (split here if omitted)
             
         Returns:
             Dict with findings, topics, and research insights
@@ -66,7 +76,10 @@ class ResearchAgent(BaseAgent):
             logger.info(f"Extracted {len(topics)} topics")
             
             # Generate research findings
-            findings = self.generate_findings(transcription_text, topics)
+            if sentence_spans is None:
+                sentence_spans = split_sentences(transcription_text)
+            sentences = sentence_texts(transcription_text, sentence_spans)
+            findings = self.generate_findings(transcription_text, topics, sentences=sentences)
             
             # Identify research areas
             research_areas = self.identify_research_areas(transcription_text)
@@ -183,7 +196,7 @@ class ResearchAgent(BaseAgent):
     
     def _extract_important_words(self, text: str, num_words: int = 5) -> List[str]:
         """
-        Extract high-value individual words.
+        Extract high-value individual words, ranked by TF-IDF.
         
         Args:
             text: Text to analyze
@@ -193,20 +206,21 @@ class ResearchAgent(BaseAgent):
             List of important words
         """
         words = text.lower().split()
-        word_freq = Counter(
+        word_freq = self._corpus.weight_counts(Counter(
             w.strip(',.!?()[]{}') for w in words 
             if w.strip(',.!?()[]{}') not in self.STOP_WORDS and len(w) > 4
-        )
+        ))
         
         return [w for w, _ in word_freq.most_common(num_words)]
     
-    def generate_findings(self, text: str, topics: List[Tuple[str, float]]) -> List[str]:
+    def generate_findings(self, text: str, topics: List[Tuple[str, float]], sentences: Optional[List[str]] = None) -> List[str]:
         """
         Generate research findings based on topics and text patterns.
         
         Args:
             text: Original transcription
             topics: List of (topic, confidence) tuples
+            sentences: Sentences of the transcription (split here if omitted)
             
         Returns:
             List of finding strings
@@ -214,7 +228,9 @@ class ResearchAgent(BaseAgent):
         try:
             findings = []
             used_sentences = set()  # Track which sentences we've already used
-            sentences = [s.strip() for s in text.split('.') if s.strip() and len(s.strip()) > 15]
+            if sentences is None:
+                sentences = sentence_texts(text, split_sentences(text))
+            sentences = [s for s in sentences if len(s) > 15]
             
             # For each topic, find supporting evidence
             for topic, confidence in topics[:self.max_results]:
@@ -359,7 +375,7 @@ class ResearchAgent(BaseAgent):
     
     def identify_research_areas(self, text: str) -> List[str]:
         """
-        Identify broader research areas/domains discussed.
+        Identify broader research areas/domains discussed (from the taxonomy).
         
         Args:
             text: Transcription text
@@ -368,38 +384,20 @@ class ResearchAgent(BaseAgent):
             List of research area categories
         """
         try:
-            text_lower = text.lower()
-            research_areas = []
-            
-            # Domain mappings
-            domain_keywords = {
-                "Machine Learning": ["ai", "artificial intelligence", "llm", "model", "training", "neural", "algorithm"],
-                "Data Science": ["data", "analysis", "statistics", "dataset", "query", "vector"],
-                "Software Engineering": ["code", "software", "build", "deploy", "architecture", "implementation"],
-                "Web Technology": ["web", "api", "frontend", "backend", "database", "service"],
-                "Product Development": ["product", "feature", "user", "design", "system", "development"],
-                "Research & Innovation": ["research", "study", "experiment", "discover", "explore", "novel"],
-                "Business & Strategy": ["business", "market", "strategy", "company", "enterprise", "solution"]
-            }
-            
-            for area, keywords in domain_keywords.items():
-                keyword_count = sum(1 for k in keywords if k in text_lower)
-                if keyword_count >= 2:
-                    research_areas.append(area)
-            
-            return research_areas[:4] if research_areas else ["Content Analysis"]
+            return self.taxonomy.matched_research_areas(self.taxonomy.match(text))
         except Exception as e:
             logger.error(f"Research area identification error: {e}")
             return ["Content Analysis"]
     
-    def research(self, transcription: str) -> Dict[str, Any]:
+    def research(self, transcription: str, sentence_spans: Optional[List] = None) -> Dict[str, Any]:
         """
         Research topics in transcription (pipeline-compatible method).
         
         Args:
             transcription: Text to research
+            sentence_spans: Precomputed sentence spans over the transcription
             
         Returns:
             Dictionary with findings and topics (alias for execute)
         """
-        return self.execute(transcription)
+        return self.execute(transcription, sentence_spans)
@@ -3,11 +3,15 @@ Summary Agent - Generate high-quality summaries using LLM
 Phase 2: Premium Implementation
 """
 from src.analysis.agents.base_agent import BaseAgent
-from typing import Dict, Any, List
+from src.analysis.corpus_stats import get_corpus_stats
+from src.analysis.segmentation import split_sentences, sentence_texts
+from src.analysis.text_cleaning import TranscriptCleaner
+from typing import Dict, Any, List, Optional
 import logging
 import json
-import re
+import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +21,12 @@ class SummaryAgent(BaseAgent):
     Generate concise summaries of video content using intelligent text processing.
     
     Extracts summary and key takeaways from transcription with priority-aware highlighting.
+    
+    With ``summary_mode: "llm"`` the summary is written by an Ollama model:
+    long transcripts are split into sentence-aligned chunks that are
+    summarized in parallel (bounded by ``summary_llm_workers``) and then
+    merged. If the model is unavailable or the whole map-reduce exceeds
+    ``summary_llm_budget`` seconds, the extractive summary is used instead.
     """
     
     # Stop words to ignore in frequency analysis
@@ -33,13 +43,23 @@ class SummaryAgent(BaseAgent):
         super().__init__(config)
         self._llm = None
         self._initialized = False
+        self._corpus = get_corpus_stats(self.config.get("results_dir", "results"))
+        
+        self.mode = self.config.get("summary_mode", "extractive")
+        self.ollama_host = self.config.get("ollama_host", "http://localhost:11434")
+        self.ollama_model = self.config.get("ollama_model", "mistral")
+        self.llm_budget = float(self.config.get("summary_llm_budget", 60))
+        self.llm_workers = max(1, int(self.config.get("summary_llm_workers", 3)))
+        self.chunk_chars = max(500, int(self.config.get("summary_chunk_chars", 3000)))
     
-    def execute(self, transcription_text: str) -> Dict[str, Any]:
+    def execute(self, transcription_text: str, sentence_spans: Optional[List] = None) -> Dict[str, Any]:
         """
         Generate summary from transcription.
         
         Args:
             transcription_text: Full transcription from TranscriptionAgent
+            sentence_spans: Precomputed sentence spans over the transcription
+                (split here if omitted)
             
         Returns:
             Dict with summary and key takeaways
@@ -59,19 +79,36 @@ class SummaryAgent(BaseAgent):
         try:
             logger.info(f"Generating summary from {len(transcription_text)} chars")
             
-            # Clean and normalize transcription
-            cleaned_text = self._clean_transcription(transcription_text)
+            if sentence_spans is None:
+                sentence_spans = split_sentences(transcription_text)
+            
+            # Clean each sentence once; together they form the cleaned text
+            sentences = [
+                cleaned for cleaned in (
+                    self._clean_transcription(raw)
+                    for raw in sentence_texts(transcription_text, sentence_spans)
+                ) if cleaned
+            ]
+            cleaned_text = " ".join(sentences)
             
-            # Generate intelligent summary
-            summary = self._generate_intelligent_summary(cleaned_text)
+            # Abstractive summary first (if enabled), extractive as the fallback
+            summary = None
+            mode_used = "extractive"
+            if self.mode == "llm":
+                summary = self._generate_llm_summary(sentences)
+                if summary:
+                    mode_used = "llm"
+            if not summary:
+                summary = self._generate_intelligent_summary(cleaned_text, sentences=sentences)
             
             # Extract priority-aware key takeaways
-            key_takeaways = self.extract_key_takeaways(cleaned_text, num_points=5)
+            key_takeaways = self.extract_key_takeaways(cleaned_text, num_points=5, sentences=sentences)
             
             return {
                 "summary": summary if summary else "[Summary generation failed]",
                 "key_takeaways": key_takeaways,
-                "char_count": len(transcription_text)
+                "char_count": len(transcription_text),
+                "summary_mode": mode_used
             }
         except Exception as e:
             logger.error(f"Summary generation error: {str(e)}", exc_info=True)
@@ -81,64 +118,182 @@ class SummaryAgent(BaseAgent):
                 "error": str(e)
             }
     
-    def summarize(self, transcription: str) -> Dict[str, Any]:
+    def summarize(self, transcription: str, sentence_spans: Optional[List] = None) -> Dict[str, Any]:
         """
         Summarize transcription (pipeline-compatible method).
         
         Args:
             transcription: Text to summarize
+            sentence_spans: Precomputed sentence spans over the transcription
             
         Returns:
             Dictionary with summary and key takeaways (alias for execute)
         """
-        return self.execute(transcription)
+        return self.execute(transcription, sentence_spans)
     
     def _clean_transcription(self, text: str) -> str:
         """
         Clean and normalize transcription text.
         
+        Filler removal, whitespace collapsing and punctuation normalization
+        run as one precompiled pass (see TranscriptCleaner).
+        
         Args:
             text: Raw transcription
             
         Returns:
             Cleaned text
         """
-        # Fix common speech-to-text issues
-        text = re.sub(r'\b(um|uh|hmm|like|you know|basically|literally)\b', '', text, flags=re.IGNORECASE)
+        return TranscriptCleaner.clean(text)
+    
+    def _generate_llm_summary(self, sentences: List[str]) -> Optional[str]:
+        """
+        Map-reduce an abstractive summary through Ollama within the latency budget.
+        
+        Args:
+            sentences: Cleaned transcript sentences
+            
+        Returns:
+            Summary text, or None to fall back to the extractive summary
+        """
+        deadline = time.monotonic() + self.llm_budget
+        
+        if not self._ensure_llm():
+            logger.info("Ollama unavailable - using extractive summary")
+            return None
+        
+        texts = self._pack_chunks(sentences)
+        prompt = (
+            "Summarize this part of a video transcript in 2-3 sentences. "
+            "Keep concrete facts and names.\n\nTranscript:\n{text}\n\nSummary:"
+        )
+        
+        # Each round summarizes groups of texts in parallel until one remains
+        while texts:
+            results = self._map_prompts([prompt.format(text=t) for t in texts], deadline)
+            if results is None:
+                logger.warning(f"LLM summary exceeded {self.llm_budget:g}s budget - using extractive summary")
+                return None
+            
+            if len(results) == 1:
+                return results[0]
+            
+            texts = self._pack_chunks(results)
+            if len(texts) >= len(results):
+                # Partials too long to pack together; merge them in one request
+                texts = ["\n".join(results)]
+            prompt = (
+                "Combine these partial summaries of one video into a single coherent "
+                "summary of 3-4 sentences.\n\nPartial summaries:\n{text}\n\nSummary:"
+            )
+        
+        return None
+    
+    def _ensure_llm(self) -> bool:
+        """Connect to Ollama once per agent; the session is reused by all chunk requests."""
+        if not self._initialized:
+            self._initialized = True
+            try:
+                import requests
+                
+                session = requests.Session()
+                response = session.get(f"{self.ollama_host}/api/tags", timeout=1)
+                if response.status_code == 200:
+                    self._llm = session
+            except Exception as e:
+                logger.warning(f"Ollama not available at {self.ollama_host}: {e}")
+        
+        return self._llm is not None
+    
+    def _pack_chunks(self, texts: List[str]) -> List[str]:
+        """Greedily pack consecutive texts into chunks of at most chunk_chars."""
+        chunks = []
+        current = []
+        size = 0
+        for text in texts:
+            if current and size + len(text) > self.chunk_chars:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            current.append(text)
+            size += len(text) + 1
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+    
+    def _map_prompts(self, prompts: List[str], deadline: float) -> Optional[List[str]]:
+        """
+        Run prompts concurrently, bounded by llm_workers and the deadline.
         
-        # Fix spacing
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\s+([.,!?])', r'\1', text)
+        Returns:
+            Responses in prompt order, or None if any failed or ran out of time
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
         
-        # Remove repeated punctuation
-        text = re.sub(r'\.+', '.', text)
-        text = re.sub(r'!+', '!', text)
+        executor = ThreadPoolExecutor(max_workers=min(self.llm_workers, len(prompts)))
+        try:
+            futures = [executor.submit(self._query_ollama, p, deadline) for p in prompts]
+            done, not_done = wait(futures, timeout=remaining)
+            if not_done:
+                return None
+            
+            responses = [f.result() for f in futures]
+            return responses if all(responses) else None
+        finally:
+            # Don't wait for stragglers; their HTTP timeouts end at the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _query_ollama(self, prompt: str, deadline: float) -> str:
+        """Send one generate request, never waiting past the deadline."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return ""
         
-        return text.strip()
+        try:
+            response = self._llm.post(
+                f"{self.ollama_host}/api/generate",
+                json={
+                    "model": self.ollama_model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": {"temperature": 0.3}
+                },
+                timeout=remaining
+            )
+            if response.status_code == 200:
+                return response.json().get("response", "").strip()
+            logger.warning(f"Ollama returned status {response.status_code}")
+        except Exception as e:
+            logger.warning(f"Ollama summary request failed: {e}")
+        return ""
     
-    def _generate_intelligent_summary(self, text: str, max_sentences: int = 3) -> str:
+    def _generate_intelligent_summary(self, text: str, max_sentences: int = 3, sentences: Optional[List[str]] = None) -> str:
         """
         Generate summary using importance scoring.
         
         Args:
             text: Cleaned text
             max_sentences: Target summary length
+            sentences: Sentences of the cleaned text (split here if omitted)
             
         Returns:
             Summary text
         """
         try:
-            sentences = [s.strip() for s in text.split('.') if s.strip() and len(s.strip()) > 20]
+            if sentences is None:
+                sentences = sentence_texts(text, split_sentences(text))
+            sentences = [s for s in sentences if len(s) > 20]
             
             if len(sentences) <= max_sentences:
-                return '. '.join(sentences) + '.'
+                return ' '.join(sentences)
             
-            # Calculate word frequencies (excluding stop words)
+            # Calculate word frequencies (excluding stop words), weighted by corpus IDF
             words = text.lower().split()
-            word_freq = Counter(
+            word_freq = self._corpus.weight_counts(Counter(
                 w.strip(',.!?()[]{}') for w in words 
                 if w.strip(',.!?()[]{}') not in self.STOP_WORDS and len(w) > 3
-            )
+            ))
             
             # Score sentences by cumulative word importance
             sentence_scores = {}
@@ -164,26 +319,29 @@ class SummaryAgent(BaseAgent):
             
             # Select top sentences maintaining original order
             top_indices = sorted(sorted(range(len(sentences)), key=lambda i: sentence_scores.get(i, 0), reverse=True)[:max_sentences])
-            summary = '. '.join(sentences[i] for i in top_indices) + '.'
+            summary = ' '.join(sentences[i] for i in top_indices)
             
             return summary
         except Exception as e:
             logger.error(f"Intelligent summarization error: {e}")
             return text.split('.')[0] + '.' if text else "[Summary failed]"
     
-    def extract_key_takeaways(self, text: str, num_points: int = 5) -> List[str]:
+    def extract_key_takeaways(self, text: str, num_points: int = 5, sentences: Optional[List[str]] = None) -> List[str]:
         """
         Extract key takeaways based on topic priority and frequency.
         
         Args:
             text: Cleaned text
             num_points: Number of key points to extract
+            sentences: Sentences of the cleaned text (split here if omitted)
             
         Returns:
             List of key takeaway strings ordered by priority
         """
         try:
-            sentences = [s.strip() for s in text.split('.') if s.strip() and len(s.strip()) > 15]
+            if sentences is None:
+                sentences = sentence_texts(text, split_sentences(text))
+            sentences = [s for s in sentences if len(s) > 15]
             
             if not sentences:
                 return []
@@ -248,11 +406,11 @@ class SummaryAgent(BaseAgent):
             # Extract multi-word phrases and important single words
             words = text.lower().split()
             
-            # Get important single words
-            word_freq = Counter(
+            # Get important single words, weighted by corpus IDF
+            word_freq = self._corpus.weight_counts(Counter(
                 w.strip(',.!?()[]{}') for w in words 
                 if w.strip(',.!?()[]{}') not in self.STOP_WORDS and len(w) > 4
-            )
+            ))
             
             # Get bigrams (2-word phrases)
             bigrams = []
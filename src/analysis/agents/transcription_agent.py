@@ -127,10 +127,22 @@ class TranscriptionAgent(BaseAgent):
     Phase 1 of premium analysis implementation.
     Supports video formats: mp4, mov, avi, mkv, webm
     Model sizes: tiny, base, small, medium, large
+    
+    With ``language`` "auto" (the default) the language is identified once
+    per file or stream from a short speech sample (see
+    src/analysis/language.py) before transcribing; ``english_only_model``
+    then switches English media to the faster ``.en`` model.
     """
     
     # Supported video formats
     SUPPORTED_FORMATS = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv', '.wmv'}
+    # Audio-only downloads (see VideoDownloader's "audio" profile) and audio files
+    AUDIO_FORMATS = {'.m4a', '.opus', '.ogg', '.oga', '.mka', '.mp3', '.aac', '.wav', '.flac'}
+    
+    # Sizes with an English-only ".en" variant
+    ENGLISH_ONLY_SIZES = {'tiny', 'base', 'small', 'medium'}
+    # Detections less certain than this keep the multilingual model
+    ENGLISH_ONLY_MIN_PROBABILITY = 0.8
     
     # Model cache for efficient reuse
     _model_cache = {}
@@ -142,7 +154,13 @@ class TranscriptionAgent(BaseAgent):
         super().__init__(config)
         self.model_size = self.config.get("whisper_model", "base")
         self.device = self.config.get("whisper_device", "cpu")
-        self.language = self.config.get("language", "en")
+        self.language = self.config.get("language") or "auto"
+        # {"code", "probability", "model"} once the language was identified
+        self.detected_language: Optional[Dict[str, Any]] = None
+        # Whisper segments ({"start", "end", "text"}) of the last transcription
+        self.segments = []
+        if self.language != "auto":
+            self._select_model(self.language, 1.0)
     
     def execute(self, video_path: str) -> str:
         """
@@ -154,6 +172,8 @@ class TranscriptionAgent(BaseAgent):
         Returns:
             Full transcription text
         """
+        self.segments = []
+        
         if not self._validate_input(video_path):
             return "[Transcription unavailable - invalid input]"
         
@@ -163,7 +183,7 @@ class TranscriptionAgent(BaseAgent):
         
         if not self._is_supported_format(video_path):
             logger.error(f"Unsupported video format: {video_path}")
-            return f"[Transcription unavailable - unsupported format. Supported: {', '.join(self.SUPPORTED_FORMATS)}]"
+            return f"[Transcription unavailable - unsupported format. Supported: {', '.join(sorted(self.SUPPORTED_FORMATS | self.AUDIO_FORMATS))}]"
         
         # Ensure ffmpeg is discoverable (Whisper needs it via subprocess)
         if not TranscriptionAgent._ffmpeg_ready:
@@ -181,6 +201,15 @@ class TranscriptionAgent(BaseAgent):
             if model is None:
                 return "[Transcription unavailable - failed to load Whisper model]"
             
+            if self.language == "auto":
+                from src.analysis.audio import decode_audio
+                from src.analysis.language import SAMPLE_RATE, SCAN_SECONDS
+                
+                self._identify_language(model, decode_audio(video_path, SAMPLE_RATE, max_seconds=SCAN_SECONDS))
+                model = self._get_model()
+                if model is None:
+                    return "[Transcription unavailable - failed to load Whisper model]"
+            
             # Transcribe audio
             logger.info(f"Transcribing with model size: {self.model_size}")
             result = model.transcribe(
@@ -190,6 +219,10 @@ class TranscriptionAgent(BaseAgent):
             )
             
             transcription = result.get("text", "").strip()
+            self.segments = [
+                {"start": seg.get("start", 0.0), "end": seg.get("end", 0.0), "text": seg.get("text", "")}
+                for seg in result.get("segments", [])
+            ]
             
             if not transcription:
                 logger.warning("Transcription produced empty output")
@@ -217,6 +250,86 @@ class TranscriptionAgent(BaseAgent):
         """
         return self.execute(video_path)
     
+    def transcribe_audio(self, audio, initial_prompt: str = "") -> Dict[str, Any]:
+        """
+        Transcribe decoded audio (one window of a stream).
+        
+        Args:
+            audio: 16 kHz mono float32 numpy array
+            initial_prompt: Text preceding this audio, for continuity across windows
+            
+        Returns:
+            Whisper result dict with "text" and "segments"
+            
+        Raises:
+            RuntimeError: The Whisper model could not be loaded
+        """
+        model = self._get_model()
+        if model is None:
+            raise RuntimeError("Failed to load Whisper model")
+        
+        if self.language == "auto":
+            # The first window of a stream decides for the rest
+            self._identify_language(model, audio)
+            model = self._get_model()
+            if model is None:
+                raise RuntimeError("Failed to load Whisper model")
+        
+        # Decoded samples need no ffmpeg, unlike file paths
+        return model.transcribe(
+            audio,
+            language=self.language,
+            initial_prompt=initial_prompt or None,
+            verbose=False
+        )
+    
+    def use_language(self, code: str, probability: Optional[float] = None) -> None:
+        """
+        Transcribe in a language identified earlier (e.g. cached for this media).
+        
+        Args:
+            code: Whisper language code
+            probability: Confidence of the earlier identification
+        """
+        self.language = code
+        self._select_model(code, 1.0 if probability is None else probability)
+        self.detected_language = {"code": code, "probability": probability, "model": self.model_size}
+    
+    def _identify_language(self, model, audio) -> None:
+        """
+        Set the transcription language from a speech sample of ``audio``.
+        
+        Leaves the language to Whisper if the audio could not be decoded,
+        the model is English-only or detection fails.
+        """
+        from src.analysis.language import detect_language, speech_sample
+        
+        if audio is None or self.model_size.endswith(".en"):
+            self.language = None
+            return
+        
+        try:
+            code, probability = detect_language(model, speech_sample(audio))
+        except Exception as e:
+            logger.warning(f"Language identification failed, leaving it to Whisper: {e}")
+            self.language = None
+            return
+        
+        self.language = code
+        self._select_model(code, probability)
+        self.detected_language = {"code": code, "probability": round(probability, 3), "model": self.model_size}
+        logger.info(f"Detected language: {code} (p={probability:.2f}); transcribing with {self.model_size}")
+    
+    def _select_model(self, language: str, probability: float) -> None:
+        """Use the English-only variant of the model for confidently English media, if enabled."""
+        if (
+            self.config.get("english_only_model", False)
+            and language == "en"
+            and probability >= self.ENGLISH_ONLY_MIN_PROBABILITY
+            and self.model_size in self.ENGLISH_ONLY_SIZES
+        ):
+            self.model_size = f"{self.model_size}.en"
+    
     def _get_model(self):
         """
         Get or load Whisper model with caching.
@@ -248,6 +361,6 @@ class TranscriptionAgent(BaseAgent):
             return None
     
     def _is_supported_format(self, video_path: str) -> bool:
-        """Check if video file has a supported format."""
+        """Check if the media file has a supported video or audio format."""
         file_ext = Path(video_path).suffix.lower()
-        return file_ext in self.SUPPORTED_FORMATS
+        return file_ext in self.SUPPORTED_FORMATS or file_ext in self.AUDIO_FORMATS
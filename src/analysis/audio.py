@@ -0,0 +1,79 @@
+"""
+Audio Decoding
+Decode media audio to raw PCM with ffmpeg for lightweight analysis stages.
+"""
+
+import shutil
+import subprocess
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def ffmpeg_executable() -> Optional[str]:
+    """
+    Locate an ffmpeg binary.
+
+    Returns:
+        Path to ffmpeg on PATH, imageio-ffmpeg's bundled binary, or None
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        return ffmpeg
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def decode_audio(
+    media_path: str,
+    sample_rate: int = 16000,
+    max_seconds: Optional[float] = None,
+    start_seconds: float = 0.0,
+):
+    """
+    Decode the audio track of a media file to mono float32 samples.
+
+    Args:
+        media_path: Audio or video file
+        sample_rate: Output sample rate in Hz
+        max_seconds: Decode at most this much audio
+        start_seconds: Offset to start decoding from
+
+    Returns:
+        numpy.ndarray of samples in [-1, 1], or None if ffmpeg or numpy is
+        unavailable or the file has no decodable audio
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        logger.warning("numpy not installed; audio decoding disabled")
+        return None
+
+    ffmpeg = ffmpeg_executable()
+    if ffmpeg is None:
+        logger.warning("ffmpeg not found; audio decoding disabled")
+        return None
+
+    cmd = [ffmpeg, "-nostdin", "-v", "error"]
+    if start_seconds:
+        cmd += ["-ss", f"{start_seconds:.3f}"]
+    cmd += ["-i", str(media_path)]
+    if max_seconds:
+        cmd += ["-t", f"{max_seconds:.3f}"]
+    cmd += ["-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"]
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True, timeout=300)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"ffmpeg failed on {media_path}: {e}")
+        return None
+
+    if proc.returncode != 0 or not proc.stdout:
+        logger.warning(f"No audio decoded from {media_path}: {proc.stderr.decode(errors='replace').strip()[:200]}")
+        return None
+
+    return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
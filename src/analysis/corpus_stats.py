@@ -0,0 +1,365 @@
+"""
+Corpus Statistics
+Incremental document-frequency store shared by the analysis agents.
+
+Every saved analysis adds its transcript to the store once, so agents can
+weight terms by inverse document frequency without re-reading the
+``results/`` history.
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Index artefacts live in a hidden sub-directory so ``results/*.json`` globs skip them
+INDEX_DIR_NAME = ".index"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9'\-]*[a-z0-9]|[a-z0-9]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens in document order
+    """
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def get_index_dir(results_dir: Union[str, Path] = "results") -> Path:
+    """Return the directory holding index artefacts for a results directory."""
+    return Path(results_dir) / INDEX_DIR_NAME
+
+
+class CorpusStats:
+    """
+    Document-frequency counts for every term seen across saved analyses.
+
+    Terms are mapped to dense integer ids; counts live in a compact
+    ``array('I')`` indexed by those ids. On disk the vocabulary is an
+    append-only text file (one term per line) next to the raw count array,
+    so saving only appends new terms and rewrites four bytes per term.
+
+    Several worker processes may update the same store; load, update and
+    save it under ``corpus_lock`` (as update_corpus_stats does) so no
+    process overwrites counts it has not seen.
+    """
+
+    VOCAB_FILE = "corpus_vocab.txt"
+    COUNTS_FILE = "corpus_df.bin"
+    META_FILE = "corpus_meta.json"
+    LOCK_FILE = "corpus.lock"
+
+    def __init__(self, index_dir: Optional[Union[str, Path]] = None):
+        """
+        Initialize an empty store.
+
+        Args:
+            index_dir: Directory to persist to (None keeps the store in memory)
+        """
+        self.index_dir = Path(index_dir) if index_dir else None
+        self.num_documents = 0
+        self._vocab: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._df = array("I")
+        self._persisted_terms = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, index_dir: Union[str, Path]) -> "CorpusStats":
+        """
+        Load a store from disk, returning an empty one if nothing is saved yet.
+
+        Args:
+            index_dir: Directory holding the corpus files
+
+        Returns:
+            Loaded CorpusStats instance
+        """
+        stats = cls(index_dir)
+        meta_path = stats.index_dir / cls.META_FILE
+        if not meta_path.exists():
+            return stats
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            num_terms = int(meta.get("num_terms", 0))
+
+            with open(stats.index_dir / cls.VOCAB_FILE, encoding="utf-8") as f:
+                lines = f.read().split("\n")
+            terms = lines[:num_terms]
+
+            counts = array("I")
+            with open(stats.index_dir / cls.COUNTS_FILE, "rb") as f:
+                counts.frombytes(f.read(num_terms * counts.itemsize))
+            if meta.get("byteorder", "little") != _native_byteorder():
+                counts.byteswap()
+
+            if len(terms) != num_terms or len(counts) != num_terms:
+                raise ValueError("corpus files are truncated")
+
+            stats.num_documents = int(meta.get("num_documents", 0))
+            stats._terms = terms
+            stats._vocab = {term: i for i, term in enumerate(terms)}
+            stats._df = counts
+            # Lines past num_terms come from an interrupted save; rewrite them away
+            stats._persisted_terms = num_terms if len(lines) == max(num_terms, 1) else -1
+        except Exception as e:
+            logger.warning(f"Failed to load corpus stats from {stats.index_dir}: {e}, starting empty")
+            stats = cls(index_dir)
+            # Force a full rewrite of the vocabulary on next save
+            stats._persisted_terms = -1
+
+        return stats
+
+    @classmethod
+    def rebuild(cls, results_dir: Union[str, Path] = "results") -> "CorpusStats":
+        """
+        Rebuild the store from every saved analysis in a results directory.
+
+        Args:
+            results_dir: Directory containing ``analysis_*.json`` files
+
+        Returns:
+            Freshly built and saved CorpusStats instance
+        """
+        stats = cls(get_index_dir(results_dir))
+        stats._persisted_terms = -1
+
+        with corpus_lock(stats.index_dir):
+            for result_file in sorted(Path(results_dir).glob("*.json")):
+                try:
+                    with open(result_file) as f:
+                        stats.add_document(json.load(f).get("transcription", ""))
+                except Exception as e:
+                    logger.error(f"Failed to index {result_file}: {e}")
+
+            stats.save()
+        return stats
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct terms seen."""
+        return len(self._terms)
+
+    def add_document(self, text: str) -> None:
+        """
+        Count each distinct term of a document once.
+
+        Args:
+            text: Document text (usually a transcription)
+        """
+        if not is_indexable_text(text):
+            return
+
+        with self._lock:
+            for term in set(tokenize(text)):
+                term_id = self._vocab.get(term)
+                if term_id is None:
+                    term_id = len(self._terms)
+                    self._vocab[term] = term_id
+                    self._terms.append(term)
+                    self._df.append(1)
+                else:
+                    self._df[term_id] += 1
+            self.num_documents += 1
+
+    def document_frequency(self, term: str) -> int:
+        """Number of documents containing a term."""
+        term_id = self._vocab.get(term.lower())
+        return self._df[term_id] if term_id is not None else 0
+
+    def idf(self, term: str) -> float:
+        """
+        Smoothed inverse document frequency of a term.
+
+        Returns 1.0 for every term while the corpus is empty, so callers
+        weighting by IDF fall back to plain frequency on a fresh install.
+        """
+        return math.log((1 + self.num_documents) / (1 + self.document_frequency(term))) + 1.0
+
+    def idf_weights(self, terms: Iterable[str]) -> Dict[str, float]:
+        """Look up IDF for several terms at once."""
+        return {term: self.idf(term) for term in terms}
+
+    def weight_counts(self, counts: Counter) -> Counter:
+        """
+        Scale raw in-document term counts by corpus IDF.
+
+        Args:
+            counts: Counter of term -> in-document frequency
+
+        Returns:
+            Counter of term -> TF-IDF weight
+        """
+        if not self.num_documents:
+            return counts
+        return Counter({term: freq * self.idf(term) for term, freq in counts.items()})
+
+    def save(self) -> None:
+        """Persist the store, appending only terms added since the last save."""
+        if self.index_dir is None:
+            return
+
+        with self._lock:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            vocab_path = self.index_dir / self.VOCAB_FILE
+
+            if self._persisted_terms < 0 or not vocab_path.exists():
+                _atomic_write(vocab_path, "\n".join(self._terms).encode("utf-8"))
+            elif len(self._terms) > self._persisted_terms:
+                new_terms = self._terms[self._persisted_terms:]
+                with open(vocab_path, "a", encoding="utf-8") as f:
+                    f.write(("\n" if self._persisted_terms else "") + "\n".join(new_terms))
+
+            _atomic_write(self.index_dir / self.COUNTS_FILE, self._df.tobytes())
+
+            # Meta is written last: it decides how much of the other files is valid
+            meta = {
+                "num_documents": self.num_documents,
+                "num_terms": len(self._terms),
+                "byteorder": _native_byteorder(),
+            }
+            _atomic_write(self.index_dir / self.META_FILE, json.dumps(meta).encode("utf-8"))
+            self._persisted_terms = len(self._terms)
+
+
+def is_indexable_text(text: Optional[str]) -> bool:
+    """Return False for empty text and ``[...]`` placeholder/error messages."""
+    return bool(text) and not text.lstrip().startswith("[")
+
+
+def update_corpus_stats(results_dir: Union[str, Path], text: str) -> None:
+    """
+    Add one document to the persistent store of a results directory.
+
+    Args:
+        results_dir: Results directory whose index should be updated
+        text: Document text to add
+    """
+    if not is_indexable_text(text):
+        return
+
+    index_dir = get_index_dir(results_dir)
+    with _cache_lock, corpus_lock(index_dir):
+        stats = CorpusStats.load(index_dir)
+        stats.add_document(text)
+        stats.save()
+        _cache[str(index_dir)] = (_meta_mtime(index_dir), stats)
+
+
+def get_corpus_stats(results_dir: Union[str, Path] = "results") -> CorpusStats:
+    """
+    Return the cached store for a results directory.
+
+    The store is reloaded only when its meta file changed on disk, so agents
+    can call this on every run at the cost of one ``stat``.
+
+    Args:
+        results_dir: Results directory whose index should be read
+
+    Returns:
+        CorpusStats instance (empty if nothing has been saved yet)
+    """
+    index_dir = get_index_dir(results_dir)
+    mtime = _meta_mtime(index_dir)
+
+    with _cache_lock:
+        cached = _cache.get(str(index_dir))
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        if mtime is None:
+            stats = CorpusStats.load(index_dir)
+        else:
+            # Do not read the files halfway through another process's save
+            with corpus_lock(index_dir):
+                mtime = _meta_mtime(index_dir)
+                stats = CorpusStats.load(index_dir)
+        _cache[str(index_dir)] = (mtime, stats)
+        return stats
+
+
+@contextmanager
+def corpus_lock(index_dir: Union[str, Path]) -> Iterator[None]:
+    """
+    Hold the cross-process lock of the corpus store in ``index_dir``.
+
+    The lock is an OS file lock, released when the holder exits or dies.
+    It is not reentrant: do not nest it for the same directory.
+
+    Args:
+        index_dir: Directory holding the corpus files
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    with open(index_dir / CorpusStats.LOCK_FILE, "a+b") as lock_file:
+        _lock_file(lock_file)
+        try:
+            yield
+        finally:
+            _unlock_file(lock_file)
+
+
+_cache: Dict[str, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def _meta_mtime(index_dir: Path) -> Optional[int]:
+    try:
+        return (index_dir / CorpusStats.META_FILE).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(f) -> None:
+        f.seek(0)
+        while True:
+            try:
+                # LK_LOCK itself gives up after ten one-second retries
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock_file(f) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _native_byteorder() -> str:
+    return sys.byteorder
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
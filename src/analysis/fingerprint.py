@@ -0,0 +1,186 @@
+"""
+Media Fingerprinting
+Compact signatures for spotting the same content saved under different names.
+
+Two signatures are computed:
+
+- an audio fingerprint: sign bits of the change in spectral band energy
+  differences over time (Haitsma-Kalker style), which survive re-encoding,
+  resizing and container changes;
+- a MinHash of transcript word shingles, whose banded LSH keys find
+  transcripts with high Jaccard similarity without comparing every pair.
+"""
+
+import hashlib
+import random
+from array import array
+from typing import Iterable, List, Optional, Sequence
+import logging
+
+from src.analysis.corpus_stats import is_indexable_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Audio fingerprint parameters
+FINGERPRINT_SAMPLE_RATE = 8000
+FINGERPRINT_SECONDS = 60
+FRAME_SECONDS = 0.1
+BAND_EDGES_HZ = (150, 300, 600, 1200, 2400, 3800)
+AUDIO_LSH_CHUNK_BITS = 32
+AUDIO_LSH_MAX_CHUNKS = 32
+
+# MinHash parameters (16 bands x 4 rows)
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def audio_fingerprint(media_path: str, seconds: float = FINGERPRINT_SECONDS) -> Optional[str]:
+    """
+    Fingerprint the first seconds of a media file's audio.
+
+    Args:
+        media_path: Audio or video file
+        seconds: Amount of audio to fingerprint
+
+    Returns:
+        Hex string of fingerprint bits, or None if the audio could not be
+        decoded or is (near) silent
+    """
+    from src.analysis.audio import decode_audio
+
+    samples = decode_audio(media_path, sample_rate=FINGERPRINT_SAMPLE_RATE, max_seconds=seconds)
+    if samples is None:
+        return None
+    return fingerprint_samples(samples, FINGERPRINT_SAMPLE_RATE)
+
+
+def fingerprint_samples(samples, sample_rate: int = FINGERPRINT_SAMPLE_RATE) -> Optional[str]:
+    """
+    Fingerprint decoded mono samples.
+
+    Args:
+        samples: numpy array of float samples
+        sample_rate: Sample rate of ``samples``
+
+    Returns:
+        Hex fingerprint string or None for silent/too-short audio
+    """
+    import numpy as np
+
+    frame = int(sample_rate * FRAME_SECONDS)
+    num_frames = len(samples) // frame
+    if num_frames < 3:
+        return None
+
+    frames = np.asarray(samples[:num_frames * frame], dtype=np.float32).reshape(num_frames, frame)
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(frame, 1.0 / sample_rate)
+    bands = np.stack([
+        spectrum[:, (freqs >= lo) & (freqs < hi)].sum(axis=1)
+        for lo, hi in zip(BAND_EDGES_HZ, BAND_EDGES_HZ[1:])
+    ], axis=1)
+    energy = np.log(bands + 1e-10)
+
+    band_diff = energy[:, :-1] - energy[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    bits = bits.ravel()
+
+    # Silence yields constant bits that would match every other silent clip
+    ones = bits.mean()
+    if ones < 0.1 or ones > 0.9:
+        return None
+
+    return np.packbits(bits).tobytes().hex()
+
+
+def fingerprint_similarity(a: str, b: str) -> float:
+    """
+    Fraction of equal bits over the overlapping prefix of two fingerprints.
+
+    Args:
+        a: Hex fingerprint
+        b: Hex fingerprint
+
+    Returns:
+        Similarity in [0, 1] (unrelated audio scores around 0.5)
+    """
+    length = min(len(a), len(b))
+    if length == 0:
+        return 0.0
+    diff = int(a[:length], 16) ^ int(b[:length], 16)
+    return 1.0 - bin(diff).count("1") / (length * 4)
+
+
+def audio_lsh_keys(fingerprint: str) -> List[str]:
+    """
+    Bucket keys of a fingerprint: each aligned 32-bit chunk is one band.
+
+    Re-encodes of the same audio share most chunks exactly, so any shared
+    chunk is enough to make two fingerprints candidates.
+    """
+    width = AUDIO_LSH_CHUNK_BITS // 4
+    chunks = [fingerprint[i:i + width] for i in range(0, len(fingerprint) - width + 1, width)]
+    return [f"{band}:{chunk}" for band, chunk in enumerate(chunks[:AUDIO_LSH_MAX_CHUNKS])]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Word n-gram shingles of a transcript."""
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return set(tokens)
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """
+    MinHash signature of a transcript's word shingles.
+
+    Args:
+        text: Transcript
+
+    Returns:
+        List of NUM_PERMUTATIONS ints, or None for empty/placeholder text
+    """
+    if not is_indexable_text(text):
+        return None
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little") % _MERSENNE_PRIME
+        for shingle in shingles(text)
+    ]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def minhash_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / min(len(a), len(b))
+
+
+def minhash_lsh_keys(signature: Sequence[int]) -> List[str]:
+    """Banded LSH bucket keys of a MinHash signature."""
+    rows = len(signature) // LSH_BANDS
+    keys = []
+    for band in range(LSH_BANDS):
+        chunk = array("Q", signature[band * rows:(band + 1) * rows]).tobytes()
+        keys.append(f"{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+    return keys
+
+
+def pack_signature(signature: Iterable[int]) -> bytes:
+    """Serialize a MinHash signature for storage."""
+    return array("Q", signature).tobytes()
+
+
+def unpack_signature(data: bytes) -> List[int]:
+    """Inverse of pack_signature."""
+    signature = array("Q")
+    signature.frombytes(data)
+    return signature.tolist()
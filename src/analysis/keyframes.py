@@ -0,0 +1,324 @@
+"""
+Keyframe Analysis
+Read on-screen text from the frames where the picture changes.
+
+Frames are decoded by ffmpeg at a low rate, in grayscale and fitted into a
+fixed box, and streamed through three filters:
+
+- scene changes: the share of cells in a coarse grid whose mean brightness
+  moved since the last keyframe candidate (a vectorized frame difference);
+  the first frame always counts, since covers often carry a title;
+- near-duplicates: frames whose 64-bit difference hash is within a few bits
+  of a candidate already kept (the same caption shown again after a cut).
+  The hash ignores fine detail, so text appearing over an unchanged
+  background barely moves it; a hash match only counts when the grid
+  difference to that candidate is below the scene threshold too;
+- a budget: at most ``per_minute`` of the strongest changes in each minute
+  of video and ``max_frames`` overall, so OCR cost per minute is bounded.
+
+Survivors are read with Tesseract (pytesseract), when it is installed.
+"""
+
+import re
+import subprocess
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_FPS = 2.0
+FRAME_BOX = 720
+GRID_SIZE = 32
+# Brightness levels (0-255) a grid cell must move to count as changed
+CELL_CHANGE = 20.0
+# Share of changed cells that makes a scene change
+SCENE_THRESHOLD = 0.05
+KEYFRAMES_PER_MINUTE = 6
+MAX_KEYFRAMES = 40
+# Difference hashes this close (in bits) are the same picture
+HASH_DISTANCE = 6
+# OCR lines with fewer letters or digits are noise
+MIN_LINE_CHARS = 3
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(eq=False)
+class Keyframe:
+    """A frame selected for OCR."""
+    time: float
+    score: float
+    phash: int
+    image: Any = field(default=None, repr=False)
+    grid: Any = field(default=None, repr=False)
+    text: str = ""
+
+    def to_json(self) -> Dict[str, Any]:
+        """Result form, without the pixels."""
+        return {
+            "time": round(self.time, 2),
+            "score": round(self.score, 3),
+            "hash": f"{self.phash:016x}",
+            "text": self.text,
+        }
+
+
+def decode_frames(media_path: str, fps: float = SAMPLE_FPS, box: int = FRAME_BOX) -> Iterator[Tuple[float, Any]]:
+    """
+    Stream grayscale frames of a video, sampled at ``fps``.
+
+    Frames are scaled to fit a ``box`` x ``box`` square (aspect ratio kept,
+    padded with black) so every frame has the same shape.
+
+    Args:
+        media_path: Video file
+        fps: Frames per second of video to decode
+        box: Side of the output frames in pixels
+
+    Yields:
+        (time in seconds, uint8 numpy array of shape (box, box)); nothing if
+        ffmpeg is unavailable or the file has no video track
+    """
+    import numpy as np
+    from src.analysis.audio import ffmpeg_executable
+
+    ffmpeg = ffmpeg_executable()
+    if ffmpeg is None:
+        logger.warning("ffmpeg not found; keyframe analysis disabled")
+        return
+
+    video_filter = (
+        f"fps={fps},scale={box}:{box}:force_original_aspect_ratio=decrease,"
+        f"pad={box}:{box}:(ow-iw)/2:(oh-ih)/2"
+    )
+    cmd = [
+        ffmpeg, "-nostdin", "-v", "error", "-i", str(media_path),
+        "-an", "-vf", video_filter, "-pix_fmt", "gray", "-f", "rawvideo", "-"
+    ]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        logger.warning(f"ffmpeg failed on {media_path}: {e}")
+        return
+
+    frame_size = box * box
+    try:
+        index = 0
+        while True:
+            data = proc.stdout.read(frame_size)
+            if len(data) < frame_size:
+                break
+            yield index / fps, np.frombuffer(data, dtype=np.uint8).reshape(box, box)
+            index += 1
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+
+def _thumbnail(frame, rows: int, cols: int):
+    """Block-mean downsample of a 2-D frame to ``rows`` x ``cols``."""
+    height = frame.shape[0] - frame.shape[0] % rows
+    width = frame.shape[1] - frame.shape[1] % cols
+    blocks = frame[:height, :width].reshape(rows, height // rows, cols, width // cols)
+    return blocks.mean(axis=(1, 3))
+
+
+def difference_hash(frame) -> int:
+    """64-bit perceptual hash: whether brightness rises left to right on a 9x8 grid."""
+    import numpy as np
+
+    thumb = _thumbnail(frame, 8, 9)
+    bits = np.packbits((thumb[:, 1:] > thumb[:, :-1]).ravel())
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def _changed_share(grid, reference) -> float:
+    """Share of grid cells whose brightness moved more than CELL_CHANGE."""
+    import numpy as np
+
+    return float(np.mean(np.abs(grid - reference) > CELL_CHANGE))
+
+
+def select_keyframes(
+    frames: Iterable[Tuple[float, Any]],
+    threshold: float = SCENE_THRESHOLD,
+    per_minute: int = KEYFRAMES_PER_MINUTE,
+    max_frames: int = MAX_KEYFRAMES,
+    hash_distance: int = HASH_DISTANCE,
+) -> List[Keyframe]:
+    """
+    Pick the frames worth reading.
+
+    Only kept candidates are held in memory, so frames can come straight
+    from decode_frames.
+
+    Args:
+        frames: (time, grayscale frame) pairs in time order
+        threshold: Share of changed grid cells that makes a scene change
+        per_minute: Keyframes kept per minute of video (strongest changes)
+        max_frames: Keyframes kept overall (strongest changes)
+        hash_distance: Hash distance within which frames are duplicates
+
+    Returns:
+        Keyframes in time order
+    """
+    import numpy as np
+
+    candidates: List[Keyframe] = []
+    reference = None
+    for time, frame in frames:
+        grid = _thumbnail(frame, GRID_SIZE, GRID_SIZE)
+        if reference is None:
+            score = 1.0
+        else:
+            score = _changed_share(grid, reference)
+            if score < threshold:
+                continue
+        reference = grid
+
+        phash = difference_hash(frame)
+        if any(
+            hamming_distance(phash, kept.phash) <= hash_distance and _changed_share(grid, kept.grid) < threshold
+            for kept in candidates
+        ):
+            continue
+
+        minute = int(time // 60)
+        same_minute = [kept for kept in candidates if int(kept.time // 60) == minute]
+        if len(same_minute) >= per_minute:
+            weakest = min(same_minute, key=lambda kept: kept.score)
+            if score <= weakest.score:
+                continue
+            candidates.remove(weakest)
+
+        # Decoded frames are read-only views of ffmpeg's buffer
+        candidates.append(Keyframe(time, score, phash, np.array(frame), grid))
+        if len(candidates) > max_frames:
+            candidates.remove(min(candidates, key=lambda kept: kept.score))
+
+    return sorted(candidates, key=lambda kept: kept.time)
+
+
+def tesseract_ocr(image) -> str:
+    """
+    Read text from a grayscale frame with Tesseract.
+
+    Raises:
+        ImportError: If pytesseract or Pillow is not installed
+    """
+    try:
+        import pytesseract
+        from PIL import Image
+    except ImportError:
+        raise ImportError(
+            "pytesseract is required to read on-screen text. Install with: pip install pytesseract pillow "
+            "(and the tesseract binary)"
+        )
+
+    return pytesseract.image_to_string(Image.fromarray(image))
+
+
+def clean_ocr_lines(text: str, seen: Optional[set] = None) -> List[str]:
+    """
+    Normalize OCR output into lines of real text.
+
+    Args:
+        text: Raw OCR text
+        seen: Lowercased lines already kept from earlier frames (updated);
+            captions usually stay on screen across several keyframes
+
+    Returns:
+        New lines, in reading order
+    """
+    lines = []
+    for raw in text.splitlines():
+        line = _WHITESPACE.sub(" ", raw).strip()
+        if sum(ch.isalnum() for ch in line) < MIN_LINE_CHARS:
+            continue
+        key = line.lower()
+        if seen is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def analyze_keyframes(
+    media_path: str,
+    config: Optional[Dict[str, Any]] = None,
+    ocr: Optional[Callable[[Any], str]] = None,
+    frames: Optional[Iterable[Tuple[float, Any]]] = None,
+) -> List[Keyframe]:
+    """
+    Select keyframes of a video and read their on-screen text.
+
+    Args:
+        media_path: Video file
+        config: Pipeline config (``keyframe_scene_threshold``,
+            ``keyframes_per_minute``, ``max_keyframes``)
+        ocr: Image to text function (default: tesseract_ocr)
+        frames: Decoded frames to use instead of decoding ``media_path``
+
+    Returns:
+        Keyframes in time order, with ``text`` set and pixels released
+
+    Raises:
+        ImportError: If the default OCR is used and pytesseract is missing
+    """
+    config = config or {}
+    ocr = ocr or tesseract_ocr
+    keyframes = select_keyframes(
+        frames if frames is not None else decode_frames(media_path),
+        threshold=config.get("keyframe_scene_threshold", SCENE_THRESHOLD),
+        per_minute=config.get("keyframes_per_minute", KEYFRAMES_PER_MINUTE),
+        max_frames=config.get("max_keyframes", MAX_KEYFRAMES),
+    )
+
+    seen: set = set()
+    for keyframe in keyframes:
+        keyframe.text = "\n".join(clean_ocr_lines(ocr(keyframe.image), seen))
+        keyframe.image = keyframe.grid = None
+    logger.info(f"Read {sum(1 for k in keyframes if k.text)} of {len(keyframes)} keyframes with on-screen text")
+    return keyframes
+
+
+def merge_on_screen_text(
+    transcription: str,
+    sentence_spans: Sequence[Sequence],
+    keyframes: Sequence[Dict[str, Any]],
+) -> Tuple[str, List[List]]:
+    """
+    Append keyframe text to a transcription for the text analyses.
+
+    Each keyframe's text becomes one sentence, timed at its frame, so the
+    summary and research agents can pick it like any spoken sentence.
+
+    Args:
+        transcription: Spoken text
+        sentence_spans: JSON sentence spans over ``transcription``
+        keyframes: Keyframes in result form (see Keyframe.to_json)
+
+    Returns:
+        (merged text, JSON sentence spans over the merged text)
+    """
+    text = transcription or ""
+    spans = [list(span) for span in sentence_spans]
+    for keyframe in keyframes:
+        sentence = " ".join(keyframe.get("text", "").splitlines()).strip()
+        if not sentence:
+            continue
+        if text:
+            text += "\n"
+        start = len(text)
+        text += sentence
+        spans.append([start, len(text), keyframe.get("time"), keyframe.get("time")])
+    return text, spans
@@ -0,0 +1,84 @@
+"""
+Language Identification
+Pick the spoken language before transcribing, from a short sample of speech.
+
+Whisper's own auto-detection looks at the first 30 seconds of the file,
+which in reels is often music or silence. Instead, the first minutes of
+audio are split into 30 ms frames, an energy voice-activity detector keeps
+the frames well above the noise floor (plus a little context around them),
+and up to 30 seconds of that speech go through one ``detect_language``
+pass of the model.
+"""
+
+from typing import Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Audio decoded to look for speech in, and speech kept for detection
+SCAN_SECONDS = 120.0
+SAMPLE_SECONDS = 30.0
+FRAME_SECONDS = 0.03
+# A frame is speech when its energy is this far from the noise floor to the peak
+VOICE_THRESHOLD = 0.2
+# Frames of context kept on each side of speech (word onsets are quiet)
+HANGOVER_FRAMES = 5
+MIN_SPEECH_SECONDS = 1.0
+SILENCE_RMS = 1e-4
+
+
+def speech_sample(samples, sample_rate: int = SAMPLE_RATE, seconds: float = SAMPLE_SECONDS):
+    """
+    Select up to ``seconds`` of speech from decoded audio.
+
+    Args:
+        samples: Mono float32 numpy array
+        sample_rate: Sample rate of ``samples``
+        seconds: Length of the sample to return
+
+    Returns:
+        numpy array of the voiced frames in order; the start of the audio
+        when too little speech is found
+    """
+    import numpy as np
+
+    limit = int(seconds * sample_rate)
+    frame = int(sample_rate * FRAME_SECONDS)
+    num_frames = len(samples) // frame
+    if num_frames == 0:
+        return samples[:limit]
+
+    frames = np.asarray(samples[:num_frames * frame], dtype=np.float32).reshape(num_frames, frame)
+    energy = np.sqrt(np.mean(frames ** 2, axis=1))
+    floor, peak = np.percentile(energy, 10), np.percentile(energy, 95)
+    if peak < SILENCE_RMS:
+        return samples[:limit]
+
+    voiced = energy > floor + (peak - floor) * VOICE_THRESHOLD
+    voiced = np.convolve(voiced, np.ones(2 * HANGOVER_FRAMES + 1), mode="same") > 0
+    speech = frames[voiced].ravel()[:limit]
+    if len(speech) < MIN_SPEECH_SECONDS * sample_rate:
+        return samples[:limit]
+    return speech
+
+
+def detect_language(model, sample) -> Tuple[str, float]:
+    """
+    Identify the language of a speech sample with a multilingual Whisper model.
+
+    Args:
+        model: Loaded Whisper model (not an English-only ``.en`` one)
+        sample: 16 kHz mono float32 audio, at most 30 seconds are used
+
+    Returns:
+        (language code, probability)
+    """
+    import numpy as np
+    import whisper
+
+    audio = whisper.pad_or_trim(np.asarray(sample, dtype=np.float32))
+    mel = whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel)
+    code = max(probs, key=probs.get)
+    return code, float(probs[code])
@@ -5,7 +5,7 @@ Core module for orchestrating the analysis workflow.
 
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 import logging
 
@@ -15,87 +15,478 @@ logger = logging.getLogger(__name__)
 class AnalysisPipeline:
     """Main pipeline for orchestrating video analysis."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        results_dir: Optional[Union[str, Path]] = None,
+        temp_dir: Optional[Union[str, Path]] = None
+    ):
         """
         Initialize the analysis pipeline.
         
         Args:
             config: Configuration dictionary with analysis settings
+            results_dir: Where results and their indexes are saved
+                (default: the configured storage.results_dir)
+            temp_dir: Media store downloads go to (default: the configured
+                storage.temp_dir)
         """
+        from src.config.app_config import get_config
+        
+        app_config = get_config()
+        storage_config = app_config.storage
         self.config = config
+        self._analysis_config = app_config.analysis
         self.results = {}
-        self.temp_dir = Path("temp_uploads")
-        self.results_dir = Path("results")
-        self.results_dir.mkdir(exist_ok=True)
+        self.result_file: Optional[str] = None
+        self._media_store = None
+        self.progress_callback: Optional[Callable[[float, str], None]] = None
+        self.temp_dir = Path(temp_dir or storage_config.temp_dir)
+        self.results_dir = Path(results_dir or storage_config.results_dir)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
     
-    def run(self, video_path: str) -> Dict[str, Any]:
+    def run(
+        self,
+        video_path: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        transcript: Optional[Tuple[str, list]] = None
+    ) -> Dict[str, Any]:
         """
         Execute the complete analysis pipeline.
         
         Args:
             video_path: Path to the video file
+            progress_callback: Called with (fraction complete, stage message)
+                as each stage starts
+            transcript: (text, segments) already transcribed from this media,
+                e.g. while it downloaded (see run_url)
         
         Returns:
             Dictionary containing all analysis results
         """
+        self.progress_callback = progress_callback
+        self.result_file = None
         self.results = {
-            "file_name": Path(video_path).name,
+            "file_name": self.config.get("file_name") or Path(video_path).name,
             "timestamp": datetime.now().isoformat(),
             "config": self.config
         }
         
+        from src.storage.media_store import MediaStore, blob_hash
+        
+        self._media_store = None
+        try:
+            from src.utils import hash_file
+            
+            # Media store blobs are named by their hash already
+            self.results["file_hash"] = blob_hash(video_path) or hash_file(video_path)
+        except OSError as e:
+            logger.warning(f"Could not hash {video_path}: {e}")
+        
+        try:
+            store = self._media_store = MediaStore.for_blob(video_path)
+            if store is not None:
+                # Recently analyzed media is the last to be evicted
+                store.touch(self.results["file_hash"])
+                self._load_video_metadata(store)
+        except Exception as e:
+            logger.warning(f"Could not update media access time: {e}")
+        
         try:
             steps = self.config.get("steps", {})
+            duplicate_policy = self.config.get("duplicate_policy", "detect")
+            
+            # Cheap fingerprints first, so duplicates are caught before transcription
+            if duplicate_policy != "off":
+                self._report_progress(0.02, "Fingerprinting media...")
+                self._run_fingerprinting(video_path)
+                if duplicate_policy == "reuse" and self._reuse_prior_analysis():
+                    self._report_progress(1.0, "Reused earlier analysis")
+                    return self.results
             
             if steps.get("transcription", True):
-                self._run_transcription(video_path)
+                self._report_progress(0.1, "Transcribing audio...")
+                self._run_transcription(video_path, transcript)
+                
+                if duplicate_policy != "off":
+                    self._check_transcript_duplicates()
+                    if duplicate_policy == "reuse" and self._reuse_prior_analysis():
+                        self._report_progress(1.0, "Reused earlier analysis")
+                        return self.results
+            
+            if steps.get("keyframes", False):
+                self._report_progress(0.4, "Reading on-screen text...")
+                self._run_keyframes(video_path)
             
             if steps.get("summary", True):
+                self._report_progress(0.5, "Summarizing...")
                 self._run_summary()
             
             if steps.get("research", True):
+                self._report_progress(0.6, "Researching topics...")
                 self._run_research()
             
             if steps.get("categorization", True):
+                self._report_progress(0.7, "Categorizing...")
                 self._run_categorization()
             
             if steps.get("proofreading", True):
+                self._report_progress(0.8, "Validating quality...")
                 self._run_proofreading()
             
             if steps.get("impact", True):
+                self._report_progress(0.9, "Analyzing project impact...")
                 self._run_impact_analysis()
             
             # Save results
+            self._report_progress(0.95, "Saving results...")
             self._save_results()
             
+            self._report_progress(1.0, "Analysis complete")
             return self.results
         
         except Exception as e:
             logger.error(f"Pipeline execution failed: {e}")
             raise
     
-    def _run_transcription(self, video_path: str) -> None:
+    def run_url(
+        self,
+        url: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        media_callback: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Download and analyze a video URL, transcribing it while it downloads.
+        
+        URLs in the download cache are analyzed from disk. Otherwise the
+        media is streamed into the media store and through Whisper at the
+        same time (see src.analysis.streaming); URLs that cannot be streamed
+        are downloaded first, as before.
+        
+        The downloaded blob is pinned in this process while it is analyzed.
+        Eviction in other processes only spares media of active jobs, so
+        ``media_callback`` should record it on the job (JobQueue.set_media).
+        
+        Args:
+            url: Video URL
+            progress_callback: Called with (fraction complete, stage message)
+            media_callback: Called with the media path as soon as the URL
+                has been downloaded (or found in the cache)
+        
+        Returns:
+            Dictionary containing all analysis results
+        
+        Raises:
+            RuntimeError: The URL could not be downloaded
+        """
+        from src.config.app_config import get_config
+        from src.jobs.queue import JobQueue
+        from src.storage.download_cache import CachedDownload, DownloadCache, download_cached
+        from src.storage.media_store import MediaStore
+        from src.storage.storage_manager import StorageManager
+        from src.utils.video_downloader import VideoDownloader, download_profile
+        
+        self.progress_callback = progress_callback
+        profile = download_profile(self.config)
+        media_store = MediaStore(self.temp_dir)
+        # Cache eviction must spare media that other jobs are waiting for
+        storage = StorageManager(media_store, queue=JobQueue.open(self.results_dir))
+        cache = DownloadCache(
+            media_store,
+            quota_bytes=get_config().storage.download_cache_mb * 1024 * 1024,
+            pinned=storage.pinned_hashes
+        )
+        
+        outcome = cache.lookup(url, profile)
+        transcript = None
+        if outcome is None and self.config.get("steps", {}).get("transcription", True) \
+                and self.config.get("stream_transcription", True):
+            streamed = self._stream_url(url, media_store, profile)
+            if streamed is not None:
+                cache.record(url, streamed.media, profile, streamed.file_name)
+                outcome = CachedDownload(True, "Streamed", streamed.media, file_name=streamed.file_name)
+                if streamed.transcription is not None:
+                    transcript = (streamed.transcription, streamed.segments)
+        
+        if outcome is None:
+            downloader = VideoDownloader(output_dir=str(self.temp_dir), profile=profile)
+            try:
+                outcome = download_cached(
+                    downloader, url, media_store, cache,
+                    lambda message: self._report_progress(0.05, message), profile
+                )
+            finally:
+                downloader.close()
+            if not outcome.success:
+                raise RuntimeError(outcome.message)
+        
+        if media_callback is not None:
+            media_callback(str(outcome.media.path))
+        
+        self.config = {**self.config, "source_url": url}
+        self.config.setdefault("file_name", outcome.file_name or outcome.media.path.name)
+        
+        # The remaining stages fill the rest of the progress range
+        def report(fraction: float, message: str) -> None:
+            if progress_callback is not None:
+                progress_callback(0.45 + 0.55 * fraction, message)
+        
+        with storage.pin(outcome.media.file_hash):
+            return self.run(str(outcome.media.path), report, transcript=transcript)
+    
+    def _stream_url(self, url: str, media_store, profile: str):
+        """
+        Download a URL into the media store while transcribing it.
+        
+        Returns:
+            StreamedMedia, or None if the URL must be downloaded first
+        """
+        from src.analysis.agents import TranscriptionAgent
+        from src.analysis.streaming import WINDOW_SECONDS, StreamUnavailable, iter_http, resolve_stream, stream_transcribe
+        
+        try:
+            import requests
+            
+            source = resolve_stream(url, profile)
+            agent = TranscriptionAgent(self.config)
+            
+            def report(seconds: float, downloaded: int) -> None:
+                done = min(seconds / source.duration, 1.0) if source.duration else 0.0
+                self._report_progress(
+                    0.05 + 0.4 * done,
+                    f"Downloading and transcribing... {seconds:.0f}s transcribed, {downloaded / 1024 / 1024:.1f} MB downloaded"
+                )
+            
+            self._report_progress(0.05, "Downloading and transcribing...")
+            with requests.Session() as session:
+                streamed = stream_transcribe(
+                    iter_http(session, source), media_store, source.file_name, agent.transcribe_audio, report,
+                    window_seconds=self.config.get("transcription_window_seconds", WINDOW_SECONDS)
+                )
+            if source.metadata or agent.detected_language:
+                from src.storage.metadata_cache import MetadataCache
+                
+                metadata_cache = MetadataCache(media_store)
+                if source.metadata:
+                    metadata_cache.record_download(url, streamed.media.file_hash, source.metadata)
+                if agent.detected_language:
+                    language = agent.detected_language
+                    metadata_cache.put_language(streamed.media.file_hash, language["code"], language["probability"])
+            return streamed
+        
+        except StreamUnavailable as e:
+            logger.info(f"Not streaming {url}: {e}")
+        except Exception as e:
+            logger.warning(f"Streaming {url} failed ({e}); downloading it first")
+        return None
+    
+    def _load_video_metadata(self, media_store) -> None:
+        """Attach the caption, hashtags etc. captured when the media was downloaded."""
+        from src.storage.metadata_cache import MetadataCache
+        from src.utils.video_downloader import VIDEO_METADATA_FIELDS
+        
+        try:
+            info = MetadataCache(media_store).for_media(self.results["file_hash"])
+        except Exception as e:
+            logger.warning(f"Could not load video metadata: {e}")
+            return
+        if info:
+            self.results["video_metadata"] = {key: info.get(key) for key in VIDEO_METADATA_FIELDS}
+    
+    def _report_progress(self, fraction: float, message: str) -> None:
+        """Forward stage progress to the caller; callback errors never stop the pipeline."""
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(fraction, message)
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {e}")
+    
+    def _run_fingerprinting(self, video_path: str) -> None:
+        """Fingerprint the media and look up earlier analyses of the same content."""
+        try:
+            from src.analysis.fingerprint import audio_fingerprint
+            from src.storage import DuplicateIndex
+            
+            if self.config.get("audio_fingerprint", True):
+                fingerprint = audio_fingerprint(video_path)
+                if fingerprint:
+                    self.results["audio_fingerprint"] = fingerprint
+            
+            index = DuplicateIndex.open(self.results_dir)
+            self.results["duplicates"] = index.find_media(
+                file_hash=self.results.get("file_hash"),
+                audio_fingerprint=self.results.get("audio_fingerprint")
+            )
+            if self.results["duplicates"]:
+                logger.info(f"Media matches {len(self.results['duplicates'])} earlier analyses")
+        
+        except Exception as e:
+            logger.warning(f"Fingerprinting failed: {e}")
+    
+    def _check_transcript_duplicates(self) -> None:
+        """Look up earlier analyses with a near-identical transcript."""
+        try:
+            from src.storage import DuplicateIndex
+            
+            known = {match["result_file"] for match in self.results.get("duplicates", [])}
+            matches = DuplicateIndex.open(self.results_dir).find_transcript(self.results.get("transcription", ""))
+            new_matches = [match for match in matches if match["result_file"] not in known]
+            if new_matches:
+                logger.info(f"Transcript matches {len(new_matches)} earlier analyses")
+                self.results.setdefault("duplicates", []).extend(new_matches)
+        
+        except Exception as e:
+            logger.warning(f"Transcript duplicate check failed: {e}")
+    
+    def _reuse_prior_analysis(self) -> bool:
+        """
+        Replace this run's results with the best-matching earlier analysis.
+        
+        Returns:
+            True if an earlier analysis was loaded
+        """
+        from src.storage import ResultsStore
+        from src.storage.results_store import summarize_result
+        
+        store = ResultsStore.open(self.results_dir)
+        for match in self.results.get("duplicates", []):
+            prior = store.get_file(match["result_file"])
+            if prior is None or summarize_result(prior)["status"] == "error":
+                continue
+            
+            for key, value in prior.items():
+                if key not in ("file_name", "timestamp", "config", "file_hash", "audio_fingerprint", "duplicates"):
+                    self.results.setdefault(key, value)
+            self.results["reused_from"] = match["result_file"]
+            logger.info(f"Reusing analysis from {match['result_file']} ({match['match']} match)")
+            return True
+        
+        return False
+    
+    def _run_transcription(self, video_path: str, transcript: Optional[Tuple[str, list]] = None) -> None:
         """Extract transcription from video."""
+        if transcript is not None:
+            self.results["transcription"], segments = transcript
+            logger.info("Using transcription made while downloading")
+            language = self._cached_language()
+            if language is not None:
+                self.results["language"] = language
+            self._segment_sentences(segments)
+            return
+        
         try:
             from src.analysis.agents import TranscriptionAgent
             
             agent = TranscriptionAgent(self.config)
+            cached = self._cached_language() if agent.language == "auto" else None
+            if cached is not None:
+                # Identified on an earlier run over the same media
+                agent.use_language(cached["code"], cached["probability"])
             transcription = agent.transcribe(video_path)
             self.results["transcription"] = transcription
             logger.info("Transcription completed")
             
+            if agent.detected_language is not None:
+                self.results["language"] = agent.detected_language
+                if cached is None:
+                    self._cache_language(agent.detected_language)
+            elif agent.language:
+                self.results["language"] = {"code": agent.language, "model": agent.model_size}
+            
+            self._segment_sentences(agent.segments)
+            
         except ImportError as e:
             logger.warning(f"TranscriptionAgent not found: {e}")
             self.results["transcription"] = "[Transcription would be extracted from video]"
     
+    def _cached_language(self) -> Optional[Dict[str, Any]]:
+        """Language identified earlier for this media, if it is in the media store."""
+        if self._media_store is None or not self.results.get("file_hash"):
+            return None
+        try:
+            from src.storage.metadata_cache import MetadataCache
+            
+            return MetadataCache(self._media_store).get_language(self.results["file_hash"])
+        except Exception as e:
+            logger.warning(f"Could not read cached language: {e}")
+            return None
+    
+    def _cache_language(self, language: Dict[str, Any]) -> None:
+        """Remember the identified language so re-analyses skip identification."""
+        if self._media_store is None or not self.results.get("file_hash"):
+            return
+        try:
+            from src.storage.metadata_cache import MetadataCache
+            
+            MetadataCache(self._media_store).put_language(self.results["file_hash"], language["code"], language["probability"])
+        except Exception as e:
+            logger.warning(f"Could not cache language: {e}")
+    
+    def _segment_sentences(self, segments: Optional[list] = None) -> None:
+        """Split the transcription into sentence spans once for all agents."""
+        from src.analysis.corpus_stats import is_indexable_text
+        from src.analysis.segmentation import split_sentences, spans_to_json
+        
+        transcription = self.results.get("transcription", "")
+        if not is_indexable_text(transcription):
+            self.results["sentence_spans"] = []
+            return
+        
+        spans = split_sentences(
+            transcription,
+            segments=segments,
+            pause_threshold=self.config.get("sentence_pause_threshold", 1.0)
+        )
+        self.results["sentence_spans"] = spans_to_json(spans)
+    
+    def _get_sentence_spans(self) -> list:
+        """Cached sentence spans, computing them if transcription was skipped."""
+        if "sentence_spans" not in self.results:
+            self._segment_sentences()
+        return self.results["sentence_spans"]
+    
+    def _run_keyframes(self, video_path: str) -> None:
+        """Read on-screen text from the frames at scene changes."""
+        from src.analysis.keyframes import analyze_keyframes
+        
+        try:
+            keyframes = analyze_keyframes(video_path, self.config)
+        except ImportError as e:
+            logger.warning(f"On-screen text unavailable: {e}")
+            return
+        except Exception as e:
+            logger.warning(f"Keyframe analysis failed: {e}")
+            return
+        
+        self.results["keyframes"] = [keyframe.to_json() for keyframe in keyframes]
+        self.results["on_screen_text"] = "\n".join(keyframe.text for keyframe in keyframes if keyframe.text)
+    
+    def _get_analysis_text(self) -> Tuple[str, list]:
+        """Transcription plus on-screen text, with sentence spans, for the text analyses."""
+        from src.analysis.keyframes import merge_on_screen_text
+        
+        transcription = self.results.get("transcription", "")
+        if not self.results.get("on_screen_text"):
+            return transcription, self._get_sentence_spans()
+        return merge_on_screen_text(transcription, self._get_sentence_spans(), self.results.get("keyframes", []))
+    
     def _run_summary(self) -> None:
         """Generate summary from transcription."""
         try:
             from src.analysis.agents import SummaryAgent
             
-            transcription = self.results.get("transcription", "")
-            agent = SummaryAgent(self.config)
-            summary = agent.summarize(transcription)
+            transcription, sentence_spans = self._get_analysis_text()
+            analysis_config = self._analysis_config
+            # Configured summary settings apply unless the job overrides them
+            agent = SummaryAgent({
+                "summary_mode": analysis_config.summary_mode,
+                "summary_llm_budget": analysis_config.summary_llm_budget,
+                "summary_llm_workers": analysis_config.summary_llm_workers,
+                **self.config,
+                "results_dir": str(self.results_dir)
+            })
+            summary = agent.summarize(transcription, sentence_spans=sentence_spans)
             self.results["summary"] = summary
             logger.info("Summary generation completed")
             
@@ -108,9 +499,9 @@ class AnalysisPipeline:
         try:
             from src.analysis.agents import ResearchAgent
             
-            transcription = self.results.get("transcription", "")
-            agent = ResearchAgent(self.config)
-            research = agent.research(transcription)
+            transcription, sentence_spans = self._get_analysis_text()
+            agent = ResearchAgent({**self.config, "results_dir": str(self.results_dir)})
+            research = agent.research(transcription, sentence_spans=sentence_spans)
             self.results["research"] = research
             logger.info("Research analysis completed")
             
@@ -126,12 +517,15 @@ class AnalysisPipeline:
         try:
             from src.analysis.agents import CategorizationAgent
             
-            transcription = self.results.get("transcription", "")
+            transcription, _ = self._get_analysis_text()
             research_results = self.results.get("research", {})
             summary_results = self.results.get("summary", {})
             
             agent = CategorizationAgent(self.config)
-            categorization = agent.categorize(transcription, research_results, summary_results)
+            categorization = agent.categorize(
+                transcription, research_results, summary_results,
+                video_metadata=self.results.get("video_metadata")
+            )
             self.results["categorization"] = categorization
             logger.info("Categorization completed with research and summary context")
             
@@ -148,6 +542,7 @@ class AnalysisPipeline:
         try:
             from src.analysis.agents import ProofreaderAgent
             
+            self._get_sentence_spans()
             agent = ProofreaderAgent(self.config)
             validation_metadata = agent.proofread(self.results)
             self.results["validation_metadata"] = validation_metadata
@@ -192,10 +587,31 @@ class AnalysisPipeline:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = self.results_dir / f"analysis_{timestamp}.json"
             
-            with open(filename, "w") as f:
-                json.dump(self.results, f, indent=2)
+            # Concurrent workers can finish within the same second; never overwrite
+            suffix = 1
+            while True:
+                try:
+                    with open(filename, "x") as f:
+                        json.dump(self.results, f, indent=2)
+                    break
+                except FileExistsError:
+                    filename = self.results_dir / f"analysis_{timestamp}_{suffix}.json"
+                    suffix += 1
             
+            self.result_file = filename.name
             logger.info(f"Results saved to {filename}")
         
         except Exception as e:
             logger.error(f"Failed to save results: {e}")
+            return
+        
+        try:
+            from src.analysis.corpus_stats import update_corpus_stats
+            
+            update_corpus_stats(self.results_dir, self.results.get("transcription", ""))
+        except Exception as e:
+            logger.warning(f"Failed to update corpus statistics: {e}")
+        
+        from src.storage import index_result
+        
+        index_result(self.results_dir, self.results, filename.name)
@@ -0,0 +1,163 @@
+"""
+Sentence Segmentation
+Rule-based sentence splitter that returns character spans instead of copies.
+
+Whisper segment timestamps, when available, add boundaries at long pauses
+and attach start/end times to each sentence.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+# Tokens that end with a period without ending the sentence
+# (words that also end spoken sentences, like "no" or "etc", are left out)
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "vs", "e.g", "i.e",
+    "approx", "dept", "fig", "inc", "ltd", "corp", "vol",
+    "jan", "feb", "apr", "jun", "jul", "aug", "sept", "oct", "nov",
+    "u.s", "u.k", "a.m", "p.m",
+})
+
+# Terminal punctuation (plus closing quotes/brackets) followed by whitespace or end of text.
+# Decimals like "3.5" never match because no whitespace follows the period.
+_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*(?=\s|$)")
+_WORD_BEFORE = re.compile(r"([\w.]+)$")
+
+
+class SentenceSpan(NamedTuple):
+    """A sentence as ``text[start:end]`` with optional audio times in seconds."""
+    start: int
+    end: int
+    t_start: Optional[float] = None
+    t_end: Optional[float] = None
+
+
+def split_sentences(
+    text: str,
+    segments: Optional[Sequence[Dict[str, Any]]] = None,
+    pause_threshold: float = 1.0,
+) -> List[SentenceSpan]:
+    """
+    Split text into sentence spans.
+
+    Args:
+        text: Transcript text
+        segments: Whisper segments (dicts with ``start``, ``end``, ``text``)
+        pause_threshold: Silence in seconds between segments that ends a
+            sentence even without terminal punctuation
+
+    Returns:
+        List of SentenceSpan in document order
+    """
+    if not text:
+        return []
+
+    boundaries = [m.end() for m in _BOUNDARY.finditer(text) if _is_sentence_end(text, m)]
+
+    seg_offsets = _locate_segments(text, segments) if segments else []
+    if seg_offsets:
+        boundaries.extend(_pause_boundaries(seg_offsets, pause_threshold))
+        boundaries = sorted(set(boundaries))
+
+    spans = []
+    start = 0
+    for end in boundaries + [len(text)]:
+        span = _trim(text, start, end)
+        if span:
+            spans.append(span)
+        start = end
+
+    if seg_offsets:
+        spans = _attach_times(spans, seg_offsets)
+
+    return spans
+
+
+def sentence_texts(text: str, spans: Sequence[Sequence], min_length: int = 0) -> List[str]:
+    """
+    Materialize sentence strings from spans.
+
+    Args:
+        text: Text the spans were computed on
+        spans: SentenceSpan list or its JSON form (``[start, end, ...]`` lists)
+        min_length: Skip sentences shorter than this many characters
+
+    Returns:
+        List of sentence strings
+    """
+    sentences = []
+    for span in spans:
+        sentence = text[span[0]:span[1]]
+        if len(sentence) > min_length:
+            sentences.append(sentence)
+    return sentences
+
+
+def spans_to_json(spans: Sequence[SentenceSpan]) -> List[List]:
+    """Compact JSON form: ``[start, end, t_start, t_end]`` per sentence."""
+    return [list(span) for span in spans]
+
+
+def spans_from_json(data: Optional[Sequence[Sequence]]) -> List[SentenceSpan]:
+    """Inverse of spans_to_json (tolerates missing time fields)."""
+    return [SentenceSpan(*item) for item in data or []]
+
+
+def _is_sentence_end(text: str, match: re.Match) -> bool:
+    if not match.group().startswith("."):
+        return True
+
+    word = _WORD_BEFORE.search(text, max(match.start() - 16, 0), match.start())
+    if word:
+        token = word.group(1).lower().rstrip(".")
+        # Abbreviations and single-letter initials ("J. Smith")
+        if token in ABBREVIATIONS or (len(token) == 1 and token.isalpha()):
+            return False
+
+    # A lowercase continuation means the period was not terminal
+    following = text[match.end():match.end() + 40].lstrip()
+    return not (following and following[0].islower())
+
+
+def _locate_segments(text: str, segments: Sequence[Dict[str, Any]]) -> List[tuple]:
+    """Map Whisper segments to ``(char_start, char_end, t_start, t_end)``."""
+    located = []
+    cursor = 0
+    for seg in segments:
+        seg_text = (seg.get("text") or "").strip()
+        if not seg_text:
+            continue
+        pos = text.find(seg_text, cursor)
+        if pos < 0:
+            # Transcript was post-processed; fall back to punctuation only
+            return []
+        cursor = pos + len(seg_text)
+        located.append((pos, cursor, float(seg.get("start", 0.0)), float(seg.get("end", 0.0))))
+    return located
+
+
+def _pause_boundaries(seg_offsets: List[tuple], pause_threshold: float) -> List[int]:
+    boundaries = []
+    for current, following in zip(seg_offsets, seg_offsets[1:]):
+        if following[2] - current[3] >= pause_threshold:
+            boundaries.append(current[1])
+    return boundaries
+
+
+def _trim(text: str, start: int, end: int) -> Optional[SentenceSpan]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return SentenceSpan(start, end) if end > start else None
+
+
+def _attach_times(spans: List[SentenceSpan], seg_offsets: List[tuple]) -> List[SentenceSpan]:
+    seg_starts = [seg[0] for seg in seg_offsets]
+    timed = []
+    for span in spans:
+        first = max(bisect_right(seg_starts, span.start) - 1, 0)
+        last = max(bisect_right(seg_starts, span.end - 1) - 1, 0)
+        timed.append(SentenceSpan(span.start, span.end, seg_offsets[first][2], seg_offsets[last][3]))
+    return timed
@@ -0,0 +1,404 @@
+"""
+Streaming Transcription
+Transcribe a URL while it is still downloading.
+
+The downloaded bytes are piped through ffmpeg, which decodes them to 16 kHz
+mono PCM as they arrive. The PCM is cut into windows of about 30 seconds
+(Whisper's own context length), each ending at the quietest moment near the
+window end so words are not split, and every window is transcribed as soon
+as it is complete. Download and transcription overlap instead of running
+back to back. The same bytes are also written into the media store, so the
+complete file is there for the rest of the pipeline when the stream ends.
+
+Only progressive HTTP streams can be piped. Platform URLs are resolved to
+one with yt-dlp; adaptive (DASH/HLS) formats raise StreamUnavailable and the
+caller downloads first instead. If ffmpeg cannot decode the container from
+a pipe (e.g. an MP4 whose index is at the end), the download still
+completes and ``transcription`` is None, so the file is transcribed as usual.
+"""
+
+import queue
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+
+from src.analysis.audio import ffmpeg_executable
+from src.storage.media_store import MediaStore, StoredMedia
+from src.utils.video_downloader import FORMAT_SELECTORS, OUTPUT_TEMPLATES, VideoDownloader, video_metadata
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 30.0
+CUT_SEARCH_SECONDS = 3.0  # look this far back from the window end for a pause
+READ_BLOCK_SECONDS = 1.0
+PROMPT_CHARS = 200  # tail of the previous text given to the next window
+HTTP_CHUNK_SIZE = 64 * 1024
+STREAMABLE_PROTOCOLS = ("http", "https")
+
+
+class StreamUnavailable(Exception):
+    """The URL cannot be transcribed while downloading; download it first."""
+
+
+@dataclass
+class StreamSource:
+    """A progressive media URL that can be read front to back."""
+    url: str
+    file_name: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    duration: Optional[float] = None
+    metadata: Optional[Dict[str, Any]] = None  # video_metadata of platform URLs
+
+
+@dataclass
+class StreamedMedia:
+    """Result of stream_transcribe."""
+    media: StoredMedia
+    file_name: str
+    transcription: Optional[str] = None  # None if the stream could not be decoded on the fly
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def resolve_stream(url: str, profile: str = "audio") -> StreamSource:
+    """
+    Find a progressive media URL for a video URL.
+
+    Args:
+        url: Video URL (platform or direct)
+        profile: Download profile whose format selector yt-dlp applies
+
+    Returns:
+        StreamSource
+
+    Raises:
+        StreamUnavailable: The URL has no single progressive HTTP stream
+    """
+    platform = VideoDownloader.detect_url_type(url)
+    if platform == "direct":
+        return StreamSource(url=url, file_name=VideoDownloader.direct_file_name(url))
+    if platform not in OUTPUT_TEMPLATES:
+        raise StreamUnavailable(f"Unsupported URL: {url}")
+
+    try:
+        import yt_dlp
+    except ImportError:
+        raise StreamUnavailable("yt-dlp is required to stream platform URLs. Install with: pip install yt-dlp")
+
+    ydl_opts = {
+        'format': FORMAT_SELECTORS[profile],
+        'outtmpl': OUTPUT_TEMPLATES[platform],
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+    }
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            file_name = ydl.prepare_filename(info)
+    except Exception as e:
+        raise StreamUnavailable(f"Could not resolve {url}: {e}")
+
+    protocol = info.get("protocol", "")
+    if info.get("requested_formats") or not info.get("url") or protocol not in STREAMABLE_PROTOCOLS:
+        raise StreamUnavailable(f"Selected format is not a single progressive stream ({protocol or 'merged'})")
+
+    return StreamSource(
+        url=info["url"],
+        file_name=file_name,
+        headers=dict(info.get("http_headers") or {}),
+        duration=info.get("duration"),
+        metadata=video_metadata(info),
+    )
+
+
+def iter_http(session, source: StreamSource, chunk_size: int = HTTP_CHUNK_SIZE, timeout: float = 30) -> Iterator[bytes]:
+    """Yield the bytes of a stream source as they arrive."""
+    headers = {**source.headers, "Accept-Encoding": "identity"}
+    with session.get(source.url, stream=True, timeout=timeout, headers=headers) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size):
+            if chunk:
+                yield chunk
+
+
+class PcmDecoder:
+    """
+    ffmpeg process decoding container bytes written to it into PCM blocks.
+
+    Decoded audio is queued as it is produced, so a slow consumer (the
+    transcriber) never stalls the download feeding ``write``.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, block_seconds: float = READ_BLOCK_SECONDS):
+        """
+        Args:
+            sample_rate: Output sample rate in Hz
+            block_seconds: Audio per block yielded by ``blocks``
+
+        Raises:
+            StreamUnavailable: ffmpeg is not installed
+        """
+        ffmpeg = ffmpeg_executable()
+        if ffmpeg is None:
+            raise StreamUnavailable("ffmpeg not found")
+
+        self.sample_rate = sample_rate
+        self._block_bytes = int(sample_rate * block_seconds) * 2
+        self._process = subprocess.Popen(
+            [ffmpeg, "-v", "error", "-i", "pipe:0", "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "pipe:1"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self._accepting = True
+        self._pcm: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._stderr = b""
+        self._threads = [
+            threading.Thread(target=self._read_stdout, name="ffmpeg-stdout", daemon=True),
+            threading.Thread(target=self._read_stderr, name="ffmpeg-stderr", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def write(self, chunk: bytes) -> bool:
+        """
+        Feed container bytes to ffmpeg.
+
+        Returns:
+            False once ffmpeg has stopped reading (it failed or was killed)
+        """
+        if not self._accepting:
+            return False
+        try:
+            self._process.stdin.write(chunk)
+            return True
+        except (BrokenPipeError, OSError, ValueError):
+            self._accepting = False
+            return False
+
+    def close(self) -> None:
+        """Signal the end of the input."""
+        self._accepting = False
+        try:
+            self._process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def blocks(self) -> Iterator[bytes]:
+        """Yield little-endian int16 PCM blocks until ffmpeg exits."""
+        while True:
+            block = self._pcm.get()
+            if block is None:
+                return
+            yield block
+
+    def wait(self) -> bool:
+        """
+        Wait for ffmpeg to exit.
+
+        Returns:
+            True if the whole input was decoded
+        """
+        returncode = self._process.wait()
+        for thread in self._threads:
+            thread.join()
+        if returncode != 0:
+            logger.info(f"ffmpeg could not decode the stream: {self._stderr.decode(errors='replace').strip()[:200]}")
+        return returncode == 0
+
+    def kill(self) -> None:
+        """Stop ffmpeg immediately."""
+        self._accepting = False
+        if self._process.poll() is None:
+            self._process.kill()
+        self.wait()
+
+    def _read_stdout(self) -> None:
+        try:
+            while True:
+                block = self._process.stdout.read(self._block_bytes)
+                if not block:
+                    break
+                self._pcm.put(block[:len(block) - len(block) % 2])
+        finally:
+            self._pcm.put(None)
+
+    def _read_stderr(self) -> None:
+        self._stderr = self._process.stderr.read()
+
+
+class WindowedTranscriber:
+    """
+    Cut a PCM stream into windows and transcribe each as soon as it is complete.
+
+    Segment timestamps are shifted by the window's offset, so they are
+    relative to the start of the media like a whole-file transcription.
+    """
+
+    def __init__(
+        self,
+        transcribe_window: Callable[[Any, str], Dict[str, Any]],
+        sample_rate: int = SAMPLE_RATE,
+        window_seconds: float = WINDOW_SECONDS,
+        cut_search_seconds: float = CUT_SEARCH_SECONDS,
+    ):
+        """
+        Args:
+            transcribe_window: Called with (float32 samples, prompt) and
+                returning a Whisper-style result with "text" and "segments"
+            sample_rate: Sample rate of the pushed audio
+            window_seconds: Longest window transcribed at once
+            cut_search_seconds: Window ends are moved up to this far back to
+                the quietest 20 ms frame
+        """
+        self.transcribe_window = transcribe_window
+        self.sample_rate = sample_rate
+        self.window_samples = int(window_seconds * sample_rate)
+        self.search_samples = int(min(cut_search_seconds, window_seconds / 2) * sample_rate)
+        self.offset = 0.0  # seconds already transcribed
+        self.segments: List[Dict[str, Any]] = []
+        self._texts: List[str] = []
+        self._pending: List[Any] = []
+        self._pending_samples = 0
+
+    @property
+    def text(self) -> str:
+        return " ".join(self._texts)
+
+    def push(self, samples) -> None:
+        """Add audio; transcribes every window that is now complete."""
+        self._pending.append(samples)
+        self._pending_samples += len(samples)
+        while self._pending_samples >= self.window_samples:
+            import numpy as np
+
+            audio = np.concatenate(self._pending)
+            cut = self._cut_point(audio[:self.window_samples])
+            self._pending = [audio[cut:]]
+            self._pending_samples = len(audio) - cut
+            self._transcribe(audio[:cut])
+
+    def flush(self) -> None:
+        """Transcribe the remaining audio at the end of the stream."""
+        if self._pending_samples > self.sample_rate // 10:
+            import numpy as np
+
+            self._transcribe(np.concatenate(self._pending))
+        self._pending, self._pending_samples = [], 0
+
+    def _cut_point(self, window) -> int:
+        """Index of the quietest frame near the end of a full window."""
+        import numpy as np
+
+        frame = max(1, self.sample_rate // 50)
+        tail = window[len(window) - self.search_samples:]
+        frames = len(tail) // frame
+        if frames < 2:
+            return len(window)
+        energy = np.square(tail[:frames * frame].reshape(frames, frame)).mean(axis=1)
+        quietest = int(np.argmin(energy))
+        return len(window) - self.search_samples + quietest * frame + frame // 2
+
+    def _transcribe(self, audio) -> None:
+        result = self.transcribe_window(audio, self.text[-PROMPT_CHARS:])
+        text = result.get("text", "").strip()
+        if text:
+            self._texts.append(text)
+        for seg in result.get("segments", []):
+            self.segments.append({
+                "start": self.offset + seg.get("start", 0.0),
+                "end": self.offset + seg.get("end", 0.0),
+                "text": seg.get("text", ""),
+            })
+        self.offset += len(audio) / self.sample_rate
+
+
+def stream_transcribe(
+    chunks: Iterable[bytes],
+    media_store: MediaStore,
+    file_name: str,
+    transcribe_window: Callable[[Any, str], Dict[str, Any]],
+    progress_callback: Optional[Callable[[float, int], None]] = None,
+    window_seconds: float = WINDOW_SECONDS,
+) -> StreamedMedia:
+    """
+    Store a byte stream in the media store while transcribing it.
+
+    The stream is read on a background thread that writes every chunk to the
+    media store and to ffmpeg; this thread transcribes the decoded windows.
+
+    Args:
+        chunks: Container bytes as they are downloaded (e.g. from iter_http)
+        media_store: Store the file is written into
+        file_name: Name of the file (its extension is kept on the blob)
+        transcribe_window: See WindowedTranscriber
+        progress_callback: Called with (seconds transcribed, bytes downloaded)
+            after each window
+        window_seconds: Audio per transcription window
+
+    Returns:
+        StreamedMedia
+
+    Raises:
+        StreamUnavailable: ffmpeg is not installed
+        Exception: Whatever ``chunks`` raised if the download failed
+    """
+    import numpy as np
+
+    decoder = PcmDecoder()
+    transcriber = WindowedTranscriber(transcribe_window, decoder.sample_rate, window_seconds)
+    writer = media_store.writer(file_name)
+    stop = threading.Event()
+    errors: List[Exception] = []
+
+    def feed() -> None:
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    return
+                writer.write(chunk)
+                # Keep downloading even if ffmpeg gave up; the file is still needed
+                decoder.write(chunk)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            decoder.close()
+
+    feeder = threading.Thread(target=feed, name="stream-download", daemon=True)
+    feeder.start()
+
+    try:
+        reported = 0.0
+        for block in decoder.blocks():
+            transcriber.push(np.frombuffer(block, dtype=np.int16).astype(np.float32) / 32768.0)
+            if progress_callback and transcriber.offset > reported:
+                reported = transcriber.offset
+                progress_callback(transcriber.offset, writer.size)
+        decoded = decoder.wait()
+        feeder.join()
+        if errors:
+            raise errors[0]
+        if decoded:
+            transcriber.flush()
+            if progress_callback:
+                progress_callback(transcriber.offset, writer.size)
+    except BaseException:
+        stop.set()
+        decoder.kill()
+        feeder.join()
+        writer.abort()
+        raise
+
+    media = writer.commit()
+    if not decoded or not transcriber.offset:
+        logger.info(f"Stream of {file_name} could not be decoded while downloading; it will be transcribed from the file")
+        return StreamedMedia(media=media, file_name=file_name)
+
+    logger.info(f"Transcribed {transcriber.offset:.0f}s of {file_name} while downloading")
+    return StreamedMedia(
+        media=media,
+        file_name=file_name,
+        transcription=transcriber.text,
+        segments=transcriber.segments,
+    )
@@ -0,0 +1,359 @@
+"""
+Category Taxonomy
+Loads the category/research-area model from a taxonomy file and compiles it
+into a frozen keyword matcher.
+
+The taxonomy (``taxonomy.json`` next to this module by default, or any
+JSON/YAML file given as ``taxonomy_path``) lists categories with their
+keywords, research areas, and the boost/suppression rules used by
+CategorizationAgent. Compiled matchers are pickled to a cache directory
+keyed by a hash of the source file, so edits invalidate the cache
+automatically.
+
+Matching tokenizes the text once and looks every token (and every n-gram
+that starts a known phrase) up in a hash table, so per-reel cost depends on
+transcript length, not on how many keywords the taxonomy has. Keywords match
+whole tokens; their regular plurals ("model" -> "models", "study" ->
+"studies", "neural network" -> "neural networks") are indexed as well.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+import logging
+
+from src.analysis.corpus_stats import tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).with_name("taxonomy.json")
+DEFAULT_CACHE_DIR = Path.home() / ".instagram_agent" / "cache"
+
+# Bump when CompiledTaxonomy's layout changes so stale pickles are ignored
+COMPILER_VERSION = "2"
+
+# Per-keyword occurrence cap when scoring a category
+MAX_KEYWORD_HITS = 3
+
+
+@dataclass(frozen=True)
+class DomainRule:
+    """Suppress/boost categories when the primary research area is one of ``domains``."""
+    domains: FrozenSet[str]
+    suppress: Tuple[str, ...]
+    suppress_factor: float
+    boost: Tuple[Tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class TopicBoost:
+    """Boost ``category`` when research topics mention ``min_matches`` of its keywords."""
+    category: str
+    keyword_ids: FrozenSet[int]
+    min_matches: int
+    boost: int
+
+
+@dataclass(frozen=True)
+class CompiledTaxonomy:
+    """Immutable, precompiled form of a taxonomy file."""
+    source_hash: str
+    categories: Tuple[str, ...]
+    fallback_category: str
+    keywords: Tuple[str, ...]
+    single_index: Dict[str, int]
+    phrase_index: Dict[Tuple[str, ...], int]
+    phrase_starts: FrozenSet[str]
+    phrase_lengths: Tuple[int, ...]
+    keyword_categories: Tuple[Tuple[int, ...], ...]
+    keyword_areas: Tuple[Tuple[int, ...], ...]
+    research_areas: Tuple[str, ...]
+    area_min_keywords: int
+    area_max: int
+    area_fallback: str
+    weak_categories: FrozenSet[str]
+    weak_min_keywords: int
+    weak_relative_threshold: float
+    domain_rules: Tuple[DomainRule, ...]
+    topic_boosts: Tuple[TopicBoost, ...]
+    takeaway_category: Optional[str]
+    takeaway_min: int
+    takeaway_boost: int
+
+    def match(self, text: str) -> Counter:
+        """
+        Count keyword occurrences in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Counter of keyword id -> occurrences
+        """
+        tokens = tokenize(text)
+        counts = Counter()
+        single_index = self.single_index
+        phrase_index = self.phrase_index
+        phrase_starts = self.phrase_starts
+
+        for i, token in enumerate(tokens):
+            keyword_id = single_index.get(token)
+            if keyword_id is not None:
+                counts[keyword_id] += 1
+            if token in phrase_starts:
+                for length in self.phrase_lengths:
+                    keyword_id = phrase_index.get(tuple(tokens[i:i + length]))
+                    if keyword_id is not None:
+                        counts[keyword_id] += 1
+
+        return counts
+
+    def category_scores(self, counts: Counter) -> Dict[str, Tuple[int, int]]:
+        """
+        Score categories from keyword counts.
+
+        Returns:
+            Dict of category -> (score, number of distinct keywords matched)
+        """
+        scores: Dict[str, List[int]] = {}
+        for keyword_id, count in counts.items():
+            for category_id in self.keyword_categories[keyword_id]:
+                entry = scores.setdefault(self.categories[category_id], [0, 0])
+                entry[0] += min(count, MAX_KEYWORD_HITS)
+                entry[1] += 1
+        return {category: (score, matched) for category, (score, matched) in scores.items()}
+
+    def matched_research_areas(self, counts: Counter) -> List[str]:
+        """Research areas with enough distinct keyword matches, in taxonomy order."""
+        matched = Counter()
+        for keyword_id in counts:
+            for area_id in self.keyword_areas[keyword_id]:
+                matched[area_id] += 1
+
+        areas = [
+            self.research_areas[area_id]
+            for area_id in sorted(matched)
+            if matched[area_id] >= self.area_min_keywords
+        ]
+        return areas[:self.area_max] if areas else [self.area_fallback]
+
+    def category_keywords_found(self, counts: Counter) -> List[str]:
+        """Category keywords present in the text, in taxonomy order."""
+        return [
+            self.keywords[keyword_id]
+            for keyword_id in sorted(counts)
+            if self.keyword_categories[keyword_id]
+        ]
+
+    def rule_for_domain(self, domain: Optional[str]) -> Optional[DomainRule]:
+        """First domain rule that applies to a primary research area."""
+        for rule in self.domain_rules:
+            if domain in rule.domains:
+                return rule
+        return None
+
+
+def compile_taxonomy(data: Dict[str, Any], source_hash: str = "") -> CompiledTaxonomy:
+    """
+    Compile parsed taxonomy data into a matcher.
+
+    Args:
+        data: Parsed taxonomy file
+        source_hash: Hash of the source the data came from
+
+    Returns:
+        CompiledTaxonomy
+
+    Raises:
+        ValueError: If the taxonomy references unknown categories or areas
+    """
+    categories = tuple(data.get("categories", {}))
+    if not categories:
+        raise ValueError("taxonomy defines no categories")
+    category_ids = {name: i for i, name in enumerate(categories)}
+
+    def check_category(name: str) -> str:
+        if name not in category_ids:
+            raise ValueError(f"taxonomy references unknown category: {name}")
+        return name
+
+    keyword_ids: Dict[Tuple[str, ...], int] = {}
+    keywords: List[str] = []
+    keyword_categories: List[set] = []
+    keyword_areas: List[set] = []
+
+    def keyword_id(keyword: str) -> int:
+        key = tuple(tokenize(keyword))
+        if not key:
+            raise ValueError(f"taxonomy keyword has no word characters: {keyword!r}")
+        if key not in keyword_ids:
+            keyword_ids[key] = len(keywords)
+            keywords.append(" ".join(key))
+            keyword_categories.append(set())
+            keyword_areas.append(set())
+        return keyword_ids[key]
+
+    for name, spec in data["categories"].items():
+        for keyword in spec.get("keywords", []):
+            keyword_categories[keyword_id(keyword)].add(category_ids[name])
+
+    research_areas = tuple(data.get("research_areas", {}))
+    for area_id, spec in enumerate(data.get("research_areas", {}).values()):
+        for keyword in spec.get("keywords", []):
+            keyword_areas[keyword_id(keyword)].add(area_id)
+
+    domain_rules = []
+    for rule in data.get("domain_rules", []):
+        unknown = set(rule.get("domains", [])) - set(research_areas)
+        if unknown:
+            raise ValueError(f"taxonomy rule references unknown research areas: {sorted(unknown)}")
+        domain_rules.append(DomainRule(
+            domains=frozenset(rule.get("domains", [])),
+            suppress=tuple(check_category(c) for c in rule.get("suppress", [])),
+            suppress_factor=float(rule.get("suppress_factor", 1.0)),
+            boost=tuple((check_category(c), int(v)) for c, v in rule.get("boost", {}).items()),
+        ))
+
+    topic_boosts = tuple(
+        TopicBoost(
+            category=check_category(boost["category"]),
+            keyword_ids=frozenset(keyword_id(k) for k in boost.get("keywords", [])),
+            min_matches=int(boost.get("min_matches", 1)),
+            boost=int(boost.get("boost", 0)),
+        )
+        for boost in data.get("topic_boosts", [])
+    )
+
+    weak = data.get("weak_categories", {})
+    area_rules = data.get("research_area_rules", {})
+    takeaway = data.get("takeaway_boost") or {}
+
+    # Plurals never shadow a keyword the taxonomy lists itself
+    variants = dict(keyword_ids)
+    for key, i in keyword_ids.items():
+        variants.setdefault(key[:-1] + (_plural(key[-1]),), i)
+
+    single_index = {key[0]: i for key, i in variants.items() if len(key) == 1}
+    phrase_index = {key: i for key, i in variants.items() if len(key) > 1}
+
+    return CompiledTaxonomy(
+        source_hash=source_hash,
+        categories=categories,
+        fallback_category=check_category(data.get("fallback_category", categories[0])),
+        keywords=tuple(keywords),
+        single_index=single_index,
+        phrase_index=phrase_index,
+        phrase_starts=frozenset(key[0] for key in phrase_index),
+        phrase_lengths=tuple(sorted({len(key) for key in phrase_index})),
+        keyword_categories=tuple(tuple(sorted(ids)) for ids in keyword_categories),
+        keyword_areas=tuple(tuple(sorted(ids)) for ids in keyword_areas),
+        research_areas=research_areas,
+        area_min_keywords=int(area_rules.get("min_keywords", 2)),
+        area_max=int(area_rules.get("max_areas", 4)),
+        area_fallback=area_rules.get("fallback", "Content Analysis"),
+        weak_categories=frozenset(check_category(c) for c in weak.get("names", [])),
+        weak_min_keywords=int(weak.get("min_keywords", 1)),
+        weak_relative_threshold=float(weak.get("relative_threshold", 0.0)),
+        domain_rules=tuple(domain_rules),
+        topic_boosts=topic_boosts,
+        takeaway_category=check_category(takeaway["category"]) if takeaway.get("category") else None,
+        takeaway_min=int(takeaway.get("min_takeaways", 0)),
+        takeaway_boost=int(takeaway.get("boost", 0)),
+    )
+
+
+def load_taxonomy(
+    path: Optional[Union[str, Path]] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> CompiledTaxonomy:
+    """
+    Load a compiled taxonomy, using the in-process and on-disk caches.
+
+    Args:
+        path: Taxonomy file (.json, .yaml or .yml); defaults to the bundled one
+        cache_dir: Where compiled artefacts are stored
+
+    Returns:
+        CompiledTaxonomy
+    """
+    path = Path(path) if path else DEFAULT_TAXONOMY_PATH
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    with _memo_lock:
+        compiled = _memo.get(memo_key)
+        if compiled is not None:
+            return compiled
+
+        raw = path.read_bytes()
+        source_hash = hashlib.sha256(COMPILER_VERSION.encode() + b"\0" + raw).hexdigest()
+        cache_file = Path(cache_dir or DEFAULT_CACHE_DIR) / f"taxonomy-{source_hash[:16]}.pickle"
+
+        compiled = _read_cached(cache_file, source_hash)
+        if compiled is None:
+            compiled = compile_taxonomy(_parse(path, raw), source_hash)
+            _write_cached(cache_file, compiled)
+            logger.info(f"Compiled taxonomy {path.name}: {len(compiled.categories)} categories, {len(compiled.keywords)} keywords")
+
+        _memo[memo_key] = compiled
+        return compiled
+
+
+_memo: Dict[tuple, CompiledTaxonomy] = {}
+_memo_lock = threading.Lock()
+
+
+def _plural(word: str) -> str:
+    """
+    Regular English plural of a lowercase word.
+
+    Irregular nouns ("person") are not handled; list their plural as a
+    keyword when it matters. Words ending in a digit are returned as is.
+    """
+    if not word or not word[-1].isalpha():
+        return word
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return word + "es"
+    if word.endswith("y") and len(word) > 1 and word[-2] not in "aeiou":
+        return word[:-1] + "ies"
+    return word + "s"
+
+
+def _parse(path: Path, raw: bytes) -> Dict[str, Any]:
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("PyYAML is required for YAML taxonomies. Install with: pip install pyyaml")
+        return yaml.safe_load(raw)
+    return json.loads(raw)
+
+
+def _read_cached(cache_file: Path, source_hash: str) -> Optional[CompiledTaxonomy]:
+    try:
+        with open(cache_file, "rb") as f:
+            compiled = pickle.load(f)
+        if isinstance(compiled, CompiledTaxonomy) and compiled.source_hash == source_hash:
+            return compiled
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable taxonomy cache {cache_file}: {e}")
+    return None
+
+
+def _write_cached(cache_file: Path, compiled: CompiledTaxonomy) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_file.with_name(cache_file.name + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not cache compiled taxonomy: {e}")
@@ -0,0 +1,130 @@
+"""
+Transcript Cleaning
+Single-pass normalizer for speech-to-text output.
+"""
+
+import re
+from typing import Iterable, Iterator
+
+
+class TranscriptCleaner:
+    """
+    Remove filler words, collapse whitespace and normalize punctuation in one pass.
+
+    All rules are folded into a single compiled alternation at class load, so
+    cleaning a transcript walks it once and builds the output once instead of
+    allocating a new full-length string per rule.
+
+    The cleaner can also be fed transcript segments as they arrive
+    (``feed``/``flush``); the streamed output is identical to cleaning the
+    concatenated text in one go.
+    """
+
+    FILLER_WORDS = ("um", "uh", "hmm", "like", "you know", "basically", "literally")
+
+    # A "gap" is any run of whitespace and filler words between two tokens
+    _GAP = r"(?:\s+|\b(?:%s)\b)+" % "|".join(re.escape(w) for w in FILLER_WORDS)
+
+    # Runs of the same mark collapse to one, also across gaps, so a filler
+    # between two marks ("Okay. Um. So") leaves a single mark behind
+    PATTERN = re.compile(
+        r"(?P<gap_before_punct>%s)(?=[.,!?])"
+        r"|(?P<gap>%s)"
+        r"|(?P<dots>\.(?:(?:%s)?\.)+)"
+        r"|(?P<bangs>!(?:(?:%s)?!)+)"
+        r"|(?P<commas>,(?:(?:%s)?,)+)" % (_GAP, _GAP, _GAP, _GAP, _GAP),
+        re.IGNORECASE,
+    )
+
+    _REPLACEMENTS = {
+        "gap_before_punct": "",
+        "gap": " ",
+        "dots": ".",
+        "bangs": "!",
+        "commas": ",",
+    }
+
+    # Streaming can only cut a segment right after a complete word that no rule
+    # can extend; everything past the last such word waits for more input
+    _SAFE_CUT = re.compile(r"\b\w+(?=\s)")
+    _UNSAFE_WORDS = frozenset(w for filler in FILLER_WORDS for w in filler.split())
+
+    def __init__(self):
+        self._carry = ""
+        self._pending_space = False
+        self._started = False
+
+    @classmethod
+    def _replace(cls, match: re.Match) -> str:
+        return cls._REPLACEMENTS[match.lastgroup]
+
+    @classmethod
+    def clean(cls, text: str) -> str:
+        """
+        Clean a complete transcript.
+
+        Args:
+            text: Raw transcription
+
+        Returns:
+            Cleaned text
+        """
+        return cls.PATTERN.sub(cls._replace, text).strip()
+
+    def feed(self, segment: str) -> str:
+        """
+        Clean the next transcript segment.
+
+        Args:
+            segment: Raw text as it arrives (e.g. one Whisper segment)
+
+        Returns:
+            Cleaned text that is final so far (may be empty)
+        """
+        buffer = self._carry + segment
+        cut = 0
+        for match in self._SAFE_CUT.finditer(buffer):
+            if match.group().lower() not in self._UNSAFE_WORDS:
+                cut = match.end()
+        self._carry = buffer[cut:]
+        return self._emit(self.PATTERN.sub(self._replace, buffer[:cut]))
+
+    def flush(self) -> str:
+        """Clean whatever is still buffered and reset the stream."""
+        output = self._emit(self.PATTERN.sub(self._replace, self._carry))
+        self._carry = ""
+        self._pending_space = False
+        self._started = False
+        return output
+
+    def stream(self, segments: Iterable[str]) -> Iterator[str]:
+        """
+        Clean an iterable of segments lazily.
+
+        Args:
+            segments: Raw transcript segments
+
+        Yields:
+            Non-empty cleaned chunks whose concatenation equals ``clean``
+        """
+        for segment in segments:
+            chunk = self.feed(segment)
+            if chunk:
+                yield chunk
+        chunk = self.flush()
+        if chunk:
+            yield chunk
+
+    def _emit(self, text: str) -> str:
+        # A gap cut at a chunk edge is held back until we know whether
+        # punctuation (drop it) or a word (keep one space) follows.
+        body = text.strip(" ")
+        if not body:
+            self._pending_space = self._pending_space or bool(text)
+            return ""
+
+        space_before = self._pending_space or text[0] == " "
+        prefix = " " if space_before and self._started and body[0] not in ".,!?" else ""
+        self._started = True
+        self._pending_space = text[-1] == " "
+        return prefix + body
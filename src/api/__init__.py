@@ -0,0 +1,7 @@
+"""
+HTTP API for submitting and tracking analyses
+"""
+
+from .app import create_app
+
+__all__ = ["create_app"]
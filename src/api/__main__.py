@@ -0,0 +1,48 @@
+"""
+Run the analysis HTTP API.
+
+Usage:
+    python -m src.api [--host 127.0.0.1] [--port 8000] [--workers N] [--results-dir results]
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from src.api.app import create_app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.api", description="Serve the analysis HTTP API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="Analysis worker processes (default: from config)")
+    parser.add_argument("--max-pending", type=int, default=32, help="Queued and running jobs before rejecting with 429")
+    parser.add_argument("--results-dir", default=None, help="Results directory (default: from config)")
+    parser.add_argument("--no-warmup", action="store_true", help="Do not preload models in the workers")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise ImportError("uvicorn is required to serve the API. Install with: pip install uvicorn")
+
+    from src.config.app_config import get_config
+
+    config = get_config()
+    app = create_app(
+        results_dir=args.results_dir or config.storage.results_dir,
+        upload_dir=config.storage.temp_dir,
+        num_workers=args.workers or config.analysis.parallel_tasks,
+        max_pending=args.max_pending,
+        warmup_config=None if args.no_warmup else {"whisper_model": config.analysis.transcription_model},
+        media_quota_mb=config.storage.media_quota_mb,
+        max_result_age_days=config.storage.max_result_age_days if config.storage.auto_cleanup else None,
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
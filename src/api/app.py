@@ -0,0 +1,283 @@
+"""
+Analysis API
+Async HTTP service over the job queue, results store and search index.
+
+Endpoints:
+    POST /jobs                 submit a media file already in the upload directory, or a video URL
+    POST /jobs/upload          stream a media file in the request body and submit it
+    POST /jobs/batch           plan a batch of video URLs and submit them shortest first
+    GET  /jobs/{id}            job status and progress
+    GET  /jobs/{id}/events     progress as server-sent events
+    GET  /jobs/{id}/result     analysis results (202 while still running)
+    GET  /search               full-text search over past results
+    GET  /health               worker and queue status
+
+Analyses run in a fixed pool of warm worker processes; the number of queued
+and running jobs is capped and further submissions get 429 with Retry-After.
+"""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import logging
+
+from src.jobs import WorkerPool
+from src.jobs.queue import DONE, FINISHED_STATUSES
+from src.jobs.worker import is_url
+
+logger = logging.getLogger(__name__)
+
+SSE_POLL_INTERVAL = 0.5
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+# Analysis options clients may set; paths, models, devices and LLM endpoints stay server-side
+CLIENT_CONFIG_KEYS = frozenset({
+    "steps",
+    "language",
+    "categories",
+    "duplicate_policy",
+    "download_profile",
+    "stream_transcription",
+    "audio_fingerprint",
+    "enable_refinement",
+    "summary_mode",
+    "max_keyframes",
+    "keyframes_per_minute",
+    "keyframe_scene_threshold",
+    "max_research_results",
+})
+
+
+def create_app(
+    results_dir: Union[str, Path] = "results",
+    upload_dir: Union[str, Path] = "temp_uploads",
+    num_workers: int = 2,
+    max_pending: int = 32,
+    max_upload_mb: int = 500,
+    warmup_config: Optional[Dict[str, Any]] = None,
+    start_workers: bool = True,
+    media_quota_mb: int = 10240,
+    max_result_age_days: Optional[int] = None,
+):
+    """
+    Build the FastAPI application.
+
+    Args:
+        results_dir: Results directory (job queue and indexes live under it)
+        upload_dir: Root of the media store uploads and URL jobs' downloads are written to
+        num_workers: Worker processes, i.e. maximum concurrent analyses
+        max_pending: Queued plus running jobs before submissions get 429
+        max_upload_mb: Largest accepted upload
+        warmup_config: Config used to preload models in every worker (None skips preloading)
+        start_workers: Start the worker pool with the app (disable when
+            workers run separately via ``python -m src.jobs``)
+        media_quota_mb: Disk quota of the media store (LRU eviction beyond it)
+        max_result_age_days: Delete older results in the background (None keeps them)
+
+    Returns:
+        FastAPI application
+    """
+    try:
+        from contextlib import asynccontextmanager
+        from fastapi import FastAPI, HTTPException, Request
+        from fastapi.responses import JSONResponse, StreamingResponse
+    except ImportError:
+        raise ImportError("fastapi is required for the HTTP API. Install with: pip install fastapi uvicorn")
+
+    from src.storage import ResultsStore, search_results
+    from src.storage.media_store import MediaStore
+    from src.storage.metadata_cache import MetadataCache
+    from src.storage.storage_manager import StorageManager
+    from src.utils.download_planner import DownloadPlanner
+
+    results_dir = Path(results_dir)
+    media_store = MediaStore(upload_dir)
+    upload_root = media_store.root.resolve()
+    pool = WorkerPool(results_dir, num_workers=num_workers, warmup_config=warmup_config, temp_dir=upload_dir)
+    queue = pool.queue
+    storage = StorageManager(
+        media_store,
+        quota_bytes=media_quota_mb * 1024 * 1024,
+        queue=queue,
+        results_dir=results_dir,
+        max_result_age_days=max_result_age_days,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        storage.start()
+        if start_workers:
+            await asyncio.to_thread(pool.start)
+        yield
+        if start_workers:
+            await asyncio.to_thread(pool.stop)
+        await asyncio.to_thread(storage.stop)
+
+    app = FastAPI(title="Instagram Content Intelligence API", lifespan=lifespan)
+    app.state.pool = pool
+    app.state.storage = storage
+    metadata_cache = MetadataCache(media_store)
+
+    async def submit(video_path: str, config: Dict[str, Any], priority: int) -> Dict[str, Any]:
+        pending = await asyncio.to_thread(queue.pending)
+        if pending >= max_pending:
+            raise HTTPException(status_code=429, detail="Analysis queue is full", headers={"Retry-After": "30"})
+        job_id = await asyncio.to_thread(queue.submit, video_path, config, priority)
+        return await asyncio.to_thread(queue.get, job_id)
+
+    def client_config(config: Any) -> Dict[str, Any]:
+        if config is None:
+            return {}
+        if not isinstance(config, dict):
+            raise HTTPException(status_code=400, detail="config must be a JSON object")
+        unsupported = sorted(set(config) - CLIENT_CONFIG_KEYS)
+        if unsupported:
+            raise HTTPException(status_code=400, detail=f"Unsupported config keys: {', '.join(unsupported)}")
+        return dict(config)
+
+    def client_priority(priority: Any) -> int:
+        if priority is None:
+            return 0
+        if isinstance(priority, bool) or not isinstance(priority, int):
+            raise HTTPException(status_code=400, detail="priority must be an integer")
+        return priority
+
+    async def get_job(job_id: int) -> Dict[str, Any]:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return job
+
+    @app.post("/jobs", status_code=202)
+    async def submit_job(payload: Dict[str, Any]):
+        config = client_config(payload.get("config"))
+        priority = client_priority(payload.get("priority"))
+        url = payload.get("url")
+        if url:
+            # The worker downloads it, transcribing as the bytes arrive
+            if not isinstance(url, str) or not is_url(url.strip()):
+                raise HTTPException(status_code=400, detail="url must be an http(s) video URL")
+            return await submit(url.strip(), config, priority)
+
+        # Only media already in the upload directory; anything else goes through /jobs/upload
+        video_path = payload.get("video_path")
+        resolved = Path(video_path).resolve() if isinstance(video_path, str) and video_path else None
+        if resolved is None or not resolved.is_relative_to(upload_root) or not resolved.is_file():
+            raise HTTPException(status_code=400, detail="video_path must point to an existing file in the upload directory")
+        return await submit(str(resolved), config, priority)
+
+    @app.post("/jobs/upload", status_code=202)
+    async def upload_job(request: Request, filename: str, priority: int = 0, config: Optional[str] = None):
+        try:
+            job_config = client_config(json.loads(config) if config else None)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="config must be a JSON object")
+
+        # Refuse before reading the body when the queue is already full
+        if await asyncio.to_thread(queue.pending) >= max_pending:
+            raise HTTPException(status_code=429, detail="Analysis queue is full", headers={"Retry-After": "30"})
+
+        safe_name = _SAFE_NAME.sub("_", Path(filename).name) or "upload.mp4"
+        limit = max_upload_mb * 1024 * 1024
+
+        # Hashed while streaming; identical content is stored only once
+        with media_store.writer(safe_name) as writer:
+            async for chunk in request.stream():
+                if writer.size + len(chunk) > limit:
+                    raise HTTPException(status_code=413, detail=f"Upload exceeds {max_upload_mb} MB")
+                writer.write(chunk)
+            if writer.size == 0:
+                raise HTTPException(status_code=400, detail="Empty upload")
+            media = await asyncio.to_thread(writer.commit)
+
+        job_config = {**job_config, "file_name": safe_name}
+        return await submit(str(media.path.resolve()), job_config, priority)
+
+    @app.post("/jobs/batch", status_code=202)
+    async def submit_batch(payload: Dict[str, Any]):
+        urls = [url.strip() for url in payload.get("urls") or [] if isinstance(url, str) and url.strip()]
+        if not urls or not all(is_url(url) for url in urls):
+            raise HTTPException(status_code=400, detail="urls must be a non-empty list of http(s) video URLs")
+        config = client_config(payload.get("config"))
+        priority = client_priority(payload.get("priority"))
+
+        if await asyncio.to_thread(queue.pending) + len(set(urls)) > max_pending:
+            raise HTTPException(status_code=429, detail="Analysis queue is full", headers={"Retry-After": "30"})
+
+        # Metadata for the whole batch is fetched concurrently (and cached) before anything downloads
+        planner = DownloadPlanner(cache=metadata_cache)
+        try:
+            plans = await asyncio.to_thread(planner.plan_all, urls, config)
+        finally:
+            planner.close()
+
+        jobs = []
+        for plan in plans:
+            job_id = await asyncio.to_thread(queue.submit, plan.url, {**config, **plan.config}, priority + plan.priority)
+            jobs.append({
+                "url": plan.url,
+                "job_id": job_id,
+                "profile": plan.profile,
+                "duration": plan.duration,
+                "estimated_seconds": round(plan.estimated_seconds, 1),
+            })
+        return {"jobs": jobs}
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: int):
+        return await get_job(job_id)
+
+    @app.get("/jobs/{job_id}/result")
+    async def job_result(job_id: int):
+        job = await get_job(job_id)
+        if job["status"] not in FINISHED_STATUSES:
+            return JSONResponse(status_code=202, content=job)
+        if job["status"] != DONE or not job["result_file"]:
+            raise HTTPException(status_code=409, detail=job["error"] or f"Job {job['status']}")
+
+        store = await asyncio.to_thread(ResultsStore.open, results_dir)
+        results = await asyncio.to_thread(store.get_file, job["result_file"])
+        if results is None:
+            raise HTTPException(status_code=404, detail=f"Result {job['result_file']} not found")
+        return results
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: int, request: Request):
+        await get_job(job_id)
+
+        async def stream():
+            last = None
+            while not await request.is_disconnected():
+                job = await asyncio.to_thread(queue.get, job_id)
+                state = (job["status"], job["progress"], job["message"])
+                if state != last:
+                    last = state
+                    event = "done" if job["status"] in FINISHED_STATUSES else "progress"
+                    yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+                    if event == "done":
+                        return
+                await asyncio.sleep(SSE_POLL_INTERVAL)
+
+        return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @app.get("/search")
+    async def search(q: str, page: int = 1, per_page: int = 10):
+        per_page = min(max(per_page, 1), 100)
+        return await asyncio.to_thread(search_results, q, page, per_page, results_dir)
+
+    @app.get("/health")
+    async def health():
+        counts = await asyncio.to_thread(queue.counts)
+        media_bytes = await asyncio.to_thread(media_store.total_size)
+        return {
+            "workers": pool.alive if start_workers else None,
+            "max_pending": max_pending,
+            "jobs": counts,
+            "media_mb": round(media_bytes / 1024 / 1024, 1),
+            "media_quota_mb": media_quota_mb,
+        }
+
+    return app
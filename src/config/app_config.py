@@ -39,7 +39,9 @@ class StorageConfig:
     logs_dir: str = "logs"
     temp_dir: str = "temp_uploads"
     max_result_age_days: int = 30
-    auto_cleanup: bool = False
+    auto_cleanup: bool = False  # delete results older than max_result_age_days
+    download_cache_mb: int = 2048  # downloaded media kept for repeat URLs (LRU beyond this)
+    media_quota_mb: int = 10240  # all uploaded and downloaded media (LRU beyond this)
 
 
 @dataclass
@@ -56,11 +58,14 @@ class AnalysisConfig:
     
     # Summary settings
     summary_max_length: int = 200
+    summary_mode: str = "extractive"  # extractive, llm
+    summary_llm_budget: float = 60.0  # seconds before falling back to extractive
+    summary_llm_workers: int = 3
     
     # Research settings
     max_research_links: int = 10
     
-    # Parallel processing
+    # Parallel processing (number of analysis worker processes)
     parallel_tasks: int = 2
 
 
@@ -0,0 +1,8 @@
+"""
+Background analysis jobs: a persistent queue and worker processes
+"""
+
+from .queue import JobQueue
+from .worker import WorkerPool
+
+__all__ = ["JobQueue", "WorkerPool"]
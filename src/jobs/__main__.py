@@ -0,0 +1,45 @@
+"""
+Run analysis workers outside the Streamlit app.
+
+Usage:
+    python -m src.jobs [--workers N] [--results-dir results] [--temp-dir temp_uploads]
+"""
+
+import argparse
+import logging
+import signal
+import threading
+from typing import List, Optional
+
+from src.jobs.worker import WorkerPool
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.jobs", description="Run analysis worker processes")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker processes")
+    parser.add_argument("--results-dir", default=None, help="Results directory (default: from config)")
+    parser.add_argument("--temp-dir", default=None, help="Media directory for downloads (default: from config)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    from src.config.app_config import get_config
+
+    storage_config = get_config().storage
+    pool = WorkerPool(
+        args.results_dir or storage_config.results_dir,
+        num_workers=args.workers,
+        temp_dir=args.temp_dir or storage_config.temp_dir,
+    )
+    pool.start()
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    while not stopped.wait(5.0):
+        pool.ensure_running()
+    pool.stop()
+
+
+if __name__ == "__main__":
+    main()
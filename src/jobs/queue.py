@@ -0,0 +1,304 @@
+"""
+Job Queue
+SQLite-backed queue of analysis jobs shared by the UI, API and workers.
+
+Any process can submit jobs and poll their status; worker processes claim
+queued jobs atomically, report progress, and record where the result was
+saved. Jobs whose worker stops sending heartbeats are put back in the queue.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+from src.analysis.corpus_stats import get_index_dir
+
+logger = logging.getLogger(__name__)
+
+DB_FILE_NAME = "jobs.db"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    video_path TEXT NOT NULL,
+    media_path TEXT,
+    config TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result_file TEXT,
+    error TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority, id);
+"""
+
+JOB_COLUMNS = (
+    "id", "status", "priority", "video_path", "media_path", "progress", "message", "result_file",
+    "error", "worker", "attempts", "created_at", "started_at", "finished_at",
+)
+
+
+class JobQueue:
+    """
+    Persistent analysis job queue.
+
+    Connections are per thread, like ResultsStore.
+    """
+
+    def __init__(self, db_path: Union[str, Path], max_attempts: int = 2):
+        """
+        Open (and create if needed) a job database.
+
+        Args:
+            db_path: Path to the SQLite file
+            max_attempts: Times a job is started before a crashed run marks it failed
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "media_path" not in columns:
+                # Databases created before URL jobs recorded their media
+                conn.execute("ALTER TABLE jobs ADD COLUMN media_path TEXT")
+
+    @classmethod
+    def open(cls, results_dir: Union[str, Path] = "results") -> "JobQueue":
+        """Open the job queue that lives next to a results directory's indexes."""
+        return cls(get_index_dir(results_dir) / DB_FILE_NAME)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, video_path: str, config: Dict[str, Any], priority: int = 0) -> int:
+        """
+        Queue a video for analysis.
+
+        Args:
+            video_path: Path to the media file (must be readable by workers),
+                or an http(s) URL the worker downloads itself
+            config: Pipeline configuration
+            priority: Lower runs first; equal priorities run in submission order
+
+        Returns:
+            Job id
+        """
+        cursor = self._connect().execute(
+            "INSERT INTO jobs (status, priority, video_path, config, message, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (QUEUED, priority, str(video_path), json.dumps(config, default=str), "Queued", time.time())
+        )
+        logger.info(f"Queued job {cursor.lastrowid} for {video_path}")
+        return cursor.lastrowid
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Current state of a job.
+
+        Returns:
+            Dict with JOB_COLUMNS, or None for an unknown id
+        """
+        row = self._connect().execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """List jobs, newest first, optionally filtered by status."""
+        sql = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+        params: list = []
+        if status is not None:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {row[0]: row[1] for row in rows}
+
+    def pending(self) -> int:
+        """Number of jobs queued or running."""
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchone()[0]
+
+    def active_media(self) -> List[str]:
+        """
+        Media paths of jobs queued or running (their files must not be deleted).
+
+        Includes the media URL jobs resolved to (see set_media) as well as
+        the submitted paths.
+        """
+        rows = self._connect().execute(
+            "SELECT video_path FROM jobs WHERE status IN (?, ?) "
+            "UNION SELECT media_path FROM jobs WHERE status IN (?, ?) AND media_path IS NOT NULL",
+            (QUEUED, RUNNING, QUEUED, RUNNING)
+        )
+        return [row[0] for row in rows]
+
+    def set_media(self, job_id: int, media_path: str) -> None:
+        """Record the media file a running URL job downloaded, so it is not evicted."""
+        self._connect().execute(
+            "UPDATE jobs SET media_path = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+            (str(media_path), time.time(), job_id, RUNNING)
+        )
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the next queued job for a worker.
+
+        Args:
+            worker: Worker identifier recorded on the job
+
+        Returns:
+            Job dict including the parsed ``config``, or None if the queue is empty
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY priority, id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, started_at = ?, "
+                "heartbeat_at = ?, message = ? WHERE id = ?",
+                (RUNNING, worker, now, now, "Starting", row["id"])
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        job = dict(job)
+        job["config"] = json.loads(job["config"])
+        return job
+
+    def update_progress(self, job_id: int, progress: float, message: str) -> None:
+        """Record progress (0-1) and a stage message; also counts as a heartbeat."""
+        self._connect().execute(
+            "UPDATE jobs SET progress = ?, message = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+            (progress, message, time.time(), job_id, RUNNING)
+        )
+
+    def heartbeat(self, job_id: int) -> None:
+        """Mark a running job as still alive."""
+        self._connect().execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING)
+        )
+
+    def complete(self, job_id: int, result_file: Optional[str], message: str = "Analysis complete") -> None:
+        """Mark a job done and record the result file it produced (or reused)."""
+        self._finish(job_id, DONE, progress=1.0, message=message, result_file=result_file)
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Mark a job failed."""
+        self._finish(job_id, FAILED, message="Analysis failed", error=error)
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a job that has not started yet.
+
+        Returns:
+            True if the job was cancelled
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, message = ?, finished_at = ? WHERE id = ? AND status = ?",
+            (CANCELLED, "Cancelled", time.time(), job_id, QUEUED)
+        )
+        return cursor.rowcount > 0
+
+    def requeue_stale(self, timeout: float = 120.0) -> int:
+        """
+        Recover jobs whose worker died.
+
+        Running jobs without a heartbeat for ``timeout`` seconds are queued
+        again, or failed once they have used up ``max_attempts``.
+
+        Returns:
+            Number of jobs recovered
+        """
+        cutoff = time.time() - timeout
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            failed = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, message = ?, finished_at = ? "
+                "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                (FAILED, "Worker stopped responding", "Analysis failed", time.time(), RUNNING, cutoff, self.max_attempts)
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, message = ? WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, "Requeued after worker failure", RUNNING, cutoff)
+            ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if failed or requeued:
+            logger.warning(f"Recovered stale jobs: {requeued} requeued, {failed} failed")
+        return failed + requeued
+
+    def wait(self, job_id: int, timeout: Optional[float] = None, poll_interval: float = 0.5) -> Dict[str, Any]:
+        """
+        Block until a job finishes.
+
+        Args:
+            job_id: Job to wait for
+            timeout: Give up after this many seconds (None waits forever)
+            poll_interval: Seconds between status checks
+
+        Returns:
+            Final (or, on timeout, current) job state
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in FINISHED_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def _finish(self, job_id: int, status: str, **fields) -> None:
+        fields["finished_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._connect().execute(
+            f"UPDATE jobs SET status = ?, {assignments} WHERE id = ? AND status = ?",
+            (status, *fields.values(), job_id, RUNNING)
+        )
@@ -0,0 +1,212 @@
+"""
+Analysis Workers
+Fixed pool of worker processes that drain the job queue.
+
+Each worker process keeps its own warm agents and models (e.g. the cached
+Whisper model) across jobs, and runs one job at a time.
+"""
+
+import multiprocessing
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+from src.jobs.queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 10.0
+STALE_JOB_TIMEOUT = 120.0
+
+
+def is_url(video_path: str) -> bool:
+    """True if a job's media is a URL still to be downloaded rather than a file."""
+    return video_path.lower().startswith(("http://", "https://"))
+
+
+def process_job(
+    queue: JobQueue,
+    job: Dict[str, Any],
+    results_dir: Optional[Union[str, Path]] = None,
+    temp_dir: Optional[Union[str, Path]] = None,
+) -> None:
+    """
+    Run one claimed job through the analysis pipeline.
+
+    Args:
+        queue: Queue the job was claimed from
+        job: Job returned by JobQueue.claim
+        results_dir: Results directory the pipeline saves to (default: configured)
+        temp_dir: Media directory URL jobs download to (default: configured)
+    """
+    from src.analysis.pipeline import AnalysisPipeline
+
+    job_id = job["id"]
+    done = threading.Event()
+
+    # Long stages (transcription) report no progress; keep the job alive meanwhile
+    def beat():
+        beat_queue = JobQueue(queue.db_path)
+        while not done.wait(HEARTBEAT_INTERVAL):
+            beat_queue.heartbeat(job_id)
+
+    heartbeat_thread = threading.Thread(target=beat, name=f"job-{job_id}-heartbeat", daemon=True)
+    heartbeat_thread.start()
+
+    try:
+        pipeline = AnalysisPipeline(config=job["config"], results_dir=results_dir, temp_dir=temp_dir)
+        progress_callback = lambda fraction, message: queue.update_progress(job_id, fraction, message)
+        if is_url(job["video_path"]):
+            # Downloaded by the worker, transcribing while it downloads
+            results = pipeline.run_url(
+                job["video_path"],
+                progress_callback=progress_callback,
+                media_callback=lambda media_path: queue.set_media(job_id, media_path),
+            )
+        else:
+            results = pipeline.run(job["video_path"], progress_callback=progress_callback)
+        if results.get("reused_from"):
+            queue.complete(job_id, results["reused_from"], message="Reused earlier analysis")
+        else:
+            queue.complete(job_id, pipeline.result_file)
+        logger.info(f"Job {job_id} completed")
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+        queue.fail(job_id, str(e))
+    finally:
+        done.set()
+        heartbeat_thread.join()
+
+
+def warm_up(config: Dict[str, Any]) -> None:
+    """Load the Whisper model before the first job so it does not pay the load time."""
+    try:
+        from src.analysis.agents import TranscriptionAgent
+
+        TranscriptionAgent(config)._get_model()
+    except Exception as e:
+        logger.warning(f"Model warm-up failed: {e}")
+
+
+def run_worker(
+    db_path: str,
+    worker_id: str,
+    stop_event,
+    poll_interval: float = 0.5,
+    warmup_config: Optional[Dict[str, Any]] = None,
+    results_dir: Optional[str] = None,
+    temp_dir: Optional[str] = None,
+) -> None:
+    """
+    Worker process main loop: claim, run, repeat until stopped.
+
+    Args:
+        db_path: Job database path
+        worker_id: Name recorded on claimed jobs
+        stop_event: multiprocessing.Event that ends the loop
+        poll_interval: Seconds to wait when the queue is empty
+        warmup_config: If given, preload models with this config before claiming jobs
+        results_dir: Results directory jobs are saved to
+        temp_dir: Media directory URL jobs download to
+    """
+    queue = JobQueue(db_path)
+    if warmup_config is not None:
+        warm_up(warmup_config)
+    logger.info(f"Worker {worker_id} started (pid {os.getpid()})")
+
+    while not stop_event.is_set():
+        try:
+            job = queue.claim(worker_id)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} could not claim a job: {e}")
+            job = None
+
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+
+        process_job(queue, job, results_dir, temp_dir)
+
+    logger.info(f"Worker {worker_id} stopped")
+
+
+class WorkerPool:
+    """
+    Fixed-size pool of analysis worker processes.
+
+    Example:
+        pool = WorkerPool(num_workers=2)
+        pool.start()
+        job_id = pool.queue.submit("video.mp4", config)
+    """
+
+    def __init__(
+        self,
+        results_dir: Union[str, Path] = "results",
+        num_workers: int = 2,
+        poll_interval: float = 0.5,
+        warmup_config: Optional[Dict[str, Any]] = None,
+        temp_dir: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            results_dir: Results directory whose job queue the workers drain
+                and that their analyses are saved to
+            num_workers: Number of worker processes
+            poll_interval: Seconds idle workers wait between queue checks
+            warmup_config: Preload models in each worker with this config
+            temp_dir: Media directory URL jobs download to (default: the
+                configured storage.temp_dir)
+        """
+        self.results_dir = Path(results_dir)
+        self.temp_dir = Path(temp_dir) if temp_dir else None
+        self.queue = JobQueue.open(results_dir)
+        self.num_workers = max(1, num_workers)
+        self.poll_interval = poll_interval
+        self.warmup_config = warmup_config
+        # Spawned children do not inherit the parent's threads or locks
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes: List[Optional[multiprocessing.Process]] = [None] * self.num_workers
+
+    def start(self) -> None:
+        """Recover jobs left by dead workers and start any worker that is not running."""
+        self.queue.requeue_stale(STALE_JOB_TIMEOUT)
+        for index, process in enumerate(self._processes):
+            if process is not None and process.is_alive():
+                continue
+            worker_id = f"worker-{os.getpid()}-{index}"
+            process = self._context.Process(
+                target=run_worker,
+                args=(
+                    str(self.queue.db_path), worker_id, self._stop_event, self.poll_interval, self.warmup_config,
+                    str(self.results_dir), str(self.temp_dir) if self.temp_dir else None,
+                ),
+                name=worker_id,
+                daemon=True,
+            )
+            process.start()
+            self._processes[index] = process
+
+    def ensure_running(self) -> None:
+        """Restart crashed workers (cheap to call on every UI rerun)."""
+        if not all(process is not None and process.is_alive() for process in self._processes):
+            self.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ask workers to finish their current job and exit."""
+        self._stop_event.set()
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+        self._processes = [None] * self.num_workers
+        self._stop_event = self._context.Event()
+
+    @property
+    def alive(self) -> int:
+        """Number of running worker processes."""
+        return sum(1 for process in self._processes if process is not None and process.is_alive())
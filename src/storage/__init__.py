@@ -0,0 +1,21 @@
+"""
+Storage modules for analysis results
+"""
+
+from .results_store import ResultsStore
+from .search_index import SearchIndex, search_results
+from .duplicate_index import DuplicateIndex
+from .archive import export_archive, restore_archive, load_archive_dataframe
+from .indexing import index_result, unindex_results
+
+__all__ = [
+    "ResultsStore",
+    "SearchIndex",
+    "search_results",
+    "DuplicateIndex",
+    "export_archive",
+    "restore_archive",
+    "load_archive_dataframe",
+    "index_result",
+    "unindex_results",
+]
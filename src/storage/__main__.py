@@ -0,0 +1,52 @@
+"""
+Maintenance commands for the results indexes.
+
+Usage:
+    python -m src.storage rebuild-search [results_dir]
+    python -m src.storage rebuild-fingerprints [results_dir]
+    python -m src.storage rebuild-results [results_dir]
+    python -m src.storage export-archive ARCHIVE [results_dir]
+    python -m src.storage restore-archive ARCHIVE [results_dir]
+"""
+
+import argparse
+from typing import List, Optional
+
+from src.storage.archive import export_archive, restore_archive
+from src.storage.duplicate_index import DB_FILE_NAME as FINGERPRINT_DB_FILE_NAME, DuplicateIndex
+from src.storage.results_store import DB_FILE_NAME as RESULTS_DB_FILE_NAME, ResultsStore
+from src.storage.search_index import DB_FILE_NAME as SEARCH_DB_FILE_NAME, SearchIndex
+from src.analysis.corpus_stats import get_index_dir
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.storage", description="Maintain the results indexes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("rebuild-search", "rebuild-fingerprints", "rebuild-results"):
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument("results_dir", nargs="?", default="results", help="Results directory")
+    for command in ("export-archive", "restore-archive"):
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument("archive", help="Archive file (.parquet or .arrow)")
+        subparser.add_argument("results_dir", nargs="?", default="results", help="Results directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild-search":
+        count = SearchIndex(get_index_dir(args.results_dir) / SEARCH_DB_FILE_NAME).rebuild(args.results_dir)
+        print(f"Search index rebuilt with {count} results")
+    elif args.command == "rebuild-fingerprints":
+        count = DuplicateIndex(get_index_dir(args.results_dir) / FINGERPRINT_DB_FILE_NAME).rebuild(args.results_dir)
+        print(f"Duplicate index rebuilt with {count} results")
+    elif args.command == "rebuild-results":
+        count = ResultsStore(get_index_dir(args.results_dir) / RESULTS_DB_FILE_NAME).rebuild(args.results_dir)
+        print(f"Results store rebuilt with {count} results")
+    elif args.command == "export-archive":
+        count = export_archive(args.archive, results_dir=args.results_dir)
+        print(f"Archived {count} results to {args.archive}")
+    elif args.command == "restore-archive":
+        count = restore_archive(args.archive, args.results_dir)
+        print(f"Restored {count} results to {args.results_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Results Archive
+Export analysis history to a compressed columnar file and restore it.
+
+Each result becomes one row. Listing fields get their own columns, with
+categories, statuses and tags dictionary-encoded. The ``config`` dict that
+every result repeats is stored once per distinct value through dictionary
+encoding, and the remaining document is kept as compact JSON. Parquet or
+Arrow IPC with zstd is written through the optional ``pyarrow`` dependency.
+Every original result can be rebuilt exactly from its row.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import logging
+
+from src.storage.results_store import summarize_result
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("parquet", "arrow")
+
+# Columns that are cheap to load for analytics (no transcript or payload)
+SUMMARY_COLUMNS = [
+    "result_file", "file_name", "timestamp", "analyzed_at", "file_hash",
+    "primary_category", "confidence", "status", "tags",
+]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for result archives (.parquet/.arrow). "
+            "Install with: pip install -r requirements.txt (or pip install pyarrow)"
+        )
+
+
+def _split_result(results: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[List[str]], str]:
+    """Separate config, transcription and tags from the rest of a result."""
+    payload = dict(results)
+    config = transcription = tags = None
+
+    if "config" in payload:
+        config = json.dumps(payload["config"], separators=(",", ":"))
+        payload["config"] = None
+    if "transcription" in payload:
+        transcription = payload["transcription"]
+        payload["transcription"] = None
+
+    categorization = payload.get("categorization")
+    if isinstance(categorization, dict) and isinstance(categorization.get("tags"), list) \
+            and all(isinstance(tag, str) for tag in categorization["tags"]):
+        tags = categorization["tags"]
+        payload["categorization"] = {**categorization, "tags": None}
+
+    return config, transcription, tags, json.dumps(payload, separators=(",", ":"))
+
+
+def _join_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of _split_result."""
+    results = json.loads(row["payload"])
+    if "config" in results and row["config"] is not None:
+        results["config"] = json.loads(row["config"])
+    if "transcription" in results:
+        results["transcription"] = row["transcription"]
+    if row["tags"] is not None:
+        results["categorization"]["tags"] = list(row["tags"])
+    return results
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def export_archive(
+    output_path: Union[str, Path],
+    results_dir: Union[str, Path] = "results",
+    archive_format: Optional[str] = None,
+) -> int:
+    """
+    Write every result in a directory to a columnar archive.
+
+    Args:
+        output_path: Archive file to write
+        results_dir: Directory containing result JSON files
+        archive_format: "parquet" or "arrow" (default: from the file extension,
+            falling back to parquet)
+
+    Returns:
+        Number of results archived
+    """
+    pa = _require_pyarrow()
+
+    output_path = Path(output_path)
+    archive_format = archive_format or ("arrow" if output_path.suffix in (".arrow", ".feather", ".ipc") else "parquet")
+    if archive_format not in FORMATS:
+        raise ValueError(f"Unknown archive format {archive_format!r}; expected one of {FORMATS}")
+
+    columns = {name: [] for name in SUMMARY_COLUMNS + ["config", "transcription", "payload"]}
+    for result_file in sorted(Path(results_dir).glob("*.json")):
+        try:
+            with open(result_file) as f:
+                results = json.load(f)
+        except Exception as e:
+            logger.error(f"Skipping unreadable result {result_file}: {e}")
+            continue
+
+        summary = summarize_result(results)
+        config, transcription, tags, payload = _split_result(results)
+        columns["result_file"].append(result_file.name)
+        columns["file_name"].append(summary["file_name"])
+        columns["timestamp"].append(summary["timestamp"])
+        columns["analyzed_at"].append(_parse_timestamp(summary["timestamp"]))
+        columns["file_hash"].append(summary["file_hash"])
+        columns["primary_category"].append(summary["primary_category"])
+        columns["confidence"].append(summary["confidence"])
+        columns["status"].append(summary["status"])
+        columns["tags"].append(tags)
+        columns["config"].append(config)
+        columns["transcription"].append(transcription)
+        columns["payload"].append(payload)
+
+    dict_string = pa.dictionary(pa.int32(), pa.string())
+    schema = pa.schema([
+        ("result_file", pa.string()),
+        ("file_name", pa.string()),
+        ("timestamp", pa.string()),
+        ("analyzed_at", pa.timestamp("us")),
+        ("file_hash", pa.string()),
+        ("primary_category", dict_string),
+        ("confidence", pa.int32()),
+        ("status", dict_string),
+        ("tags", pa.list_(dict_string)),
+        ("config", dict_string),
+        ("transcription", pa.large_string()),
+        ("payload", pa.large_string()),
+    ])
+    table = pa.Table.from_pydict(columns, schema=schema)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if archive_format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, output_path, compression="zstd")
+    else:
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.OSFile(str(output_path), "wb") as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+            writer.write_table(table)
+
+    logger.info(f"Archived {table.num_rows} results to {output_path}")
+    return table.num_rows
+
+
+def read_archive(archive_path: Union[str, Path], columns: Optional[List[str]] = None):
+    """
+    Load an archive as a pyarrow Table.
+
+    Args:
+        archive_path: Parquet or Arrow IPC archive
+        columns: Columns to load (default: all)
+
+    Returns:
+        pyarrow.Table
+    """
+    pa = _require_pyarrow()
+
+    archive_path = Path(archive_path)
+    with open(archive_path, "rb") as f:
+        is_parquet = f.read(4) == b"PAR1"
+
+    if is_parquet:
+        import pyarrow.parquet as pq
+        return pq.read_table(archive_path, columns=columns)
+
+    with pa.memory_map(str(archive_path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def load_archive_dataframe(archive_path: Union[str, Path], columns: Optional[List[str]] = None):
+    """
+    Load archive summary columns as a pandas DataFrame for analytics.
+
+    Args:
+        archive_path: Parquet or Arrow IPC archive
+        columns: Columns to load (default: SUMMARY_COLUMNS)
+
+    Returns:
+        pandas.DataFrame
+    """
+    return read_archive(archive_path, columns=columns or SUMMARY_COLUMNS).to_pandas()
+
+
+def iter_archived_results(archive_path: Union[str, Path]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Rebuild the original results from an archive.
+
+    Yields:
+        (result_file, results dict) pairs
+    """
+    table = read_archive(archive_path, columns=["result_file", "config", "transcription", "tags", "payload"])
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            yield row["result_file"], _join_result(row)
+
+
+def restore_archive(archive_path: Union[str, Path], output_dir: Union[str, Path]) -> int:
+    """
+    Write the results of an archive back out as JSON files and index them.
+
+    Args:
+        archive_path: Parquet or Arrow IPC archive
+        output_dir: Results directory to write ``analysis_*.json`` files into;
+            restored results are added to its results store, search and
+            duplicate indexes
+
+    Returns:
+        Number of results restored
+    """
+    from src.storage.indexing import index_result
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    restored = 0
+    for result_file, results in iter_archived_results(archive_path):
+        with open(output_dir / result_file, "w") as f:
+            json.dump(results, f, indent=2)
+        index_result(output_dir, results, result_file)
+        restored += 1
+    return restored
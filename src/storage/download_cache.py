@@ -0,0 +1,238 @@
+"""
+Download Cache
+Map video URLs to media already in the media store.
+
+Entries are keyed by the canonical ``<platform>:<video id>`` of a URL (see
+VideoDownloader.canonical_key) plus the download profile, so the same reel
+pasted with another query string or short domain is served from disk
+without any network access. Each entry records the content hash of the
+blob it resolved to. When the cached blobs exceed the disk quota, the least
+recently used ones are deleted.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+import logging
+
+from src.storage.media_store import MediaStore, StoredMedia
+
+logger = logging.getLogger(__name__)
+
+DB_FILE_NAME = "downloads.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    cache_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    file_hash TEXT NOT NULL,
+    path TEXT NOT NULL,
+    file_name TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_downloads_hash ON downloads(file_hash);
+CREATE INDEX IF NOT EXISTS idx_downloads_access ON downloads(last_access);
+"""
+
+# A video download also serves audio-only requests; not the other way round
+PROFILE_FALLBACKS = {
+    "audio": ("audio", "video"),
+    "video": ("video",),
+}
+
+
+@dataclass
+class CachedDownload:
+    """Result of download_cached."""
+    success: bool
+    message: str
+    media: Optional[StoredMedia] = None
+    file_name: Optional[str] = None  # name the file was downloaded under
+    cached: bool = False
+
+
+class DownloadCache:
+    """
+    URL to media blob cache with an LRU disk quota.
+
+    Connections are per thread, like ResultsStore.
+    """
+
+    def __init__(
+        self,
+        media_store: MediaStore,
+        quota_bytes: int = 2 * 1024 ** 3,
+        pinned: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        """
+        Args:
+            media_store: Store holding the cached blobs (the cache database lives in it)
+            quota_bytes: Total size of cached blobs before LRU eviction
+            pinned: Returns content hashes that must not be evicted
+                (e.g. StorageManager.pinned_hashes)
+        """
+        self.media_store = media_store
+        self.quota_bytes = quota_bytes
+        self.pinned = pinned
+        self.db_path = media_store.media_dir / DB_FILE_NAME
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def cache_key(url: str, profile: str = "video") -> str:
+        """Canonical cache key of a URL for a download profile."""
+        from src.utils.video_downloader import VideoDownloader
+
+        return f"{VideoDownloader.canonical_key(url)}#{profile}"
+
+    def lookup(self, url: str, profile: str = "video") -> Optional[CachedDownload]:
+        """
+        Cached media for a URL, if its blob is still on disk.
+
+        Args:
+            url: Video URL
+            profile: Download profile wanted
+
+        Returns:
+            CachedDownload with ``cached=True``, or None on a miss
+        """
+        conn = self._connect()
+        for candidate in PROFILE_FALLBACKS.get(profile, (profile,)):
+            key = self.cache_key(url, candidate)
+            row = conn.execute("SELECT * FROM downloads WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                continue
+            path = Path(row["path"])
+            if not path.exists():
+                with conn:
+                    conn.execute("DELETE FROM downloads WHERE cache_key = ?", (key,))
+                continue
+            with conn:
+                conn.execute("UPDATE downloads SET last_access = ? WHERE cache_key = ?", (time.time(), key))
+            self.media_store.touch(row["file_hash"])
+            media = StoredMedia(path=path, file_hash=row["file_hash"], size=row["size"], reused=True)
+            message = f"Using cached download ({media.file_hash[:12]})"
+            return CachedDownload(True, message, media, file_name=row["file_name"], cached=True)
+        return None
+
+    def record(self, url: str, media: StoredMedia, profile: str = "video", file_name: Optional[str] = None) -> None:
+        """Remember the media a URL downloaded to, then enforce the quota."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO downloads "
+                "(cache_key, url, file_hash, path, file_name, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.cache_key(url, profile), url, media.file_hash, str(media.path), file_name, media.size, now, now)
+            )
+        # Never evict what was just downloaded
+        self.evict(keep={media.file_hash, *(self.pinned() if self.pinned else ())})
+
+    def total_size(self) -> int:
+        """Bytes of distinct cached blobs."""
+        row = self._connect().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM downloads GROUP BY file_hash)"
+        ).fetchone()
+        return row[0]
+
+    def evict(self, keep: Iterable[str] = ()) -> int:
+        """
+        Delete least recently used blobs until the cache fits its quota.
+
+        Args:
+            keep: Content hashes that must not be deleted (e.g. media of running jobs)
+
+        Returns:
+            Number of blobs deleted
+        """
+        keep = set(keep)
+        total = self.total_size()
+        if total <= self.quota_bytes:
+            return 0
+
+        conn = self._connect()
+        # A blob is as recent as its most recently used key
+        rows = conn.execute(
+            "SELECT file_hash, MAX(size) AS size, MAX(last_access) AS last_access "
+            "FROM downloads GROUP BY file_hash ORDER BY last_access"
+        ).fetchall()
+
+        evicted = 0
+        for row in rows:
+            if total <= self.quota_bytes:
+                break
+            if row["file_hash"] in keep:
+                continue
+            for path in {r["path"] for r in conn.execute("SELECT path FROM downloads WHERE file_hash = ?", (row["file_hash"],))}:
+                self.media_store.remove(path)
+            with conn:
+                conn.execute("DELETE FROM downloads WHERE file_hash = ?", (row["file_hash"],))
+            total -= row["size"]
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} cached downloads; cache now {total / 1024 ** 2:.1f} MB")
+        return evicted
+
+
+def download_cached(
+    downloader,
+    url: str,
+    media_store: MediaStore,
+    cache: Optional[DownloadCache] = None,
+    progress_callback: Optional[Callable[[str], None]] = None,
+    profile: Optional[str] = None,
+) -> CachedDownload:
+    """
+    Download a URL into the media store, serving repeats from the cache.
+
+    Args:
+        downloader: VideoDownloader to use on a cache miss
+        url: Video URL
+        media_store: Store the download is moved into
+        cache: DownloadCache (None disables caching)
+        progress_callback: Receives progress messages
+        profile: Download profile (default: the downloader's)
+
+    Returns:
+        CachedDownload
+    """
+    profile = profile or downloader.profile
+    if cache is not None:
+        hit = cache.lookup(url, profile)
+        if hit is not None:
+            if progress_callback:
+                progress_callback(hit.message)
+            return hit
+
+    success, message, path = downloader.download(url, progress_callback, profile=profile)
+    if not success:
+        return CachedDownload(False, message)
+
+    file_name = Path(path).name
+    media = media_store.put_file(path, move=True)
+    if cache is not None:
+        cache.record(url, media, profile, file_name)
+    metadata = downloader.last_metadata()
+    if metadata:
+        from src.storage.metadata_cache import MetadataCache
+
+        # Caption, hashtags etc. came with the download; keep them for the analysis
+        MetadataCache(media_store).record_download(url, media.file_hash, metadata)
+    return CachedDownload(True, message, media, file_name=file_name)
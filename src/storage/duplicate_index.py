@@ -0,0 +1,232 @@
+"""
+Duplicate Index
+LSH index of media and transcript fingerprints for near-duplicate lookup.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+import logging
+
+from src.analysis.corpus_stats import get_index_dir
+from src.analysis.fingerprint import (
+    audio_lsh_keys,
+    fingerprint_similarity,
+    minhash_lsh_keys,
+    minhash_signature,
+    minhash_similarity,
+    pack_signature,
+    unpack_signature,
+)
+
+logger = logging.getLogger(__name__)
+
+DB_FILE_NAME = "fingerprints.db"
+
+# Minimum similarity for a candidate to count as a near-duplicate
+AUDIO_THRESHOLD = 0.8
+TRANSCRIPT_THRESHOLD = 0.8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    result_file TEXT PRIMARY KEY,
+    file_hash TEXT,
+    audio_fingerprint TEXT,
+    minhash BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_file_hash ON fingerprints(file_hash);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    kind TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    result_file TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON lsh_buckets(kind, bucket);
+CREATE INDEX IF NOT EXISTS idx_lsh_result_file ON lsh_buckets(result_file);
+"""
+
+
+class DuplicateIndex:
+    """
+    Fingerprints of saved results, queried through LSH buckets.
+
+    Lookups fetch only results that share at least one bucket with the
+    query and then verify the estimated similarity, so cost does not grow
+    with the size of the history.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (and create if needed) a fingerprint database.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, results_dir: Union[str, Path] = "results") -> "DuplicateIndex":
+        """
+        Open the index for a results directory, indexing existing files once.
+
+        Args:
+            results_dir: Directory containing ``analysis_*.json`` files
+
+        Returns:
+            DuplicateIndex instance
+        """
+        index = cls(get_index_dir(results_dir) / DB_FILE_NAME)
+        if index.count() == 0 and any(Path(results_dir).glob("*.json")):
+            index.rebuild(results_dir)
+        return index
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, results: Dict[str, Any], result_file: str) -> None:
+        """
+        Index the fingerprints of a saved result.
+
+        Args:
+            results: Full pipeline results (``file_hash``, ``audio_fingerprint``
+                and ``transcription`` are used when present)
+            result_file: Name of the JSON file the result was saved as
+        """
+        audio = results.get("audio_fingerprint")
+        signature = minhash_signature(results.get("transcription") or "")
+
+        buckets = []
+        if audio:
+            buckets += [("audio", key, result_file) for key in audio_lsh_keys(audio)]
+        if signature:
+            buckets += [("minhash", key, result_file) for key in minhash_lsh_keys(signature)]
+
+        conn = self._connect()
+        with conn:
+            self._delete(conn, [result_file])
+            conn.execute(
+                "INSERT INTO fingerprints (result_file, file_hash, audio_fingerprint, minhash) VALUES (?, ?, ?, ?)",
+                (result_file, results.get("file_hash"), audio, pack_signature(signature) if signature else None)
+            )
+            conn.executemany("INSERT INTO lsh_buckets (kind, bucket, result_file) VALUES (?, ?, ?)", buckets)
+
+    def remove(self, result_files: Iterable[str]) -> None:
+        """Drop deleted result files from the index."""
+        conn = self._connect()
+        with conn:
+            self._delete(conn, list(result_files))
+
+    def count(self) -> int:
+        """Number of indexed results."""
+        return self._connect().execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def find_media(
+        self,
+        file_hash: Optional[str] = None,
+        audio_fingerprint: Optional[str] = None,
+        threshold: float = AUDIO_THRESHOLD,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find results produced from the same or perceptually equal media.
+
+        Args:
+            file_hash: SHA-256 of the media file (exact match)
+            audio_fingerprint: Audio fingerprint (near match)
+            threshold: Minimum audio fingerprint similarity
+
+        Returns:
+            Matches sorted by similarity: dicts with result_file, match
+            ("exact" or "audio") and similarity
+        """
+        conn = self._connect()
+        matches = {}
+
+        if file_hash:
+            for row in conn.execute("SELECT result_file FROM fingerprints WHERE file_hash = ?", (file_hash,)):
+                matches[row["result_file"]] = {"result_file": row["result_file"], "match": "exact", "similarity": 1.0}
+
+        if audio_fingerprint:
+            for row in self._candidates(conn, "audio", audio_lsh_keys(audio_fingerprint), "audio_fingerprint"):
+                if row["result_file"] in matches:
+                    continue
+                similarity = fingerprint_similarity(audio_fingerprint, row["audio_fingerprint"])
+                if similarity >= threshold:
+                    matches[row["result_file"]] = {"result_file": row["result_file"], "match": "audio", "similarity": round(similarity, 3)}
+
+        return sorted(matches.values(), key=lambda m: m["similarity"], reverse=True)
+
+    def find_transcript(self, transcription: str, threshold: float = TRANSCRIPT_THRESHOLD) -> List[Dict[str, Any]]:
+        """
+        Find results whose transcript is a near-duplicate.
+
+        Args:
+            transcription: Transcript text
+            threshold: Minimum estimated Jaccard similarity of word shingles
+
+        Returns:
+            Matches sorted by similarity: dicts with result_file, match
+            ("transcript") and similarity
+        """
+        signature = minhash_signature(transcription)
+        if not signature:
+            return []
+
+        matches = []
+        for row in self._candidates(self._connect(), "minhash", minhash_lsh_keys(signature), "minhash"):
+            similarity = minhash_similarity(signature, unpack_signature(row["minhash"]))
+            if similarity >= threshold:
+                matches.append({"result_file": row["result_file"], "match": "transcript", "similarity": round(similarity, 3)})
+
+        return sorted(matches, key=lambda m: m["similarity"], reverse=True)
+
+    def rebuild(self, results_dir: Union[str, Path] = "results") -> int:
+        """
+        Re-index every result file in a directory.
+
+        Returns:
+            Number of results indexed
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM fingerprints")
+            conn.execute("DELETE FROM lsh_buckets")
+
+        indexed = 0
+        for result_file in sorted(Path(results_dir).glob("*.json")):
+            try:
+                with open(result_file) as f:
+                    self.add(json.load(f), result_file.name)
+                indexed += 1
+            except Exception as e:
+                logger.error(f"Failed to fingerprint {result_file}: {e}")
+        return indexed
+
+    @staticmethod
+    def _candidates(conn: sqlite3.Connection, kind: str, keys: List[str], column: str):
+        if not keys:
+            return []
+        placeholders = ", ".join("?" * len(keys))
+        return conn.execute(
+            f"SELECT result_file, {column} FROM fingerprints WHERE result_file IN "
+            f"(SELECT DISTINCT result_file FROM lsh_buckets WHERE kind = ? AND bucket IN ({placeholders}))",
+            [kind, *keys]
+        ).fetchall()
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, result_files: List[str]) -> None:
+        names = [(name,) for name in result_files]
+        conn.executemany("DELETE FROM lsh_buckets WHERE result_file = ?", names)
+        conn.executemany("DELETE FROM fingerprints WHERE result_file = ?", names)
@@ -0,0 +1,69 @@
+"""
+Result Indexing
+Keep every index of a results directory in step with the saved JSON files.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+import logging
+
+from src.storage.duplicate_index import DuplicateIndex
+from src.storage.results_store import ResultsStore
+from src.storage.search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+def index_result(results_dir: Union[str, Path], results: Dict[str, Any], result_file: str) -> None:
+    """
+    Register a newly saved result with the results store, search and duplicate indexes.
+
+    Each index is updated independently so one failing does not block the others.
+
+    Args:
+        results_dir: Directory the result was saved in
+        results: Full pipeline results
+        result_file: Name of the saved JSON file
+    """
+    try:
+        ResultsStore.open(results_dir).add(results, result_file=result_file)
+    except Exception as e:
+        logger.warning(f"Failed to update results store: {e}")
+
+    try:
+        SearchIndex.open(results_dir).add(results, result_file)
+    except Exception as e:
+        logger.warning(f"Failed to update search index: {e}")
+
+    try:
+        DuplicateIndex.open(results_dir).add(results, result_file)
+    except Exception as e:
+        logger.warning(f"Failed to update duplicate index: {e}")
+
+
+def unindex_results(results_dir: Union[str, Path], result_files: Iterable[str]) -> None:
+    """
+    Remove deleted result files from the results store, search and duplicate indexes.
+
+    Args:
+        results_dir: Directory the results were deleted from
+        result_files: Names of the deleted JSON files
+    """
+    result_files = list(result_files)
+    if not result_files:
+        return
+
+    try:
+        ResultsStore.open(results_dir).delete_files(result_files)
+    except Exception as e:
+        logger.warning(f"Failed to update results store: {e}")
+
+    try:
+        SearchIndex.open(results_dir).remove(result_files)
+    except Exception as e:
+        logger.warning(f"Failed to update search index: {e}")
+
+    try:
+        DuplicateIndex.open(results_dir).remove(result_files)
+    except Exception as e:
+        logger.warning(f"Failed to update duplicate index: {e}")
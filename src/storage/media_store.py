@@ -0,0 +1,361 @@
+"""
+Media Store
+Content-addressed storage for uploaded and downloaded media.
+
+Every file is stored once, under its SHA-256:
+
+    temp_uploads/media/<first two hex digits>/<sha256><ext>
+
+Uploads are streamed to a uniquely named temporary file while being hashed,
+then renamed into place, so concurrent sessions never overwrite each other
+and a second upload of the same bytes costs one hash and no extra copy.
+The pipeline reads the hash back from the blob name instead of hashing again.
+
+A small SQLite index (``media/index.db``) records every blob with its size
+and last access, so the storage manager can enforce a disk quota without
+rescanning the directory.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+MEDIA_DIR_NAME = "media"
+INCOMING_DIR_NAME = ".incoming"
+INDEX_FILE_NAME = "index.db"
+CHUNK_SIZE = 1024 * 1024
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    path TEXT PRIMARY KEY,
+    file_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_hash ON blobs(file_hash);
+CREATE INDEX IF NOT EXISTS idx_blobs_access ON blobs(last_access);
+"""
+
+_BLOB_NAME = re.compile(r"^[0-9a-f]{64}$")
+_SUFFIX = re.compile(r"^\.[A-Za-z0-9]{1,8}$")
+
+
+@dataclass
+class StoredMedia:
+    """A blob in the media store."""
+    path: Path
+    file_hash: str
+    size: int
+    reused: bool  # True if identical content was already stored
+
+
+def blob_hash(path: Union[str, Path]) -> Optional[str]:
+    """
+    SHA-256 of a media store blob, read from its name.
+
+    Args:
+        path: Any file path
+
+    Returns:
+        The hash if ``path`` is laid out like a store blob, else None
+    """
+    path = Path(path)
+    stem = path.stem
+    if _BLOB_NAME.match(stem) and path.parent.name == stem[:2] and path.parent.parent.name == MEDIA_DIR_NAME:
+        return stem
+    return None
+
+
+def _normalize_suffix(name: Optional[str]) -> str:
+    suffix = Path(name or "").suffix.lower()
+    return suffix if _SUFFIX.match(suffix) else ""
+
+
+class MediaWriter:
+    """
+    Incremental writer for one incoming file (see MediaStore.writer).
+
+    Call ``write`` for each chunk, then ``commit`` to move the file into the
+    store, or ``abort`` to discard it.
+    """
+
+    def __init__(self, store: "MediaStore", suffix: str):
+        self.store = store
+        self.suffix = suffix
+        self.size = 0
+        self._digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=store.incoming_dir, suffix=suffix)
+        self._file: BinaryIO = os.fdopen(fd, "wb")
+        self._temp_path = Path(temp_path)
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> StoredMedia:
+        """Finish the file and store it under its hash."""
+        self._file.close()
+        return self.store._adopt(self._temp_path, self._digest.hexdigest(), self.suffix, self.size)
+
+    def abort(self) -> None:
+        """Discard the partial file."""
+        self._file.close()
+        self._temp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "MediaWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None or not self._file.closed:
+            self.abort()
+
+
+class MediaStore:
+    """
+    Content-addressed media blobs under a temp directory.
+
+    Example:
+        store = MediaStore("temp_uploads")
+        media = store.put_stream(iter(lambda: upload.read(CHUNK_SIZE), b""), upload.name)
+        pipeline.run(str(media.path))
+    """
+
+    def __init__(self, root: Union[str, Path] = "temp_uploads"):
+        """
+        Args:
+            root: Directory holding the ``media`` blob tree
+        """
+        self.root = Path(root)
+        self.media_dir = self.root / MEDIA_DIR_NAME
+        self.incoming_dir = self.media_dir / INCOMING_DIR_NAME
+        self.incoming_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.media_dir / INDEX_FILE_NAME
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(INDEX_SCHEMA)
+
+    @classmethod
+    def for_blob(cls, path: Union[str, Path]) -> Optional["MediaStore"]:
+        """The store a blob path belongs to, or None if ``path`` is not a blob."""
+        path = Path(path)
+        if blob_hash(path) is None:
+            return None
+        return cls(path.parent.parent.parent)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def blob_path(self, file_hash: str, suffix: str = "") -> Path:
+        """Where content with this hash (and extension) is stored."""
+        return self.media_dir / file_hash[:2] / f"{file_hash}{suffix}"
+
+    def get(self, file_hash: str, suffix: str = "") -> Optional[Path]:
+        """Path of a stored blob, or None if it is not in the store."""
+        path = self.blob_path(file_hash, suffix)
+        return path if path.exists() else None
+
+    def writer(self, name: Optional[str] = None) -> MediaWriter:
+        """
+        Start writing an incoming file chunk by chunk.
+
+        Args:
+            name: Original file name (only its extension is kept, since
+                decoders rely on it)
+        """
+        return MediaWriter(self, _normalize_suffix(name))
+
+    def put_stream(self, chunks: Iterable[bytes], name: Optional[str] = None) -> StoredMedia:
+        """
+        Store a stream of bytes, hashing it as it is written.
+
+        Args:
+            chunks: Iterable of byte chunks
+            name: Original file name
+
+        Returns:
+            StoredMedia for the blob
+        """
+        with self.writer(name) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+            return writer.commit()
+
+    def put_fileobj(self, fileobj: BinaryIO, name: Optional[str] = None) -> StoredMedia:
+        """Store a readable binary file object (e.g. a Streamlit upload)."""
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        return self.put_stream(iter(lambda: fileobj.read(CHUNK_SIZE), b""), name)
+
+    def put_file(self, path: Union[str, Path], move: bool = False) -> StoredMedia:
+        """
+        Add an existing file to the store without copying its bytes.
+
+        The blob is a hard link to ``path`` (or ``path`` itself is moved in
+        when ``move`` is set); only a cross-device file is copied.
+
+        Args:
+            path: File to add
+            move: Take ownership of the file (it no longer exists at ``path``)
+
+        Returns:
+            StoredMedia for the blob
+        """
+        from src.utils import hash_file
+
+        path = Path(path)
+        existing_hash = blob_hash(path)
+        if existing_hash is not None and path.exists():
+            return self._record(StoredMedia(path=path, file_hash=existing_hash, size=path.stat().st_size, reused=True))
+
+        file_hash = hash_file(path)
+        suffix = _normalize_suffix(path.name)
+        size = path.stat().st_size
+        target = self.blob_path(file_hash, suffix)
+        if target.exists():
+            if move:
+                path.unlink()
+            return self._record(StoredMedia(path=target, file_hash=file_hash, size=size, reused=True))
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if move:
+                os.replace(path, target)
+            else:
+                os.link(path, target)
+        except FileExistsError:
+            # Another process stored the same content in the meantime
+            if move:
+                path.unlink()
+            return self._record(StoredMedia(path=target, file_hash=file_hash, size=size, reused=True))
+        except OSError:
+            # Different filesystem: fall back to a copy, renamed into place atomically
+            with self.writer(path.name) as writer, open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    writer.write(chunk)
+                media = writer.commit()
+            if move:
+                path.unlink()
+            return media
+
+        return self._record(StoredMedia(path=target, file_hash=file_hash, size=size, reused=False))
+
+    def _adopt(self, temp_path: Path, file_hash: str, suffix: str, size: int) -> StoredMedia:
+        """Rename a fully written incoming file into place, or drop it if the blob exists."""
+        target = self.blob_path(file_hash, suffix)
+        if target.exists():
+            temp_path.unlink(missing_ok=True)
+            logger.info(f"Media {file_hash[:12]} already stored; reusing it")
+            return self._record(StoredMedia(path=target, file_hash=file_hash, size=size, reused=True))
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Identical content from a concurrent writer is harmless to replace
+        os.replace(temp_path, target)
+        logger.info(f"Stored media {file_hash[:12]} ({size} bytes)")
+        return self._record(StoredMedia(path=target, file_hash=file_hash, size=size, reused=False))
+
+    def _record(self, media: StoredMedia) -> StoredMedia:
+        """Add a blob to the index (or mark it used, if it is already there)."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO blobs (path, file_hash, size, created_at, last_access) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET last_access = excluded.last_access",
+                    (str(media.path), media.file_hash, media.size, now, now)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not index media {media.file_hash[:12]}: {e}")
+        return media
+
+    def touch(self, file_hash: str) -> None:
+        """Mark every blob with this content as just used."""
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE blobs SET last_access = ? WHERE file_hash = ?", (time.time(), file_hash))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update access time of media {file_hash[:12]}: {e}")
+
+    def total_size(self) -> int:
+        """Bytes of all indexed blobs."""
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def least_recently_used(self) -> List[StoredMedia]:
+        """Indexed blobs, least recently used first."""
+        rows = self._connect().execute("SELECT path, file_hash, size FROM blobs ORDER BY last_access, created_at")
+        return [StoredMedia(path=Path(row["path"]), file_hash=row["file_hash"], size=row["size"], reused=True) for row in rows]
+
+    def remove(self, path: Union[str, Path]) -> None:
+        """Delete a blob and its index entry."""
+        Path(path).unlink(missing_ok=True)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM blobs WHERE path = ?", (str(path),))
+
+    def reindex(self) -> int:
+        """
+        Bring the index in line with the blob tree, e.g. after an upgrade or
+        manual deletions. This is the only operation that scans the directory.
+
+        Returns:
+            Number of entries added or dropped
+        """
+        on_disk = {}
+        for path in self.media_dir.glob("??/*"):
+            file_hash = blob_hash(path)
+            if file_hash is not None and path.is_file():
+                on_disk[str(path)] = (file_hash, path.stat())
+
+        conn = self._connect()
+        indexed = {row[0] for row in conn.execute("SELECT path FROM blobs")}
+        missing = indexed - on_disk.keys()
+        added = on_disk.keys() - indexed
+        with conn:
+            conn.executemany("DELETE FROM blobs WHERE path = ?", [(path,) for path in missing])
+            conn.executemany(
+                "INSERT OR IGNORE INTO blobs (path, file_hash, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                [(path, on_disk[path][0], on_disk[path][1].st_size, on_disk[path][1].st_mtime, on_disk[path][1].st_mtime)
+                 for path in added]
+            )
+        if missing or added:
+            logger.info(f"Media index: added {len(added)}, dropped {len(missing)} entries")
+        return len(missing) + len(added)
+
+    def discard_incoming(self, max_age_seconds: float = 3600.0) -> int:
+        """
+        Remove leftovers of interrupted uploads.
+
+        Args:
+            max_age_seconds: Only files untouched for this long are removed,
+                so uploads still in progress are left alone
+
+        Returns:
+            Number of files removed
+        """
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in self.incoming_dir.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
@@ -0,0 +1,205 @@
+"""
+Metadata Cache
+Remember video metadata (duration, formats, caption, hashtags...) fetched for URLs.
+
+Entries are keyed by the canonical ``<platform>:<video id>`` of a URL (see
+VideoDownloader.canonical_key), so planning a batch that repeats videos, or
+re-planning one, costs no extractor round trips. Metadata changes slowly
+(view counts aside), so entries simply expire after a few days.
+
+Downloads also link the content hash of the stored media to its video, so
+the pipeline finds the caption and hashtags of a file it is given without
+knowing its URL and without another network call. The spoken language
+identified before transcription is kept per content hash as well.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from src.storage.media_store import MediaStore
+
+logger = logging.getLogger(__name__)
+
+DB_FILE_NAME = "metadata.db"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS video_info (
+    cache_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    info TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS media_videos (
+    file_hash TEXT PRIMARY KEY,
+    cache_key TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS media_languages (
+    file_hash TEXT PRIMARY KEY,
+    language TEXT NOT NULL,
+    probability REAL,
+    detected_at REAL NOT NULL
+);
+"""
+
+
+class MetadataCache:
+    """
+    URL to video metadata cache, stored next to the media it describes.
+
+    Connections are per thread, like ResultsStore.
+    """
+
+    def __init__(self, media_store: MediaStore, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Args:
+            media_store: Store whose directory holds the cache database
+            ttl_seconds: Age after which metadata is fetched again
+        """
+        self.db_path = media_store.media_dir / DB_FILE_NAME
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        from src.utils.video_downloader import VideoDownloader
+
+        return VideoDownloader.canonical_key(url)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached metadata for a URL, or None if missing or expired."""
+        return self.get_many([url]).get(url)
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Cached metadata for several URLs in one query.
+
+        Args:
+            urls: Video URLs
+
+        Returns:
+            Metadata by URL, for the URLs with an unexpired entry
+        """
+        keys: Dict[str, List[str]] = {}
+        for url in urls:
+            keys.setdefault(self.cache_key(url), []).append(url)
+        if not keys:
+            return {}
+
+        placeholders = ", ".join("?" * len(keys))
+        rows = self._connect().execute(
+            f"SELECT cache_key, info FROM video_info WHERE cache_key IN ({placeholders}) AND fetched_at >= ?",
+            [*keys, time.time() - self.ttl_seconds]
+        ).fetchall()
+
+        found = {}
+        for row in rows:
+            try:
+                info = json.loads(row["info"])
+            except ValueError:
+                continue
+            for url in keys[row["cache_key"]]:
+                found[url] = info
+        return found
+
+    def put(self, url: str, info: Dict[str, Any]) -> None:
+        """Store metadata fetched for a URL."""
+        self.put_many([(url, info)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store metadata fetched for several URLs in one transaction."""
+        now = time.time()
+        rows = [(self.cache_key(url), url, json.dumps(info, default=str), now) for url, info in items]
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO video_info (cache_key, url, info, fetched_at) VALUES (?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not cache metadata for {len(rows)} videos: {e}")
+
+    def record_download(self, url: str, file_hash: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Link downloaded media to its video, storing metadata captured by the download.
+
+        Args:
+            url: URL the media was downloaded from
+            file_hash: Content hash of the stored media
+            metadata: Metadata the download produced (merged into any
+                cached entry, e.g. the planning facts from get_video_info)
+        """
+        try:
+            if metadata:
+                previous = self._connect().execute(
+                    "SELECT info FROM video_info WHERE cache_key = ?", (self.cache_key(url),)
+                ).fetchone()
+                self.put(url, {**(json.loads(previous["info"]) if previous else {}), **metadata})
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO media_videos (file_hash, cache_key) VALUES (?, ?)",
+                    (file_hash, self.cache_key(url))
+                )
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Could not record metadata of {url}: {e}")
+
+    def for_media(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadata of the video a stored media file was downloaded from.
+
+        Entries describe the download, so they are returned however old.
+
+        Args:
+            file_hash: Content hash of the media
+
+        Returns:
+            Metadata, or None for media not downloaded from a known video
+        """
+        row = self._connect().execute(
+            "SELECT v.info FROM media_videos m JOIN video_info v ON v.cache_key = m.cache_key WHERE m.file_hash = ?",
+            (file_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row["info"])
+        except ValueError:
+            return None
+
+    def get_language(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Language identified earlier for media: {"code", "probability"}, or None."""
+        row = self._connect().execute(
+            "SELECT language, probability FROM media_languages WHERE file_hash = ?", (file_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"code": row["language"], "probability": row["probability"]}
+
+    def put_language(self, file_hash: str, language: str, probability: Optional[float] = None) -> None:
+        """Remember the language identified for media."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO media_languages (file_hash, language, probability, detected_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (file_hash, language, probability, time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not cache language of {file_hash[:12]}: {e}")
@@ -0,0 +1,379 @@
+"""
+Results Store
+SQLite-backed repository of analysis results.
+
+Listing columns (timestamp, file hash, category, status) are indexed so list
+and filter queries touch only one page of rows; full result documents are
+kept zlib-compressed in a separate table and loaded only when opened.
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import logging
+
+from src.analysis.corpus_stats import get_index_dir, is_indexable_text
+
+logger = logging.getLogger(__name__)
+
+DB_FILE_NAME = "results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    result_file TEXT UNIQUE,
+    file_name TEXT,
+    timestamp TEXT NOT NULL,
+    file_hash TEXT,
+    primary_category TEXT,
+    confidence INTEGER,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_results_file_hash ON results(file_hash);
+CREATE INDEX IF NOT EXISTS idx_results_category ON results(primary_category, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results(status, timestamp, id);
+
+CREATE TABLE IF NOT EXISTS result_blobs (
+    result_id INTEGER PRIMARY KEY REFERENCES results(id) ON DELETE CASCADE,
+    body BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+SUMMARY_COLUMNS = ("id", "result_file", "file_name", "timestamp", "file_hash", "primary_category", "confidence", "status")
+
+
+def summarize_result(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the listing fields of an analysis result.
+
+    Args:
+        results: Full pipeline results
+
+    Returns:
+        Dict with file_name, timestamp, file_hash, primary_category, confidence, status
+    """
+    categorization = results.get("categorization") or {}
+    categories = categorization.get("categories") or []
+    confidence = categories[0].get("confidence", 0) if categories else categorization.get("confidence", 0)
+    transcription = results.get("transcription")
+
+    if results.get("error") or (transcription is not None and not is_indexable_text(transcription)):
+        status = "error"
+    else:
+        status = "complete"
+
+    return {
+        "file_name": results.get("file_name", "Unknown"),
+        "timestamp": results.get("timestamp", ""),
+        "file_hash": results.get("file_hash"),
+        # Demo results use "primary", pipeline results "primary_category"
+        "primary_category": categorization.get("primary_category") or categorization.get("primary"),
+        "confidence": int(confidence or 0),
+        "status": status,
+    }
+
+
+class ResultsStore:
+    """
+    Repository of analysis results in a WAL-mode SQLite database.
+
+    Connections are per thread, so one store can be shared by Streamlit
+    sessions and worker threads.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (and create if needed) a results database.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, results_dir: Union[str, Path] = "results") -> "ResultsStore":
+        """
+        Open the store for a results directory, importing existing JSON files once.
+
+        Args:
+            results_dir: Directory containing ``analysis_*.json`` files
+
+        Returns:
+            ResultsStore instance
+        """
+        store = cls(get_index_dir(results_dir) / DB_FILE_NAME)
+        if store.get_meta("imported_from") is None:
+            imported = store.import_directory(results_dir)
+            store.set_meta("imported_from", str(results_dir))
+            if imported:
+                logger.info(f"Imported {imported} existing results into {store.db_path}")
+        return store
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def add(self, results: Dict[str, Any], result_file: Optional[str] = None) -> int:
+        """
+        Insert an analysis result.
+
+        Args:
+            results: Full pipeline results
+            result_file: Name of the JSON file the result was saved as
+
+        Returns:
+            Row id of the stored result
+        """
+        summary = summarize_result(results)
+        body = zlib.compress(json.dumps(results).encode("utf-8"))
+
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(result_file, file_name, timestamp, file_hash, primary_category, confidence, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (result_file, summary["file_name"], summary["timestamp"], summary["file_hash"],
+                 summary["primary_category"], summary["confidence"], summary["status"])
+            )
+            result_id = cursor.lastrowid
+            conn.execute("INSERT OR REPLACE INTO result_blobs (result_id, body) VALUES (?, ?)", (result_id, body))
+            self._bump_version(conn)
+        return result_id
+
+    def get(self, result_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Load a full result document.
+
+        Args:
+            result_id: Row id from list()
+
+        Returns:
+            Results dict or None if not found
+        """
+        row = self._connect().execute("SELECT body FROM result_blobs WHERE result_id = ?", (result_id,)).fetchone()
+        return json.loads(zlib.decompress(row["body"])) if row else None
+
+    def get_file(self, result_file: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a full result document by its JSON file name.
+
+        Args:
+            result_file: File name the result was saved as
+
+        Returns:
+            Results dict or None if not found
+        """
+        row = self._connect().execute(
+            "SELECT b.body FROM results r JOIN result_blobs b ON b.result_id = r.id WHERE r.result_file = ?",
+            (result_file,)
+        ).fetchone()
+        return json.loads(zlib.decompress(row["body"])) if row else None
+
+    def list(
+        self,
+        limit: int = 20,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        before: Optional[Tuple[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List result summaries, newest first.
+
+        Uses keyset pagination: pass the (timestamp, id) of the last row of
+        one page as ``before`` to fetch the next, so each page costs an
+        index range scan of ``limit`` rows however deep it is.
+
+        Args:
+            limit: Page size
+            category: Only results with this primary category
+            status: Only results with this status
+            before: (timestamp, id) cursor from the previous page
+
+        Returns:
+            List of summary dicts (see SUMMARY_COLUMNS)
+        """
+        where, params = self._filters(category=category, status=status)
+        if before is not None:
+            where.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+            params.extend([before[0], before[0], before[1]])
+
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def count(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> int:
+        """
+        Count results matching the filters.
+
+        Args:
+            category: Only results with this primary category
+            status: Only results with this status
+            since: Only results with timestamp >= this ISO string
+
+        Returns:
+            Number of matching results
+        """
+        where, params = self._filters(category=category, status=status, since=since)
+        sql = "SELECT COUNT(*) FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._connect().execute(sql, params).fetchone()[0]
+
+    def group_counts(self, column: str, since: Optional[str] = None) -> Dict[Optional[str], int]:
+        """
+        Count results per primary category or status.
+
+        Args:
+            column: "primary_category" or "status"
+            since: Only results with timestamp >= this ISO string
+
+        Returns:
+            Dict mapping each value to its number of results
+        """
+        if column not in ("primary_category", "status"):
+            raise ValueError(f"Cannot group results by {column!r}")
+        where, params = self._filters(since=since)
+        sql = f"SELECT {column}, COUNT(*) FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" GROUP BY {column} ORDER BY COUNT(*) DESC"
+        return {row[0]: row[1] for row in self._connect().execute(sql, params)}
+
+    def version(self) -> int:
+        """
+        Change counter of the store.
+
+        Incremented in the same transaction as every insert or delete, so
+        readers can cache query results keyed on it.
+        """
+        value = self.get_meta("version")
+        return int(value) if value is not None else 0
+
+    def find_by_hash(self, file_hash: str) -> List[Dict[str, Any]]:
+        """List summaries of results produced from the same media file."""
+        rows = self._connect().execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM results WHERE file_hash = ? ORDER BY timestamp DESC",
+            (file_hash,)
+        )
+        return [dict(row) for row in rows]
+
+    def files_before(self, timestamp: str) -> List[str]:
+        """JSON file names of results analyzed before an ISO timestamp."""
+        rows = self._connect().execute(
+            "SELECT result_file FROM results WHERE timestamp < ? AND result_file IS NOT NULL", (timestamp,)
+        )
+        return [row[0] for row in rows]
+
+    def delete_files(self, result_files: Iterable[str]) -> int:
+        """
+        Delete results by their JSON file names.
+
+        Returns:
+            Number of rows deleted
+        """
+        names = [(name,) for name in result_files]
+        conn = self._connect()
+        with conn:
+            deleted = conn.executemany("DELETE FROM results WHERE result_file = ?", names).rowcount
+            if deleted:
+                self._bump_version(conn)
+        return deleted
+
+    def import_directory(self, results_dir: Union[str, Path] = "results") -> int:
+        """
+        Import ``*.json`` results that are not in the store yet.
+
+        Args:
+            results_dir: Directory containing result JSON files
+
+        Returns:
+            Number of results imported
+        """
+        known = {row[0] for row in self._connect().execute("SELECT result_file FROM results")}
+        imported = 0
+        for result_file in sorted(Path(results_dir).glob("*.json")):
+            if result_file.name in known:
+                continue
+            try:
+                with open(result_file) as f:
+                    self.add(json.load(f), result_file=result_file.name)
+                imported += 1
+            except Exception as e:
+                logger.error(f"Failed to import {result_file}: {e}")
+        return imported
+
+    def rebuild(self, results_dir: Union[str, Path] = "results") -> int:
+        """
+        Clear the store and re-import every result file in a directory.
+
+        Returns:
+            Number of results imported
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM results")
+            self._bump_version(conn)
+
+        imported = self.import_directory(results_dir)
+        self.set_meta("imported_from", str(results_dir))
+        return imported
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    @staticmethod
+    def _filters(category=None, status=None, since=None) -> Tuple[List[str], List[Any]]:
+        where, params = [], []
+        if category is not None:
+            where.append("primary_category = ?")
+            params.append(category)
+        if status is not None:
+            where.append("status = ?")
+            params.append(status)
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(since)
+        return where, params
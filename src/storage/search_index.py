@@ -0,0 +1,290 @@
+"""
+Search Index
+Full-text search over analysis results using SQLite FTS5.
+
+Transcripts, summaries, research findings and tags of every saved result are
+indexed once on save; queries are ranked with BM25 and return highlighted
+snippets without opening any result file.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+import logging
+
+from src.analysis.corpus_stats import get_index_dir, is_indexable_text
+
+logger = logging.getLogger(__name__)
+
+DB_FILE_NAME = "search.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    result_file TEXT UNIQUE NOT NULL,
+    file_name TEXT,
+    timestamp TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    file_name, transcription, summary, findings, tags,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# Bump when extract_search_fields changes, so existing indexes are rebuilt
+FIELDS_VERSION = 2
+
+# BM25 column weights, in documents_fts column order
+COLUMN_WEIGHTS = (2.0, 1.0, 2.0, 1.0, 3.0)
+
+_QUERY_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn free text from a search box into an FTS5 query.
+
+    Every word must match; the last one also matches as a prefix so results
+    appear while typing. Quoting each word keeps FTS5 operators in user
+    input from being interpreted.
+
+    Args:
+        text: Raw user query
+
+    Returns:
+        FTS5 MATCH expression, or None if the text has no searchable words
+    """
+    tokens = _QUERY_TOKEN.findall(text.lower())
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def extract_search_fields(results: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Collect the searchable text of an analysis result.
+
+    Args:
+        results: Full pipeline results
+
+    Returns:
+        Dict with file_name, transcription, summary, findings and tags
+    """
+    transcription = results.get("transcription") or ""
+    if not is_indexable_text(transcription):
+        transcription = ""
+    video_metadata = results.get("video_metadata") or {}
+    # Text read from the video's frames and the creator's caption are searched like spoken text
+    transcription = "\n".join(
+        part for part in (transcription, results.get("on_screen_text"), video_metadata.get("caption")) if part
+    )
+    summary = results.get("summary") or {}
+    research = results.get("research") or {}
+    categorization = results.get("categorization") or {}
+
+    summary_parts = [summary.get("summary") or ""] + list(summary.get("key_takeaways") or [])
+    findings = [finding for finding in research.get("findings") or [] if isinstance(finding, str)]
+    tags = list(categorization.get("tags") or [])
+    tags += [c.get("name", "") for c in categorization.get("categories") or [] if isinstance(c, dict)]
+    tags += [tag for tag in video_metadata.get("hashtags") or [] if tag.lower() not in {t.lower() for t in tags}]
+
+    return {
+        "file_name": results.get("file_name") or "",
+        "transcription": transcription,
+        "summary": "\n".join(summary_parts),
+        "findings": "\n".join(findings),
+        "tags": " ".join(tags),
+    }
+
+
+class SearchIndex:
+    """
+    FTS5 index of analysis results.
+
+    Connections are per thread, like ResultsStore.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (and create if needed) a search database.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, results_dir: Union[str, Path] = "results") -> "SearchIndex":
+        """
+        Open the search index for a results directory, indexing existing files
+        once and again whenever FIELDS_VERSION changes.
+
+        Args:
+            results_dir: Directory containing ``analysis_*.json`` files
+
+        Returns:
+            SearchIndex instance
+        """
+        index = cls(get_index_dir(results_dir) / DB_FILE_NAME)
+        conn = index._connect()
+        stale = conn.execute("PRAGMA user_version").fetchone()[0] < FIELDS_VERSION
+        if (stale or index.count() == 0) and any(Path(results_dir).glob("*.json")):
+            index.rebuild(results_dir)
+        if stale:
+            with conn:
+                conn.execute(f"PRAGMA user_version = {FIELDS_VERSION}")
+        return index
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, results: Dict[str, Any], result_file: str) -> None:
+        """
+        Index (or re-index) one result.
+
+        Args:
+            results: Full pipeline results
+            result_file: Name of the JSON file the result was saved as
+        """
+        fields = extract_search_fields(results)
+        conn = self._connect()
+        with conn:
+            self._delete(conn, [result_file])
+            doc_id = conn.execute(
+                "INSERT INTO documents (result_file, file_name, timestamp) VALUES (?, ?, ?)",
+                (result_file, fields["file_name"], results.get("timestamp", ""))
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO documents_fts (rowid, file_name, transcription, summary, findings, tags) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (doc_id, fields["file_name"], fields["transcription"], fields["summary"],
+                 fields["findings"], fields["tags"])
+            )
+
+    def remove(self, result_files: Iterable[str]) -> None:
+        """Drop deleted result files from the index."""
+        conn = self._connect()
+        with conn:
+            self._delete(conn, list(result_files))
+
+    def search(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 10,
+        highlight: tuple = ("**", "**"),
+    ) -> Dict[str, Any]:
+        """
+        Search indexed results.
+
+        Args:
+            query: Free-text query (all words must match, last word as prefix)
+            page: 1-based page number
+            per_page: Hits per page
+            highlight: Markers placed around matched terms in snippets
+
+        Returns:
+            Dict with ``total`` matching results and ``hits`` for the page; each
+            hit has result_file, file_name, timestamp, score and snippet
+        """
+        match = build_match_query(query)
+        if match is None:
+            return {"total": 0, "page": page, "per_page": per_page, "hits": []}
+
+        conn = self._connect()
+        try:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM documents_fts WHERE documents_fts MATCH ?", (match,)
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"""
+                SELECT d.result_file, d.file_name, d.timestamp,
+                       bm25(documents_fts, {', '.join(map(str, COLUMN_WEIGHTS))}) AS score,
+                       snippet(documents_fts, -1, ?, ?, '…', 16) AS snippet
+                FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid
+                WHERE documents_fts MATCH ?
+                ORDER BY score
+                LIMIT ? OFFSET ?
+                """,
+                (highlight[0], highlight[1], match, per_page, (max(page, 1) - 1) * per_page)
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Search failed for {query!r}: {e}")
+            return {"total": 0, "page": page, "per_page": per_page, "hits": []}
+
+        hits = [{**dict(row), "score": -row["score"]} for row in rows]
+        return {"total": total, "page": page, "per_page": per_page, "hits": hits}
+
+    def count(self) -> int:
+        """Number of indexed results."""
+        return self._connect().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def rebuild(self, results_dir: Union[str, Path] = "results") -> int:
+        """
+        Re-index every result file in a directory.
+
+        Returns:
+            Number of results indexed
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM documents")
+            conn.execute("DELETE FROM documents_fts")
+
+        indexed = 0
+        for result_file in sorted(Path(results_dir).glob("*.json")):
+            try:
+                with open(result_file) as f:
+                    self.add(json.load(f), result_file.name)
+                indexed += 1
+            except Exception as e:
+                logger.error(f"Failed to index {result_file}: {e}")
+
+        with conn:
+            conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('optimize')")
+        return indexed
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, result_files: List[str]) -> None:
+        for result_file in result_files:
+            row = conn.execute("SELECT id FROM documents WHERE result_file = ?", (result_file,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row["id"],))
+                conn.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
+
+
+def search_results(
+    query: str,
+    page: int = 1,
+    per_page: int = 10,
+    results_dir: Union[str, Path] = "results",
+) -> Dict[str, Any]:
+    """
+    Search the analysis history of a results directory.
+
+    Args:
+        query: Free-text query
+        page: 1-based page number
+        per_page: Hits per page
+        results_dir: Results directory
+
+    Returns:
+        See SearchIndex.search
+    """
+    return SearchIndex.open(results_dir).search(query, page=page, per_page=per_page)
@@ -0,0 +1,250 @@
+"""
+Storage Manager
+Keep ``temp_uploads`` within a disk quota.
+
+A background thread periodically:
+
+- evicts the least recently used media blobs until the store fits its byte
+  quota, skipping blobs pinned in this process and the media of queued or
+  running jobs;
+- removes loose files left directly in ``temp_uploads`` (interrupted
+  downloads, files from before the media store) and stale incoming uploads;
+- when auto-cleanup is enabled, deletes results older than the configured
+  age together with their index entries.
+
+Sizes and access times come from the media store's index, which is updated
+as blobs are stored and used, so a sweep never rescans the blob tree. The
+tree is reconciled with the index once, when the manager starts.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Union
+import logging
+
+from src.storage.media_store import MediaStore, blob_hash
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL = 300.0
+LOOSE_FILE_MAX_AGE_HOURS = 24
+
+
+def prune_results(results_dir: Union[str, Path], max_age_days: int) -> int:
+    """
+    Delete results analyzed more than ``max_age_days`` ago.
+
+    Args:
+        results_dir: Results directory
+        max_age_days: Age limit
+
+    Returns:
+        Number of results deleted
+    """
+    from src.storage.indexing import unindex_results
+    from src.storage.results_store import ResultsStore
+
+    results_dir = Path(results_dir)
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+    result_files = ResultsStore.open(results_dir).files_before(cutoff)
+    for name in result_files:
+        try:
+            (results_dir / name).unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to delete {name}: {e}")
+    unindex_results(results_dir, result_files)
+    if result_files:
+        logger.info(f"Deleted {len(result_files)} results older than {max_age_days} days")
+    return len(result_files)
+
+
+class StorageManager:
+    """
+    Quota enforcement and cleanup for the media store.
+
+    Example:
+        manager = StorageManager(MediaStore("temp_uploads"), quota_bytes=10 * 1024 ** 3, queue=pool.queue)
+        manager.start()
+        with manager.pin(media.file_hash):
+            st.video(str(media.path))
+    """
+
+    def __init__(
+        self,
+        media_store: MediaStore,
+        quota_bytes: int = 10 * 1024 ** 3,
+        queue=None,
+        results_dir: Optional[Union[str, Path]] = None,
+        max_result_age_days: Optional[int] = None,
+        loose_file_max_age_hours: float = LOOSE_FILE_MAX_AGE_HOURS,
+        interval: float = SWEEP_INTERVAL,
+    ):
+        """
+        Args:
+            media_store: Store whose blobs are managed
+            quota_bytes: Total size of media blobs before LRU eviction
+            queue: JobQueue whose queued and running jobs pin their media
+            results_dir: Results directory to prune (with ``max_result_age_days``)
+            max_result_age_days: Delete older results (None keeps them)
+            loose_file_max_age_hours: Age after which loose files in the temp
+                directory are deleted
+            interval: Seconds between background sweeps
+        """
+        self.media_store = media_store
+        self.quota_bytes = quota_bytes
+        self.queue = queue
+        self.results_dir = Path(results_dir) if results_dir is not None else None
+        self.max_result_age_days = max_result_age_days
+        self.loose_file_max_age_hours = loose_file_max_age_hours
+        self.interval = interval
+        self._pins: Counter = Counter()
+        self._pins_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, storage_config, media_store: Optional[MediaStore] = None, queue=None) -> "StorageManager":
+        """
+        Build a manager from the app's StorageConfig.
+
+        Args:
+            storage_config: StorageConfig (quota, results age, auto-cleanup)
+            media_store: Store to manage (default: one under ``temp_dir``)
+            queue: JobQueue whose jobs pin their media
+        """
+        return cls(
+            media_store or MediaStore(storage_config.temp_dir),
+            quota_bytes=storage_config.media_quota_mb * 1024 * 1024,
+            queue=queue,
+            results_dir=storage_config.results_dir,
+            max_result_age_days=storage_config.max_result_age_days if storage_config.auto_cleanup else None,
+        )
+
+    @contextmanager
+    def pin(self, file_hash: str) -> Iterator[None]:
+        """Keep a blob from being evicted while the block runs."""
+        with self._pins_lock:
+            self._pins[file_hash] += 1
+        try:
+            yield
+        finally:
+            with self._pins_lock:
+                self._pins[file_hash] -= 1
+                if self._pins[file_hash] <= 0:
+                    del self._pins[file_hash]
+
+    def pinned_hashes(self) -> Set[str]:
+        """Content hashes that must not be evicted: pins plus media of active jobs."""
+        with self._pins_lock:
+            pinned = set(self._pins)
+        if self.queue is not None:
+            for video_path in self.queue.active_media():
+                file_hash = blob_hash(video_path)
+                if file_hash is not None:
+                    pinned.add(file_hash)
+        return pinned
+
+    def enforce_quota(self) -> int:
+        """
+        Evict least recently used blobs until the store fits its quota.
+
+        Returns:
+            Bytes freed
+        """
+        total = self.media_store.total_size()
+        if total <= self.quota_bytes:
+            return 0
+
+        try:
+            pinned = self.pinned_hashes()
+        except Exception as e:
+            # Without knowing which media jobs need, deleting anything is unsafe
+            logger.warning(f"Skipping eviction, could not read active jobs: {e}")
+            return 0
+
+        freed = 0
+        for media in self.media_store.least_recently_used():
+            if total - freed <= self.quota_bytes:
+                break
+            if media.file_hash in pinned:
+                continue
+            try:
+                self.media_store.remove(media.path)
+            except OSError as e:
+                logger.error(f"Failed to evict {media.path.name}: {e}")
+                continue
+            freed += media.size
+
+        logger.info(f"Evicted {freed / 1024 ** 2:.1f} MB of media; store now {(total - freed) / 1024 ** 2:.1f} MB")
+        return freed
+
+    def remove_loose_files(self) -> int:
+        """
+        Delete old files directly in the temp directory (outside the media store).
+
+        Returns:
+            Number of files deleted
+        """
+        if not self.media_store.root.exists():
+            return 0
+
+        cutoff = time.time() - self.loose_file_max_age_hours * 3600
+        deleted = 0
+        for path in self.media_store.root.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    logger.info(f"Deleted old temp file: {path.name}")
+                    deleted += 1
+            except OSError as e:
+                logger.error(f"Failed to delete {path.name}: {e}")
+        return deleted
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Run every cleanup once.
+
+        Returns:
+            Counts per cleanup: "incoming", "loose_files", "bytes_evicted", "results"
+        """
+        counts = {
+            "incoming": self.media_store.discard_incoming(),
+            "loose_files": self.remove_loose_files(),
+            "bytes_evicted": self.enforce_quota(),
+            "results": 0,
+        }
+        if self.results_dir is not None and self.max_result_age_days is not None:
+            counts["results"] = prune_results(self.results_dir, self.max_result_age_days)
+        return counts
+
+    def start(self) -> None:
+        """Reconcile the index with the disk and start sweeping in the background."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="storage-manager", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background sweeps."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            self.media_store.reindex()
+        except Exception as e:
+            logger.error(f"Media index reconciliation failed: {e}")
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Storage sweep failed: {e}", exc_info=True)
+            if self._stop.wait(self.interval):
+                return
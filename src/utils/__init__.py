@@ -4,7 +4,9 @@ Utility functions and helpers
 
 import logging
 import json
-from typing import Any, Dict
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Union
 from datetime import datetime
 
 
@@ -51,3 +53,21 @@ def get_timestamp() -> str:
 def format_dict_for_display(data: Dict[str, Any]) -> str:
     """Format a dictionary for display in logs/output"""
     return json.dumps(data, indent=2, default=str)
+
+
+def hash_file(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file without loading it into memory
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,257 @@
+"""
+Download Manager
+Download many URLs concurrently and queue each one for analysis as it lands.
+
+A bounded thread pool runs the downloads. Each platform has its own limit on
+simultaneous downloads and a minimum spacing between starts, so a batch of
+Instagram links does not trip rate limiting while YouTube and direct links
+proceed in parallel. Worker threads reuse their YoutubeDL instances and HTTP
+sessions through a shared VideoDownloader.
+
+Finished files go into the media store and are submitted to the job queue
+immediately, so transcription of early downloads overlaps later downloads.
+URLs already in the download cache are queued without any network access.
+With a DownloadPlanner, the batch is planned from its metadata first and
+downloaded and queued shortest job first.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+import logging
+
+from src.storage.download_cache import CachedDownload, download_cached
+from src.storage.media_store import StoredMedia
+from src.utils.video_downloader import VideoDownloader
+
+if TYPE_CHECKING:
+    from src.utils.download_planner import DownloadPlan, DownloadPlanner
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlatformLimit:
+    """Concurrency and pacing for one platform."""
+    concurrency: int = 2
+    min_interval: float = 0.0  # seconds between download starts
+
+
+DEFAULT_PLATFORM_LIMITS = {
+    "youtube": PlatformLimit(concurrency=3, min_interval=0.5),
+    "instagram": PlatformLimit(concurrency=1, min_interval=3.0),
+    "tiktok": PlatformLimit(concurrency=2, min_interval=1.0),
+    "direct": PlatformLimit(concurrency=4, min_interval=0.0),
+}
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one URL."""
+    url: str
+    platform: str
+    success: bool
+    message: str
+    path: Optional[str] = None
+    file_hash: Optional[str] = None
+    job_id: Optional[int] = None
+    cached: bool = False  # served from the download cache
+    estimated_seconds: Optional[float] = None  # planned job cost, with a planner
+
+
+class _PlatformGate:
+    """Caps concurrent downloads for a platform and spaces out their starts."""
+
+    def __init__(self, limit: PlatformLimit):
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(max(1, limit.concurrency))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self) -> "_PlatformGate":
+        self._slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.limit.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._slots.release()
+
+
+class DownloadManager:
+    """
+    Concurrent multi-URL downloader feeding the analysis queue.
+
+    Example:
+        with DownloadManager(queue=pool.queue, job_config=config) as manager:
+            for result in manager.download_all(urls):
+                print(result.url, result.job_id)
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "temp_uploads",
+        max_workers: int = 4,
+        platform_limits: Optional[Dict[str, PlatformLimit]] = None,
+        profile: str = "video",
+        media_store=None,
+        cache=None,
+        queue=None,
+        job_config: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        planner: Optional["DownloadPlanner"] = None,
+    ):
+        """
+        Args:
+            output_dir: Where downloads are written before entering the media store
+            max_workers: Total concurrent downloads
+            platform_limits: Overrides for DEFAULT_PLATFORM_LIMITS
+            profile: Download profile ("video" or "audio", see download_profile)
+            media_store: MediaStore that finished files are moved into (optional)
+            cache: DownloadCache consulted before downloading (needs ``media_store``)
+            queue: JobQueue that finished files are submitted to (optional)
+            job_config: Pipeline config for the submitted jobs
+            priority: Job priority for the submitted jobs
+            planner: Plans batches before downloading (profile per video,
+                shortest job first; closed with the manager); without one
+                every URL uses ``profile``
+        """
+        self.downloader = VideoDownloader(output_dir=output_dir, profile=profile)
+        self.media_store = media_store
+        self.cache = cache if media_store is not None else None
+        self.queue = queue
+        self.job_config = job_config or {}
+        self.priority = priority
+        self.planner = planner
+        limits = {**DEFAULT_PLATFORM_LIMITS, **(platform_limits or {})}
+        self._gates = {platform: _PlatformGate(limit) for platform, limit in limits.items()}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="download")
+
+    def submit(
+        self,
+        url: str,
+        on_complete: Optional[Callable[[DownloadResult], None]] = None,
+        plan: Optional["DownloadPlan"] = None
+    ) -> "Future[DownloadResult]":
+        """
+        Schedule one URL.
+
+        Args:
+            url: Video URL
+            on_complete: Called from the download thread with the result
+            plan: DownloadPlan for the URL (profile, job config and priority)
+
+        Returns:
+            Future resolving to a DownloadResult
+        """
+        return self._executor.submit(self._download, url.strip(), on_complete, plan)
+
+    def download_all(
+        self,
+        urls: List[str],
+        on_complete: Optional[Callable[[DownloadResult], None]] = None
+    ) -> List[DownloadResult]:
+        """
+        Download a batch of URLs and wait for all of them.
+
+        Args:
+            urls: Video URLs (blank lines and repeats are skipped)
+            on_complete: Called with each result as soon as it finishes
+
+        Returns:
+            Results in the order of ``urls``
+        """
+        unique_urls = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+        if self.planner is None:
+            futures = {url: self.submit(url, on_complete) for url in unique_urls}
+        else:
+            # Cheapest first, so short videos are downloaded and queued first. Jobs
+            # get the finished file, so transcription cannot overlap the download
+            plans = self.planner.plan_all(unique_urls, {**self.job_config, "stream_transcription": False})
+            futures = {plan.url: self.submit(plan.url, on_complete, plan) for plan in plans}
+        return [futures[url].result() for url in unique_urls]
+
+    def _download(
+        self,
+        url: str,
+        on_complete: Optional[Callable[[DownloadResult], None]],
+        plan: Optional["DownloadPlan"] = None
+    ) -> DownloadResult:
+        platform = VideoDownloader.detect_url_type(url)
+        gate = self._gates.get(platform)
+        profile = plan.profile if plan is not None else self.downloader.profile
+        try:
+            hit = self.cache.lookup(url, profile) if self.cache is not None else None
+            if hit is not None:
+                # Served from disk: no network, so no platform slot needed
+                result = self._finish(url, platform, hit, plan)
+            elif gate is None:
+                result = DownloadResult(url, platform, False, "Unknown URL format")
+            else:
+                with gate:
+                    result = self._fetch(url, platform, profile, plan)
+        except Exception as e:
+            logger.error(f"Download of {url} failed: {e}", exc_info=True)
+            result = DownloadResult(url, platform, False, f"Error: {e}")
+
+        if on_complete is not None:
+            try:
+                on_complete(result)
+            except Exception as e:
+                logger.warning(f"Download callback failed for {url}: {e}")
+        return result
+
+    def _fetch(self, url: str, platform: str, profile: str, plan: Optional["DownloadPlan"] = None) -> DownloadResult:
+        if self.media_store is not None:
+            outcome = download_cached(self.downloader, url, self.media_store, self.cache, profile=profile)
+        else:
+            success, message, path = self.downloader.download(url, profile=profile)
+            outcome = CachedDownload(success, message, file_name=Path(path).name if path else None)
+            if success:
+                outcome.media = StoredMedia(path=Path(path), file_hash=None, size=Path(path).stat().st_size, reused=False)
+
+        if not outcome.success:
+            logger.warning(f"Download failed for {url}: {outcome.message}")
+            return DownloadResult(url, platform, False, outcome.message)
+        return self._finish(url, platform, outcome, plan)
+
+    def _finish(self, url: str, platform: str, outcome: CachedDownload, plan: Optional["DownloadPlan"] = None) -> DownloadResult:
+        """Submit a downloaded (or cached) file to the job queue."""
+        media = outcome.media
+        result = DownloadResult(
+            url, platform, True, outcome.message,
+            path=str(media.path), file_hash=media.file_hash, cached=outcome.cached,
+            estimated_seconds=plan.estimated_seconds if plan is not None else None
+        )
+        if self.queue is not None:
+            try:
+                config = {**self.job_config, "file_name": outcome.file_name or media.path.name, "source_url": url}
+                priority = self.priority
+                if plan is not None:
+                    config.update(plan.config)
+                    priority += plan.priority
+                result.job_id = self.queue.submit(str(media.path.resolve()), config, priority)
+            except Exception as e:
+                logger.error(f"Could not queue download of {url}: {e}")
+                result.success, result.message = False, f"Downloaded but not queued: {e}"
+        return result
+
+    def close(self) -> None:
+        """Wait for running downloads and release connections."""
+        self._executor.shutdown(wait=True)
+        self.downloader.close()
+        if self.planner is not None:
+            self.planner.close()
+
+    def __enter__(self) -> "DownloadManager":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,365 @@
+"""
+HTTP Download
+Resumable, optionally segmented download of a single URL to a file.
+
+Data is written to ``<target>.part`` and renamed into place only when
+complete. If the server supports byte ranges, an interrupted download
+resumes from where it stopped, both within one call (with retries on flaky
+links) and across calls. A sidecar ``<target>.part.json`` records the
+validator (ETag / Last-Modified) so a changed file is never stitched onto
+a stale prefix. Large files are fetched over several connections at once,
+each filling its own byte range of the preallocated ``.part`` file.
+
+Reads grow from 64 KiB up to 4 MiB as throughput allows, and progress is
+reported at most a few times per second.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+import logging
+
+from src.utils.lazy import lazy_module
+
+requests = lazy_module("requests")
+urllib3 = lazy_module("urllib3")
+
+logger = logging.getLogger(__name__)
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+SEGMENT_THRESHOLD = 32 * 1024 * 1024
+PROGRESS_INTERVAL = 0.5
+
+
+class DownloadError(Exception):
+    """Download could not be completed."""
+
+
+@dataclass
+class _RemoteFile:
+    size: Optional[int]
+    accepts_ranges: bool
+    validator: Optional[str]
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: int  # inclusive
+    done: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.end - self.start + 1 - self.done
+
+
+@dataclass
+class _PartState:
+    """Contents of the ``.part.json`` sidecar."""
+    url: str
+    validator: Optional[str]
+    size: Optional[int]
+    segments: List[_Segment] = field(default_factory=list)
+
+    def save(self, path: Path) -> None:
+        data = {
+            "url": self.url,
+            "validator": self.validator,
+            "size": self.size,
+            "segments": [[s.start, s.end, s.done] for s in self.segments],
+        }
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["_PartState"]:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(
+                url=data["url"],
+                validator=data.get("validator"),
+                size=data.get("size"),
+                segments=[_Segment(*segment) for segment in data.get("segments", [])],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+class ProgressThrottle:
+    """Forward progress messages at most every ``interval`` seconds (and on change of percent)."""
+
+    def __init__(self, callback: Optional[Callable[[str], None]], total: Optional[int], interval: float = PROGRESS_INTERVAL):
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_time = 0.0
+        self._last_percent = -1
+
+    def update(self, downloaded: int, force: bool = False) -> None:
+        if self.callback is None or not self.total:
+            return
+        percent = min(100, int(downloaded * 100 / self.total))
+        now = time.monotonic()
+        with self._lock:
+            if percent == self._last_percent or (not force and now - self._last_time < self.interval):
+                return
+            self._last_time, self._last_percent = now, percent
+        self.callback(f"Progress: {percent}%")
+
+
+class _Counter:
+    """Thread-safe byte counter shared by segment workers."""
+
+    def __init__(self, value: int = 0):
+        self.value = value
+        self._lock = threading.Lock()
+
+    def add(self, amount: int) -> int:
+        with self._lock:
+            self.value += amount
+            return self.value
+
+
+def _probe(session, url: str, timeout: float) -> _RemoteFile:
+    """Learn the size, range support and validator of a URL."""
+    try:
+        response = session.head(url, allow_redirects=True, timeout=timeout, headers={"Accept-Encoding": "identity"})
+        if response.ok:
+            headers = response.headers
+            size = int(headers["Content-Length"]) if headers.get("Content-Length", "").isdigit() else None
+            return _RemoteFile(
+                size=size,
+                accepts_ranges=headers.get("Accept-Ranges", "").lower() == "bytes" and size is not None,
+                validator=headers.get("ETag") or headers.get("Last-Modified"),
+            )
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"HEAD {url} failed: {e}")
+    return _RemoteFile(size=None, accepts_ranges=False, validator=None)
+
+
+def _stream_range(
+    session,
+    url: str,
+    file,
+    offset: int,
+    end: Optional[int],
+    on_bytes: Callable[[int], None],
+    timeout: float,
+    validator: Optional[str] = None,
+) -> bool:
+    """
+    Write ``url`` bytes [offset, end] into ``file`` at ``offset``.
+
+    Returns:
+        False if the server ignored the Range header (or If-Range found the
+        file changed) and sent the whole file instead, True otherwise
+    """
+    headers = {"Accept-Encoding": "identity"}
+    if offset > 0 or end is not None:
+        headers["Range"] = f"bytes={offset}-{'' if end is None else end}"
+        if validator:
+            headers["If-Range"] = validator
+
+    with session.get(url, stream=True, timeout=timeout, headers=headers) as response:
+        response.raise_for_status()
+        if "Range" in headers and response.status_code != 206:
+            return False
+        file.seek(offset)
+
+        chunk_size = MIN_CHUNK_SIZE
+        while True:
+            started = time.monotonic()
+            try:
+                chunk = response.raw.read(chunk_size)
+            except urllib3.exceptions.HTTPError as e:
+                # Reading the raw stream bypasses requests' exception wrapping
+                raise requests.exceptions.ConnectionError(e)
+            if not chunk:
+                break
+            file.write(chunk)
+            on_bytes(len(chunk))
+            # Grow reads while they fill quickly, shrink when the link is slow
+            elapsed = time.monotonic() - started
+            if len(chunk) == chunk_size and elapsed < 0.05:
+                chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
+            elif elapsed > 0.5:
+                chunk_size = max(chunk_size // 2, MIN_CHUNK_SIZE)
+    return True
+
+
+def fetch_to_file(
+    session,
+    url: str,
+    target: Union[str, Path],
+    progress_callback: Optional[Callable[[str], None]] = None,
+    segments: int = 4,
+    segment_threshold: int = SEGMENT_THRESHOLD,
+    max_retries: int = 5,
+    timeout: float = 30,
+) -> int:
+    """
+    Download ``url`` to ``target``, resuming an earlier partial download.
+
+    Args:
+        session: requests.Session used for the probe and single-stream fetches
+        url: HTTP(S) URL
+        target: Final file path
+        progress_callback: Receives throttled "Progress: N%" messages
+        segments: Parallel connections for files of at least ``segment_threshold``
+        segment_threshold: Smallest file (bytes) fetched in segments
+        max_retries: Retries per connection after network errors
+        timeout: Connect/read timeout in seconds
+
+    Returns:
+        Size of the downloaded file
+
+    Raises:
+        DownloadError: The download failed after all retries
+    """
+    target = Path(target)
+    part_path = target.with_name(target.name + ".part")
+    state_path = target.with_name(target.name + ".part.json")
+    remote = _probe(session, url, timeout)
+
+    # Resume only onto a prefix of the same remote file
+    state = _PartState.load(state_path)
+    if state is None or state.url != url or state.validator != remote.validator or state.size != remote.size \
+            or not remote.accepts_ranges or not part_path.exists():
+        state = _PartState(url=url, validator=remote.validator, size=remote.size)
+        part_path.unlink(missing_ok=True)
+
+    segmented = remote.accepts_ranges and segments > 1 and remote.size >= segment_threshold
+    if segmented and not state.segments:
+        step = -(-remote.size // segments)
+        state.segments = [
+            _Segment(start, min(start + step, remote.size) - 1) for start in range(0, remote.size, step)
+        ]
+        with open(part_path, "wb") as f:
+            f.truncate(remote.size)
+    elif not segmented:
+        state.segments = []
+        if not part_path.exists():
+            part_path.touch()
+
+    if remote.accepts_ranges:
+        state.save(state_path)
+
+    if state.segments:
+        _fetch_segments(url, part_path, state, state_path, progress_callback, max_retries, timeout)
+    else:
+        _fetch_single(session, url, part_path, remote, progress_callback, max_retries, timeout)
+
+    size = part_path.stat().st_size
+    if remote.size is not None and size != remote.size:
+        raise DownloadError(f"Incomplete download: got {size} of {remote.size} bytes")
+    if size == 0:
+        raise DownloadError("Downloaded file is empty")
+
+    os.replace(part_path, target)
+    state_path.unlink(missing_ok=True)
+    return size
+
+
+def _fetch_single(session, url, part_path, remote, progress_callback, max_retries, timeout) -> None:
+    """One connection, resuming from the end of the ``.part`` file after each failure."""
+    offset = part_path.stat().st_size if remote.accepts_ranges else 0
+    if remote.size is not None and offset == remote.size:
+        return
+    progress = ProgressThrottle(progress_callback, remote.size)
+    counter = _Counter(offset)
+
+    def on_bytes(amount: int) -> None:
+        progress.update(counter.add(amount))
+
+    for attempt in range(max_retries + 1):
+        try:
+            with open(part_path, "r+b" if offset else "wb") as f:
+                if not _stream_range(session, url, f, offset, None, on_bytes, timeout, remote.validator):
+                    # Server sent the full body instead of the range: start over
+                    logger.info(f"Server ignored range request for {url}; restarting")
+                    offset = 0
+                    counter.value = 0
+                    f.truncate(0)
+                    _stream_range(session, url, f, 0, None, on_bytes, timeout)
+                f.truncate()
+            progress.update(counter.value, force=True)
+            return
+        except (requests.exceptions.RequestException, OSError) as e:
+            if isinstance(e, requests.exceptions.HTTPError) and e.response is not None and e.response.status_code < 500:
+                raise DownloadError(f"Download failed: {e}")
+            if attempt == max_retries:
+                raise DownloadError(f"Download failed after {max_retries + 1} attempts: {e}")
+            offset = part_path.stat().st_size if remote.accepts_ranges else 0
+            counter.value = offset
+            delay = min(2 ** attempt, 30)
+            logger.warning(f"Download of {url} interrupted at {offset} bytes ({e}); retrying in {delay}s")
+            time.sleep(delay)
+
+
+def _fetch_segments(url, part_path, state, state_path, progress_callback, max_retries, timeout) -> None:
+    """Several connections, each filling its byte range; progress is checkpointed to the sidecar."""
+    progress = ProgressThrottle(progress_callback, state.size)
+    counter = _Counter(sum(segment.done for segment in state.segments))
+    state_lock = threading.Lock()
+    errors: Dict[int, Exception] = {}
+
+    def run(index: int, segment: _Segment) -> None:
+        session = requests.Session()
+        last_checkpoint = time.monotonic()
+
+        def on_bytes(amount: int) -> None:
+            nonlocal last_checkpoint
+            segment.done += amount
+            progress.update(counter.add(amount))
+            if time.monotonic() - last_checkpoint > 2.0:
+                last_checkpoint = time.monotonic()
+                with state_lock:
+                    state.save(state_path)
+
+        try:
+            with open(part_path, "r+b") as f:
+                for attempt in range(max_retries + 1):
+                    if segment.remaining <= 0:
+                        return
+                    try:
+                        if not _stream_range(session, url, f, segment.start + segment.done, segment.end,
+                                             on_bytes, timeout, state.validator):
+                            raise DownloadError("Server stopped honouring range requests")
+                        if segment.remaining > 0:
+                            raise requests.exceptions.ChunkedEncodingError("Connection closed early")
+                        return
+                    except requests.exceptions.RequestException as e:
+                        if attempt == max_retries:
+                            raise
+                        delay = min(2 ** attempt, 30)
+                        logger.warning(f"Segment {index} of {url} interrupted ({e}); retrying in {delay}s")
+                        time.sleep(delay)
+        except Exception as e:
+            errors[index] = e
+        finally:
+            session.close()
+
+    threads = [
+        threading.Thread(target=run, args=(index, segment), name=f"segment-{index}", daemon=True)
+        for index, segment in enumerate(state.segments)
+        if segment.remaining > 0
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with state_lock:
+        state.save(state_path)
+    if errors:
+        raise DownloadError(f"Download failed: {next(iter(errors.values()))}")
+    progress.update(counter.value, force=True)
@@ -0,0 +1,84 @@
+"""
+Lazy Imports
+Defer loading heavy modules until they are first used.
+
+Optional or slow dependencies (requests, pandas, ...) are bound at module
+level as proxies, so importing a module that *might* need them costs
+nothing until a code path actually touches them:
+
+    requests = lazy_module("requests")
+
+    def fetch(url):
+        return requests.get(url)  # requests is imported here
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """
+    Return a proxy for a module that is imported on first use.
+
+    Args:
+        name: Absolute module name, e.g. "pandas"
+
+    Returns:
+        LazyModule proxy (ImportError is raised at first use if the module is missing)
+    """
+    return LazyModule(name)
+
+
+def lazy_attributes(package: str, attributes: dict):
+    """
+    Build a module-level ``__getattr__`` that imports exported names on demand.
+
+    Args:
+        package: ``__name__`` of the package defining the hook
+        attributes: Exported name -> relative submodule defining it
+
+    Returns:
+        Function to assign to the package's ``__getattr__``
+    """
+    def __getattr__(name: str) -> Any:
+        submodule = attributes.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        # Cache on the package so later lookups skip this hook
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
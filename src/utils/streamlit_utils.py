@@ -5,11 +5,14 @@ Streamlit utilities and helper functions.
 import streamlit as st
 from pathlib import Path
 import json
-from typing import Dict, Any, List
-import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import logging
 
+from src.utils.lazy import lazy_module
+
+pd = lazy_module("pandas")
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,41 +43,196 @@ def save_analysis_to_file(results: Dict[str, Any]) -> Path:
         json.dump(results, f, indent=2)
     
     logger.info(f"Analysis saved to {filename}")
+    
+    from src.storage import index_result
+    
+    index_result(results_dir, results, filename.name)
+    
     return filename
 
 
+@st.cache_resource(show_spinner=False)
+def get_results_store():
+    """Open the results store for the default results directory (once per server)."""
+    from src.storage import ResultsStore
+    
+    return ResultsStore.open(Path("results"))
+
+
+@st.cache_resource(show_spinner=False)
+def get_worker_pool():
+    """Start the analysis worker pool once per server."""
+    from src.config.app_config import get_config
+    from src.jobs import WorkerPool
+    
+    pool = WorkerPool(
+        Path("results"),
+        num_workers=get_config().analysis.parallel_tasks,
+        temp_dir=get_config().storage.temp_dir
+    )
+    pool.start()
+    return pool
+
+
+@st.cache_resource(show_spinner=False)
+def get_media_store():
+    """Open the content-addressed media store under the configured temp directory."""
+    from src.config.app_config import get_config
+    from src.storage.media_store import MediaStore
+    
+    store = MediaStore(get_config().storage.temp_dir)
+    store.discard_incoming()
+    return store
+
+
+@st.cache_resource(show_spinner=False)
+def get_storage_manager():
+    """Start the background quota enforcement and cleanup of temp storage once per server."""
+    from src.config.app_config import get_config
+    from src.jobs.queue import JobQueue
+    from src.storage.storage_manager import StorageManager
+    
+    # Reads job state only, so it does not need the worker processes running
+    manager = StorageManager.from_config(get_config().storage, get_media_store(), queue=JobQueue.open(Path("results")))
+    manager.start()
+    return manager
+
+
+@st.cache_resource(show_spinner=False)
+def get_metadata_cache():
+    """Open the URL metadata cache that lives in the media store."""
+    from src.storage.metadata_cache import MetadataCache
+    
+    return MetadataCache(get_media_store())
+
+
+@st.cache_resource(show_spinner=False)
+def get_download_cache():
+    """Open the URL download cache that lives in the media store."""
+    from src.config.app_config import get_config
+    from src.storage.download_cache import DownloadCache
+    
+    return DownloadCache(
+        get_media_store(),
+        quota_bytes=get_config().storage.download_cache_mb * 1024 * 1024,
+        pinned=get_storage_manager().pinned_hashes
+    )
+
+
+# The cached loaders below take the store version as their first argument, so
+# every save or delete (which bumps the version) invalidates them, while
+# reruns in between are served from memory.
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_results_page(
+    version: int,
+    limit: int,
+    before: Optional[Tuple[str, int]] = None,
+    category: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Load one keyset page of result summaries."""
+    return get_results_store().list(limit=limit, before=before, category=category)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def load_results_aggregates(version: int, month_start: str) -> Dict[str, Any]:
+    """Compute history metrics with indexed count queries."""
+    store = get_results_store()
+    return {
+        "total": store.count(),
+        "this_month": store.count(since=month_start),
+        "by_category": store.group_counts("primary_category"),
+        "by_status": store.group_counts("status"),
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_result(result_id: int) -> Optional[Dict[str, Any]]:
+    """Load a full result document (row ids are never reused)."""
+    return get_results_store().get(result_id)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def search_results_page(version: int, query: str, page: int, per_page: int = 10) -> Dict[str, Any]:
+    """Run a full-text search over the default results directory."""
+    from src.storage import search_results
+    
+    return search_results(query, page=page, per_page=per_page, results_dir=Path("results"))
+
+
+def get_results_page(key: str, page_size: int, category: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """
+    Fetch the current page of a paginated results view.
+    
+    Pages are addressed by keyset cursors kept in session state, so
+    every page is one indexed range scan however deep the history is.
+    
+    Args:
+        key: Session state prefix of the view
+        page_size: Rows per page
+        category: Only show this primary category
+    
+    Returns:
+        (rows, page number, whether a next page exists)
+    """
+    cursors_key = f"{key}_cursors"
+    if st.session_state.get(f"{key}_page_filter") != category or cursors_key not in st.session_state:
+        st.session_state[cursors_key] = [None]
+        st.session_state[f"{key}_page_filter"] = category
+    
+    cursors = st.session_state[cursors_key]
+    version = get_results_store().version()
+    rows = load_results_page(version, page_size + 1, before=cursors[-1], category=category)
+    return rows[:page_size], len(cursors), len(rows) > page_size
+
+
+def render_page_controls(key: str, rows: List[Dict[str, Any]], page: int, has_next: bool) -> None:
+    """Draw previous/next buttons for a view paged with get_results_page."""
+    cursors = st.session_state[f"{key}_cursors"]
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    
+    with col_prev:
+        if st.button("⬅️ Previous", key=f"{key}_prev", disabled=page <= 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {page}")
+    with col_next:
+        if st.button("Next ➡️", key=f"{key}_next", disabled=not has_next, use_container_width=True):
+            cursors.append((rows[-1]["timestamp"], rows[-1]["id"]))
+            st.rerun()
+
+
 def load_results_from_disk(limit: int = 20) -> List[Dict[str, Any]]:
-    """Load analysis results from disk."""
-    results_dir = Path("results")
-    if not results_dir.exists():
+    """Load the most recent analysis results from the results store."""
+    if not Path("results").exists():
         return []
     
-    result_files = sorted(results_dir.glob("*.json"), reverse=True)[:limit]
+    store = get_results_store()
     results = []
     
-    for rf in result_files:
+    for row in store.list(limit=limit):
         try:
-            with open(rf) as f:
-                results.append(json.load(f))
+            results.append(store.get(row["id"]))
         except Exception as e:
-            logger.error(f"Failed to load {rf}: {e}")
+            logger.error(f"Failed to load {row['result_file']}: {e}")
     
     return results
 
 
-def create_results_dataframe(results: List[Dict[str, Any]]) -> pd.DataFrame:
-    """Convert results list to DataFrame for display."""
-    if not results:
+def create_results_dataframe(summaries: List[Dict[str, Any]]) -> "pd.DataFrame":
+    """Convert results store summary rows to DataFrame for display."""
+    if not summaries:
         return pd.DataFrame()
     
     data = []
-    for result in results:
+    for summary in summaries:
         row = {
-            "Date": result.get("timestamp", "Unknown"),
-            "File": result.get("file_name", "Unknown"),
-            "Category": result.get("categorization", {}).get("primary", "Unknown"),
-            "Confidence": f"{result.get('categorization', {}).get('confidence', 0)}%",
-            "Status": "Complete"
+            "Date": summary.get("timestamp") or "Unknown",
+            "File": summary.get("file_name") or "Unknown",
+            "Category": summary.get("primary_category") or "Unknown",
+            "Confidence": f"{summary.get('confidence') or 0}%",
+            "Status": (summary.get("status") or "complete").capitalize()
         }
         data.append(row)
     
@@ -279,21 +437,10 @@ def export_results_as_html(results: Dict[str, Any]) -> str:
 
 def cleanup_old_results(days: int = 30) -> int:
     """Delete analysis results older than specified days."""
+    from src.storage.storage_manager import prune_results
+    
     results_dir = Path("results")
     if not results_dir.exists():
         return 0
     
-    import time
-    cutoff_time = time.time() - (days * 24 * 60 * 60)
-    deleted_count = 0
-    
-    for result_file in results_dir.glob("*.json"):
-        if result_file.stat().st_mtime < cutoff_time:
-            try:
-                result_file.unlink()
-                deleted_count += 1
-                logger.info(f"Deleted old result: {result_file}")
-            except Exception as e:
-                logger.error(f"Failed to delete {result_file}: {e}")
-    
-    return deleted_count
+    return prune_results(results_dir, days)
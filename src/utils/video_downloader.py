@@ -5,14 +5,101 @@ Handles downloading videos from various sources (YouTube, direct URLs, Instagram
 
 import os
 import re
+import threading
 from pathlib import Path
 from typing import Optional, Tuple, Callable
 import logging
 from urllib.parse import urlparse
-import requests
+
+from src.utils.http_download import DownloadError, fetch_to_file
+from src.utils.lazy import lazy_module
+
+requests = lazy_module("requests")
 
 logger = logging.getLogger(__name__)
 
+# Pipeline steps that look at frames; without them only the audio track is needed
+VISUAL_STEPS = ("keyframes",)
+
+# yt-dlp format selectors per download profile
+FORMAT_SELECTORS = {
+    # Full video, as before
+    "video": "best[ext=mp4]/best[ext=webm]/best",
+    # Smallest audio-only stream (opus/m4a, typically ~50 kbps, plenty for speech);
+    # sites without separate audio streams fall back to the smallest muxed file
+    "audio": "worstaudio[acodec!=none]/bestaudio/worst[acodec!=none]/worst",
+}
+
+
+# Output file names for yt-dlp downloads, per platform
+OUTPUT_TEMPLATES = {
+    "youtube": "%(title)s_%(id)s.%(ext)s",
+    "tiktok": "tiktok_%(id)s.%(ext)s",
+    "instagram": "instagram_%(id)s.%(ext)s",
+}
+
+
+# Creator-supplied metadata kept with analysis results (see video_metadata)
+ENGAGEMENT_FIELDS = ("view_count", "like_count", "comment_count", "repost_count")
+VIDEO_METADATA_FIELDS = (
+    "video_id", "title", "caption", "hashtags", "uploader", "uploader_id",
+    "duration", "upload_date", "webpage_url", *ENGAGEMENT_FIELDS,
+)
+_HASHTAG = re.compile(r"#(\w+)")
+
+
+def video_metadata(info: dict) -> dict:
+    """
+    Extract the creator-supplied metadata of a yt-dlp info dict.
+
+    Args:
+        info: Info dict from YoutubeDL.extract_info
+
+    Returns:
+        Dict with the VIDEO_METADATA_FIELDS: the caption (description),
+        its hashtags plus the site's tags (without "#", first spelling
+        kept), uploader, duration, upload date and engagement counts
+        (None where the site does not report them)
+    """
+    caption = info.get("description") or ""
+    hashtags = _HASHTAG.findall(caption) + [str(tag).lstrip("#").replace(" ", "") for tag in info.get("tags") or []]
+    unique_tags = {}
+    for tag in hashtags:
+        if tag:
+            unique_tags.setdefault(tag.lower(), tag)
+    return {
+        "video_id": info.get("id"),
+        "title": info.get("title"),
+        "caption": caption,
+        "hashtags": list(unique_tags.values()),
+        "uploader": info.get("uploader") or info.get("channel"),
+        "uploader_id": info.get("uploader_id") or info.get("channel_id"),
+        "duration": info.get("duration"),
+        "upload_date": info.get("upload_date"),
+        "webpage_url": info.get("webpage_url"),
+        **{name: info.get(name) for name in ENGAGEMENT_FIELDS},
+    }
+
+
+def download_profile(config: dict) -> str:
+    """
+    Pick the download profile for an analysis config.
+
+    Args:
+        config: Pipeline configuration (its ``steps``, then its
+            ``download_profile`` if set)
+
+    Returns:
+        "video" if any visual step is enabled, otherwise the configured
+        profile, defaulting to "audio"
+    """
+    steps = config.get("steps", {})
+    if any(steps.get(step) for step in VISUAL_STEPS):
+        return "video"
+    if config.get("download_profile") in FORMAT_SELECTORS:
+        return config["download_profile"]
+    return "audio"
+
 
 class VideoDownloader:
     """Download videos from various sources."""
@@ -35,10 +122,39 @@ class VideoDownloader:
         r'(?:https?://)?(?:www\.)?vt\.tiktok\.com/'
     ]
     
-    def __init__(self, output_dir: str = "temp_uploads"):
-        """Initialize the downloader."""
+    # Video ID (first group) per platform, for canonical cache keys
+    VIDEO_ID_PATTERNS = {
+        "youtube": [
+            r'youtube\.com/watch\?(?:[^#]*&)?v=([\w-]{11})',
+            r'youtu\.be/([\w-]{11})',
+            r'youtube\.com/shorts/([\w-]{11})',
+        ],
+        "instagram": [
+            r'instagr(?:\.am|am\.com)/(?:[\w.]+/)?(?:p|reels?|tv)/([\w-]+)',
+        ],
+        "tiktok": [
+            r'tiktok\.com/@[\w\.]+/video/(\d+)',
+        ],
+    }
+    
+    def __init__(self, output_dir: str = "temp_uploads", profile: str = "video"):
+        """
+        Initialize the downloader.
+        
+        Args:
+            output_dir: Directory downloads are written to
+            profile: "video" for the full video, "audio" for the smallest
+                audio-only stream (see download_profile)
+        """
+        if profile not in FORMAT_SELECTORS:
+            raise ValueError(f"Unknown download profile {profile!r}; expected one of {list(FORMAT_SELECTORS)}")
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.profile = profile
+        # Per-thread YoutubeDL instances and HTTP sessions, reused across downloads
+        self._local = threading.local()
+        self._resources: list = []
+        self._resources_lock = threading.Lock()
     
     @staticmethod
     def detect_url_type(url: str) -> str:
@@ -67,10 +183,49 @@ class VideoDownloader:
         
         return "unknown"
     
+    @staticmethod
+    def canonical_key(url: str) -> str:
+        """
+        Stable identity of the video behind a URL.
+        
+        Different URLs for one video (query strings, ``youtu.be`` or
+        ``instagr.am`` short forms, ``/reel/`` vs ``/p/``) map to the same
+        ``"<platform>:<video id>"`` key. URLs without a recognizable ID
+        (e.g. ``vm.tiktok.com`` short links, direct files) fall back to
+        ``"url:<host><path>"``.
+        """
+        # Lowercase the scheme and host only; video IDs are case-sensitive
+        url = re.sub(r'^(?i:https?://)?[^/?#]+', lambda m: m.group(0).lower(), url.strip())
+        url_type = VideoDownloader.detect_url_type(url)
+        for pattern in VideoDownloader.VIDEO_ID_PATTERNS.get(url_type, []):
+            match = re.search(pattern, url)
+            if match:
+                return f"{url_type}:{match.group(1)}"
+        
+        parsed = urlparse(url if "://" in url else f"https://{url}")
+        key = f"url:{parsed.netloc.lower()}{parsed.path}"
+        # Query strings select the file on direct links, but are tracking noise on platforms
+        if url_type == "direct" and parsed.query:
+            key += f"?{parsed.query}"
+        return key
+    
+    @staticmethod
+    def direct_file_name(url: str) -> str:
+        """Sanitized file name for a direct media URL."""
+        # Extract filename from URL
+        filename = Path(urlparse(url).path).name
+        
+        if not filename or '.' not in filename:
+            filename = "downloaded_video.mp4"
+        
+        # Sanitize filename
+        return "".join(c for c in filename if c.isalnum() or c in '._-')
+    
     def download(
         self,
         url: str,
-        progress_callback: Optional[Callable[[str], None]] = None
+        progress_callback: Optional[Callable[[str], None]] = None,
+        profile: Optional[str] = None
     ) -> Tuple[bool, str, Optional[str]]:
         """
         Download a video from the URL.
@@ -78,6 +233,8 @@ class VideoDownloader:
         Args:
             url: Video URL
             progress_callback: Function to call with progress messages
+            profile: Override the downloader's profile for this download
+                (direct URLs are always fetched as-is)
         
         Returns:
             Tuple of (success, message, file_path)
@@ -87,6 +244,8 @@ class VideoDownloader:
             if progress_callback:
                 progress_callback(msg)
         
+        self._local.last_metadata = None
+        
         # Validate URL
         url = url.strip()
         if not url:
@@ -99,13 +258,17 @@ class VideoDownloader:
         if url_type == "unknown":
             return False, "Unknown URL format. Supported: YouTube, Instagram, TikTok, direct video URLs", None
         
+        profile = profile or self.profile
+        if profile not in FORMAT_SELECTORS:
+            return False, f"Unknown download profile: {profile}", None
+        
         try:
             if url_type == "youtube":
-                return self._download_youtube(url, log_progress)
+                return self._download_youtube(url, log_progress, profile)
             elif url_type == "tiktok":
-                return self._download_tiktok(url, log_progress)
+                return self._download_tiktok(url, log_progress, profile)
             elif url_type == "instagram":
-                return self._download_instagram(url, log_progress)
+                return self._download_instagram(url, log_progress, profile)
             else:  # direct
                 return self._download_direct(url, log_progress)
         
@@ -114,148 +277,135 @@ class VideoDownloader:
             logger.error(error_msg)
             return False, error_msg, None
     
-    def _download_youtube(self, url: str, log_progress: Callable) -> Tuple[bool, str, Optional[str]]:
+    def _download_youtube(self, url: str, log_progress: Callable, profile: str = "video") -> Tuple[bool, str, Optional[str]]:
         """Download from YouTube using yt-dlp."""
-        try:
-            import yt_dlp
-        except ImportError:
-            return False, "yt-dlp not installed. Install with: pip install yt-dlp", None
-        
-        log_progress("Downloading from YouTube...")
-        
-        try:
-            output_template = str(self.output_dir / "%(title)s_%(id)s.%(ext)s")
-            
-            ydl_opts = {
-                'format': 'best[ext=mp4]/best[ext=webm]/best',
-                'outtmpl': output_template,
-                'quiet': False,
-                'no_warnings': False,
-                'progress_hooks': [self._yt_dlp_progress_hook(log_progress)],
-                'socket_timeout': 30,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                filename = ydl.prepare_filename(info)
-                file_path = Path(filename)
-                
-                if file_path.exists():
-                    log_progress(f"✓ Download complete: {file_path.name}")
-                    return True, f"Downloaded: {file_path.name}", str(file_path)
-                else:
-                    return False, "Download completed but file not found", None
-        
-        except Exception as e:
-            return False, f"YouTube download failed: {str(e)}", None
+        return self._download_with_ytdlp(url, log_progress, profile, "youtube", "YouTube")
     
-    def _download_tiktok(self, url: str, log_progress: Callable) -> Tuple[bool, str, Optional[str]]:
+    def _download_tiktok(self, url: str, log_progress: Callable, profile: str = "video") -> Tuple[bool, str, Optional[str]]:
         """Download from TikTok using yt-dlp."""
+        return self._download_with_ytdlp(url, log_progress, profile, "tiktok", "TikTok")
+    
+    def _download_instagram(self, url: str, log_progress: Callable, profile: str = "video") -> Tuple[bool, str, Optional[str]]:
+        """Download from Instagram using yt-dlp."""
+        return self._download_with_ytdlp(url, log_progress, profile, "instagram", "Instagram")
+    
+    def _download_with_ytdlp(
+        self,
+        url: str,
+        log_progress: Callable,
+        profile: str,
+        platform: str,
+        label: str
+    ) -> Tuple[bool, str, Optional[str]]:
+        """Download through this thread's reusable YoutubeDL instance for the platform."""
         try:
-            import yt_dlp
+            ydl = self._youtube_dl(platform, profile)
         except ImportError:
             return False, "yt-dlp not installed. Install with: pip install yt-dlp", None
         
-        log_progress("Downloading from TikTok...")
+        log_progress(f"Downloading from {label}{' (audio only)' if profile == 'audio' else ''}...")
         
+        self._local.log_progress = log_progress
         try:
-            output_template = str(self.output_dir / "tiktok_%(id)s.%(ext)s")
+            info = ydl.extract_info(url, download=True)
+            filename = ydl.prepare_filename(info)
+            file_path = Path(filename)
             
-            ydl_opts = {
-                'format': 'best[ext=mp4]/best[ext=webm]/best',
-                'outtmpl': output_template,
-                'quiet': False,
-                'no_warnings': False,
-                'socket_timeout': 30,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                filename = ydl.prepare_filename(info)
-                file_path = Path(filename)
-                
-                if file_path.exists():
-                    log_progress(f"✓ Download complete: {file_path.name}")
-                    return True, f"Downloaded: {file_path.name}", str(file_path)
-                else:
-                    return False, "Download completed but file not found", None
+            if file_path.exists():
+                self._local.last_metadata = video_metadata(info)
+                log_progress(f"✓ Download complete: {file_path.name}")
+                return True, f"Downloaded: {file_path.name}", str(file_path)
+            else:
+                return False, "Download completed but file not found", None
         
         except Exception as e:
-            return False, f"TikTok download failed: {str(e)}", None
+            return False, f"{label} download failed: {str(e)}", None
+        finally:
+            self._local.log_progress = None
     
-    def _download_instagram(self, url: str, log_progress: Callable) -> Tuple[bool, str, Optional[str]]:
-        """Download from Instagram using yt-dlp."""
-        try:
-            import yt_dlp
-        except ImportError:
-            return False, "yt-dlp not installed. Install with: pip install yt-dlp", None
+    def _youtube_dl(self, platform: str, profile: str):
+        """
+        YoutubeDL instance for a platform and profile, created once per thread.
         
-        log_progress("Downloading from Instagram...")
+        Reusing the instance keeps its HTTP connections, cookies and
+        extractor state across downloads. YoutubeDL is not thread-safe, so
+        each thread gets its own.
+        """
+        instances = getattr(self._local, "youtube_dl", None)
+        if instances is None:
+            instances = self._local.youtube_dl = {}
         
-        try:
-            output_template = str(self.output_dir / "instagram_%(id)s.%(ext)s")
+        key = (platform, profile)
+        if key not in instances:
+            import yt_dlp
             
             ydl_opts = {
-                'format': 'best[ext=mp4]/best[ext=webm]/best',
-                'outtmpl': output_template,
+                'format': FORMAT_SELECTORS[profile],
+                'outtmpl': str(self.output_dir / OUTPUT_TEMPLATES[platform]),
                 'quiet': False,
                 'no_warnings': False,
+                'progress_hooks': [self._yt_dlp_progress_hook(self._log_current_progress)],
                 'socket_timeout': 30,
             }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                filename = ydl.prepare_filename(info)
-                file_path = Path(filename)
-                
-                if file_path.exists():
-                    log_progress(f"✓ Download complete: {file_path.name}")
-                    return True, f"Downloaded: {file_path.name}", str(file_path)
-                else:
-                    return False, "Download completed but file not found", None
+            instances[key] = yt_dlp.YoutubeDL(ydl_opts)
+            with self._resources_lock:
+                self._resources.append(instances[key])
+        return instances[key]
+    
+    def last_metadata(self) -> Optional[dict]:
+        """
+        Metadata (see video_metadata) of this thread's last download.
         
-        except Exception as e:
-            return False, f"Instagram download failed: {str(e)}", None
+        yt-dlp extracts it while downloading anyway, so keeping it costs no
+        extra request. None if the download failed or was a direct URL.
+        """
+        return getattr(self._local, "last_metadata", None)
+    
+    def _log_current_progress(self, msg: str) -> None:
+        """Forward yt-dlp progress to the callback of the download running on this thread."""
+        log_progress = getattr(self._local, "log_progress", None)
+        if log_progress:
+            log_progress(msg)
+    
+    def _http_session(self):
+        """requests.Session for this thread, so direct downloads reuse connections."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            with self._resources_lock:
+                self._resources.append(session)
+        return session
+    
+    def close(self) -> None:
+        """Close every YoutubeDL instance and HTTP session created by this downloader."""
+        with self._resources_lock:
+            resources, self._resources = self._resources, []
+        for resource in resources:
+            close = getattr(resource, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logger.debug(f"Error closing {resource!r}: {e}")
+        self._local = threading.local()
     
     def _download_direct(self, url: str, log_progress: Callable) -> Tuple[bool, str, Optional[str]]:
         """Download from direct HTTP/HTTPS URL."""
         log_progress("Downloading from direct URL...")
         
         try:
-            # Extract filename from URL
-            parsed_url = urlparse(url)
-            filename = Path(parsed_url.path).name
-            
-            if not filename or '.' not in filename:
-                filename = "downloaded_video.mp4"
-            
-            # Sanitize filename
-            filename = "".join(c for c in filename if c.isalnum() or c in '._-')
+            filename = self.direct_file_name(url)
             file_path = self.output_dir / filename
             
-            # Download the file
+            # Download the file (resumes a previous partial download of it)
             log_progress(f"Downloading: {filename}")
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            percent = int((downloaded / total_size) * 100)
-                            log_progress(f"Progress: {percent}%")
+            fetch_to_file(self._http_session(), url, file_path, log_progress)
             
-            if file_path.exists() and file_path.stat().st_size > 0:
-                log_progress(f"✓ Download complete: {filename}")
-                return True, f"Downloaded: {filename}", str(file_path)
-            else:
-                return False, "Downloaded file is empty or doesn't exist", None
+            log_progress(f"✓ Download complete: {filename}")
+            return True, f"Downloaded: {filename}", str(file_path)
         
+        except DownloadError as e:
+            return False, str(e), None
         except requests.exceptions.RequestException as e:
             return False, f"Download failed: {str(e)}", None
         except Exception as e:
@@ -276,57 +426,56 @@ class VideoDownloader:
         
         return hook
     
-    def cleanup_old_videos(self, max_age_hours: int = 24) -> int:
+    def get_video_info(self, url: str) -> Optional[dict]:
         """
-        Delete downloaded videos older than specified hours.
+        Get video metadata without downloading.
+        
+        Uses this thread's metadata extractor, so concurrent calls (see
+        DownloadPlanner) each reuse their own connection.
         
-        Returns: Number of files deleted
+        Returns:
+            Dict with the video_metadata fields (title, duration, uploader,
+            caption, hashtags, engagement...; None when unknown), the
+            description and ext, plus
+            format facts for planning: filesize (of the default format, or
+            None), audio_only_available, audio_filesize and progressive
+            (a format can be fetched as one plain HTTP stream); or None if
+            yt-dlp is missing or extraction failed
         """
-        import time
-        
-        if not self.output_dir.exists():
-            return 0
-        
-        current_time = time.time()
-        max_age_seconds = max_age_hours * 3600
-        deleted_count = 0
-        
-        for video_file in self.output_dir.glob("*"):
-            if video_file.is_file():
-                file_age = current_time - video_file.stat().st_mtime
-                if file_age > max_age_seconds:
-                    try:
-                        video_file.unlink()
-                        logger.info(f"Deleted old video: {video_file.name}")
-                        deleted_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to delete {video_file.name}: {e}")
-        
-        return deleted_count
-    
-    def get_video_info(self, url: str) -> Optional[dict]:
-        """Get video metadata without downloading."""
         try:
-            import yt_dlp
+            ydl = self._info_dl()
         except ImportError:
             return None
         
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'skip_download': True,
+            info = ydl.extract_info(url, download=False)
+            formats = info.get('formats') or [info]
+            audio_only = [f for f in formats if f.get('vcodec') == 'none' and f.get('acodec') not in (None, 'none')]
+            audio_sizes = [f.get('filesize') or f.get('filesize_approx') for f in audio_only]
+            return {
+                **video_metadata(info),
+                'description': info.get('description', ''),
+                'ext': info.get('ext', 'Unknown'),
+                'filesize': info.get('filesize') or info.get('filesize_approx'),
+                'audio_only_available': bool(audio_only),
+                'audio_filesize': min((size for size in audio_sizes if size), default=None),
+                'progressive': any(f.get('protocol') in ('http', 'https') for f in formats),
             }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return {
-                    'title': info.get('title', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'description': info.get('description', ''),
-                    'ext': info.get('ext', 'Unknown'),
-                }
         except Exception as e:
             logger.error(f"Failed to get video info: {e}")
             return None
+    
+    def _info_dl(self):
+        """Metadata-only YoutubeDL instance for this thread."""
+        ydl = getattr(self._local, "info_dl", None)
+        if ydl is None:
+            import yt_dlp
+            
+            ydl = self._local.info_dl = yt_dlp.YoutubeDL({
+                'quiet': True,
+                'no_warnings': True,
+                'skip_download': True,
+            })
+            with self._resources_lock:
+                self._resources.append(ydl)
+        return ydl
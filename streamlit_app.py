@@ -86,6 +86,10 @@ if "uploaded_file" not in st.session_state:
 if "analysis_in_progress" not in st.session_state:
     st.session_state.analysis_in_progress = False
 
+# Keep temp_uploads within its quota (background thread, started once per server)
+from src.utils.streamlit_utils import get_storage_manager
+get_storage_manager()
+
 # Sidebar
 with st.sidebar:
     st.markdown("### 🎬 Instagram Content Agent")
@@ -164,6 +168,19 @@ if selected == "Upload & Analyze":
                 key="video_url_input"
             )
             
+            # Speech-only analyses need just the audio track; reading on-screen text needs the frames
+            keyframes_selected = st.session_state.get("enable_keyframes", False)
+            audio_only = st.checkbox(
+                "🎧 Audio only",
+                value=True,
+                help="Download the smallest audio stream instead of the full video (much faster; enough for transcription and text analysis)",
+                key="audio_only_download",
+                disabled=keyframes_selected
+            ) and not keyframes_selected
+            if keyframes_selected:
+                st.caption("Full video is downloaded because on-screen text is enabled")
+            
+            stream_clicked = False
             if url_input:
                 # Detect URL type
                 from src.utils.video_downloader import VideoDownloader
@@ -189,45 +206,91 @@ if selected == "Upload & Analyze":
                         def update_progress(msg: str):
                             download_placeholder.info(msg)
                         
-                        downloader = VideoDownloader()
-                        success, message, file_path = downloader.download(url_input, update_progress)
+                        from src.storage.download_cache import download_cached
+                        from src.utils.streamlit_utils import get_download_cache, get_media_store
+                        
+                        # Repeat URLs (any form of the same video) come from the cache
+                        downloader = VideoDownloader(profile="audio" if audio_only else "video")
+                        outcome = download_cached(downloader, url_input, get_media_store(), get_download_cache(), update_progress)
+                        success, message = outcome.success, outcome.message
                         
                         if success:
+                            from src.analysis.agents import TranscriptionAgent
+                            
                             download_placeholder.success(f"✓ {message}")
+                            download_name = outcome.file_name or outcome.media.path.name
+                            file_path = str(outcome.media.path)
+                            media_kind = "audio" if Path(file_path).suffix.lower() in TranscriptionAgent.AUDIO_FORMATS else "video"
                             # Store the file path directly in session state
                             st.session_state.uploaded_file = {
-                                'name': Path(file_path).name,
+                                'name': download_name,
                                 'size': Path(file_path).stat().st_size,
-                                'type': 'video/' + Path(file_path).suffix.lstrip('.'),
+                                'type': f"{media_kind}/" + Path(file_path).suffix.lstrip('.'),
                                 'path': file_path,  # Store the actual file path
                                 'is_downloaded': True
                             }
                             
-                            # Display video preview
-                            with open(file_path, "rb") as f:
-                                video_bytes = f.read()
-                            st.video(video_bytes)
+                            # Display preview (served from the file, not read into memory)
+                            if media_kind == "audio":
+                                st.audio(file_path)
+                            else:
+                                st.video(file_path)
                             
                             col_a, col_b = st.columns(2)
                             with col_a:
-                                st.info(f"**File:** {Path(file_path).name}")
+                                st.info(f"**File:** {download_name}")
                                 st.info(f"**Size:** {Path(file_path).stat().st_size / 1024 / 1024:.2f} MB")
                             with col_b:
-                                st.info(f"**Type:** video/{Path(file_path).suffix.lstrip('.')}")
+                                st.info(f"**Type:** {st.session_state.uploaded_file['type']}")
                                 st.info(f"**Downloaded:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
                         else:
                             download_placeholder.error(f"❌ {message}")
+                    
+                    stream_clicked = st.button(
+                        "⚡ Analyze while downloading",
+                        key="stream_analyze_button",
+                        use_container_width=True,
+                        help="Skip the separate download: the worker transcribes the audio as it arrives"
+                    )
+            
+            with st.expander("📚 Batch download"):
+                st.text_area(
+                    "One URL per line:",
+                    key="batch_urls",
+                    height=120,
+                    help="Video lengths are checked first; downloads run in parallel (with per-site limits), shortest videos first, and each is queued for analysis as soon as it arrives"
+                )
+                batch_clicked = st.button("⬇️ Download & queue all", key="batch_download_button", use_container_width=True)
     
     with col2:
+        from src.config.app_config import get_config
+        
         st.subheader("⚙️ Analysis Options")
         
         st.markdown("**Enable Analysis Steps:**")
         enable_transcription = st.checkbox("📝 Transcription", value=True)
         enable_summary = st.checkbox("📋 Summary", value=True)
+        enable_llm_summary = st.checkbox("🤖 LLM Summary (Ollama)", value=get_config().analysis.summary_mode == "llm", help="Abstractive summary via Ollama; falls back to extractive if slow or unavailable")
+        enable_keyframes = st.checkbox(
+            "🖼️ On-screen text (keyframes)",
+            value=False,
+            key="enable_keyframes",
+            help="OCR the frames at scene changes and add their text to summary, research and categorization (needs the full video and Tesseract)"
+        )
         enable_research = st.checkbox("🔍 Research", value=True)
         enable_categorization = st.checkbox("🏷️ Categorization", value=True)
         enable_proofreading = st.checkbox("✅ Quality Validation (Ollama)", value=False, help="Requires Ollama running - disabled by default")
         enable_impact = st.checkbox("💡 Project Impact", value=True)
+        reuse_duplicates = st.checkbox("♻️ Reuse analysis of duplicate media", value=False, help="Skip analysis when the same video (or audio/transcript) was analyzed before")
+        
+        language_names = {"auto": "Auto-detect", "en": "English", "es": "Spanish", "pt": "Portuguese", "fr": "French", "de": "German", "it": "Italian", "hi": "Hindi", "ja": "Japanese", "zh": "Chinese"}
+        spoken_language = st.selectbox(
+            "🌐 Spoken language",
+            list(language_names),
+            format_func=language_names.get,
+            help="Auto-detect identifies the language from a short speech sample before transcribing (remembered per file)"
+        )
+        english_only_model = st.checkbox("⚡ English-only Whisper model for English", value=False, help="Faster, more accurate .en model when the speech is English")
         
         st.divider()
         
@@ -249,6 +312,84 @@ if selected == "Upload & Analyze":
     
     st.divider()
     
+    # Settings shared by single analyses and batch downloads
+    base_config = {
+        "steps": {
+            "transcription": enable_transcription,
+            "keyframes": enable_keyframes,
+            "summary": enable_summary,
+            "research": enable_research,
+            "categorization": enable_categorization,
+            "proofreading": enable_proofreading,
+            "impact": enable_impact
+        },
+        "llm_model": llm_model,
+        "temperature": temperature,
+        "ollama_host": "http://localhost:11434",
+        "ollama_model": "mistral",
+        "summary_mode": "llm" if enable_llm_summary else "extractive",
+        "duplicate_policy": "reuse" if reuse_duplicates else "detect",
+        "language": spoken_language,
+        "english_only_model": english_only_model,
+    }
+    
+    # Streamed analysis: the worker downloads the URL and transcribes it as it arrives
+    if stream_clicked:
+        from src.utils.streamlit_utils import get_worker_pool
+        
+        st.session_state.active_job_id = get_worker_pool().queue.submit(
+            url_input.strip(),
+            {
+                **base_config,
+                "download_profile": "audio" if audio_only else "video",
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+    
+    # Batch downloads: each finished file is queued while the others keep downloading
+    if batch_clicked:
+        batch_urls = [line.strip() for line in st.session_state.batch_urls.splitlines() if line.strip()]
+        if not batch_urls:
+            st.warning("⚠️ Paste at least one URL")
+        else:
+            from src.utils.download_manager import DownloadManager
+            from src.utils.download_planner import DownloadPlanner
+            from src.utils.streamlit_utils import get_download_cache, get_media_store, get_metadata_cache, get_worker_pool
+            
+            batch_config = {
+                **base_config,
+                "download_profile": "audio" if audio_only else "video",
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            with st.spinner(f"Planning and downloading {len(batch_urls)} videos..."):
+                with DownloadManager(
+                    profile="audio" if audio_only else "video",
+                    media_store=get_media_store(),
+                    cache=get_download_cache(),
+                    queue=get_worker_pool().queue,
+                    job_config=batch_config,
+                    planner=DownloadPlanner(cache=get_metadata_cache())
+                ) as manager:
+                    batch_results = manager.download_all(batch_urls)
+            
+            queued = sum(1 for r in batch_results if r.job_id is not None)
+            st.success(f"✓ Queued {queued} of {len(batch_results)} videos for analysis - results appear in History as they finish")
+            st.dataframe(
+                [
+                    {
+                        "URL": r.url,
+                        "Platform": r.platform,
+                        "Status": ("✅ Queued (cached)" if r.cached else "✅ Queued") if r.job_id is not None else f"❌ {r.message}",
+                        "Job": r.job_id,
+                        "Est. time (s)": round(r.estimated_seconds) if r.estimated_seconds is not None else None
+                    }
+                    for r in batch_results
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+    
     # Analysis pipeline
     if st.session_state.uploaded_file is not None:
         col_analyze, col_clear = st.columns([4, 1])
@@ -263,57 +404,30 @@ if selected == "Upload & Analyze":
                 
                 # Create analysis configuration
                 analysis_config = {
-                    "steps": {
-                        "transcription": enable_transcription,
-                        "summary": enable_summary,
-                        "research": enable_research,
-                        "categorization": enable_categorization,
-                        "proofreading": enable_proofreading,
-                        "impact": enable_impact
-                    },
-                    "llm_model": llm_model,
-                    "temperature": temperature,
-                    "ollama_host": "http://localhost:11434",
-                    "ollama_model": "mistral",
+                    **base_config,
                     "file_name": st.session_state.uploaded_file['name'] if isinstance(st.session_state.uploaded_file, dict) else st.session_state.uploaded_file.name,
                     "timestamp": datetime.now().isoformat()
                 }
                 
                 try:
-                    # Import analysis module
-                    from src.analysis.pipeline import AnalysisPipeline
+                    # Import job queue module
+                    from src.utils.streamlit_utils import get_media_store, get_worker_pool
                     
                     # Determine file path
                     if isinstance(st.session_state.uploaded_file, dict) and st.session_state.uploaded_file.get('is_downloaded'):
-                        # Downloaded video - use existing path
+                        # Downloaded video - already in the media store
                         file_path = st.session_state.uploaded_file['path']
                     else:
-                        # Uploaded file - save temporarily
-                        temp_dir = Path("temp_uploads")
-                        temp_dir.mkdir(exist_ok=True)
-                        file_path = temp_dir / st.session_state.uploaded_file.name
-                        
-                        with open(file_path, "wb") as f:
-                            f.write(st.session_state.uploaded_file.getbuffer())
-                    
-                    # Update progress
-                    status_text.info("📝 Transcribing audio...")
-                    progress_bar.progress(20)
-                    
-                    # Run pipeline
-                    pipeline = AnalysisPipeline(config=analysis_config)
-                    results = pipeline.run(str(file_path))
-                    
-                    st.session_state.analysis_results = results
-                    st.session_state.analysis_in_progress = False
+                        # Uploaded file - stream it into the media store (no copy if already stored)
+                        media = get_media_store().put_fileobj(
+                            st.session_state.uploaded_file,
+                            st.session_state.uploaded_file.name
+                        )
+                        file_path = media.path
                     
-                    # Final progress
-                    status_text.empty()
-                    progress_bar.progress(100)
-                    st.markdown('<div style="background:#D4EDDA; padding:12px; border-radius:8px; border-left:4px solid #28A745;"><b>✅ Analysis Complete!</b> Results are ready below.</div>', unsafe_allow_html=True)
-                    
-                    import time
-                    time.sleep(1)
+                    # Hand the analysis to the worker pool; progress is polled below
+                    pool = get_worker_pool()
+                    st.session_state.active_job_id = pool.queue.submit(str(file_path), analysis_config)
                     progress_bar.empty()
                     
                 except ImportError:
@@ -342,6 +456,41 @@ if selected == "Upload & Analyze":
                 st.session_state.analysis_results = None
                 st.rerun()
     
+    # Poll the submitted job; the work runs in worker processes, so reruns
+    # only restart this loop and never interrupt the analysis
+    if st.session_state.get("active_job_id") is not None:
+        import time
+        from src.jobs.queue import DONE, FINISHED_STATUSES
+        from src.utils.streamlit_utils import get_results_store, get_worker_pool
+        
+        pool = get_worker_pool()
+        pool.ensure_running()
+        job_id = st.session_state.active_job_id
+        
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        job = pool.queue.get(job_id)
+        while job is not None and job["status"] not in FINISHED_STATUSES:
+            progress_bar.progress(int(job["progress"] * 100))
+            status_text.info(f"⏳ Job #{job_id}: {job['message']}")
+            time.sleep(0.5)
+            job = pool.queue.get(job_id)
+        
+        st.session_state.active_job_id = None
+        st.session_state.analysis_in_progress = False
+        status_text.empty()
+        progress_bar.empty()
+        
+        if job is not None and job["status"] == DONE and job["result_file"]:
+            results = get_results_store().get_file(job["result_file"])
+            if results is not None and job["message"] == "Reused earlier analysis":
+                results = {**results, "reused_from": job["result_file"]}
+            st.session_state.analysis_results = results
+            st.markdown('<div style="background:#D4EDDA; padding:12px; border-radius:8px; border-left:4px solid #28A745;"><b>✅ Analysis Complete!</b> Results are ready below.</div>', unsafe_allow_html=True)
+        else:
+            error = job["error"] if job is not None else "job not found"
+            st.markdown(f'<div style="background:#F8D7DA; padding:12px; border-radius:8px; border-left:4px solid #DC3545;"><b>❌ Analysis Failed</b><br/>{error}</div>', unsafe_allow_html=True)
+    
     # Display results if available
     if st.session_state.analysis_results is not None:
         st.divider()
@@ -349,6 +498,39 @@ if selected == "Upload & Analyze":
         
         results = st.session_state.analysis_results
         
+        if results.get("reused_from"):
+            st.info(f"♻️ Duplicate media detected — showing the earlier analysis from `{results['reused_from']}`")
+        elif results.get("duplicates"):
+            duplicate = results["duplicates"][0]
+            col_dup, col_reuse = st.columns([4, 1])
+            with col_dup:
+                st.warning(
+                    f"⚠️ This video looks like a duplicate ({duplicate['match']} match, "
+                    f"{duplicate['similarity']:.0%}) of `{duplicate['result_file']}`"
+                )
+            with col_reuse:
+                if st.button("♻️ Use earlier analysis", key="reuse_duplicate", use_container_width=True):
+                    from src.utils.streamlit_utils import get_results_store
+                    
+                    prior = get_results_store().get_file(duplicate["result_file"])
+                    if prior is not None:
+                        st.session_state.analysis_results = {**prior, "reused_from": duplicate["result_file"]}
+                        st.rerun()
+        
+        video_metadata = results.get("video_metadata")
+        if video_metadata:
+            with st.expander("📱 Source Video", expanded=False):
+                if video_metadata.get("uploader"):
+                    st.markdown(f"**Uploader:** {video_metadata['uploader']}")
+                metric_cols = st.columns(3)
+                for col, (label, key) in zip(metric_cols, (("Views", "view_count"), ("Likes", "like_count"), ("Comments", "comment_count"))):
+                    with col:
+                        st.metric(label, f"{video_metadata[key]:,}" if video_metadata.get(key) is not None else "-")
+                if video_metadata.get("hashtags"):
+                    st.markdown(" ".join(f"`#{tag}`" for tag in video_metadata["hashtags"]))
+                if video_metadata.get("caption"):
+                    st.text(video_metadata["caption"])
+        
         if "transcription" in results and results["transcription"]:
             with st.expander("📝 Transcription", expanded=True):
                 st.markdown('<div class="result-card transcription">', unsafe_allow_html=True)
@@ -361,6 +543,15 @@ if selected == "Upload & Analyze":
                 )
                 st.markdown('</div>', unsafe_allow_html=True)
         
+        if results.get("on_screen_text"):
+            from src.utils.streamlit_utils import format_duration
+            
+            with st.expander("🖼️ On-screen Text", expanded=False):
+                for keyframe in results.get("keyframes", []):
+                    if keyframe.get("text"):
+                        st.markdown(f"**{format_duration(keyframe['time'])}**")
+                        st.text(keyframe["text"])
+        
         if "summary" in results and results["summary"]:
             with st.expander("📋 Summary", expanded=True):
                 st.markdown('<div class="result-card summary">', unsafe_allow_html=True)
@@ -561,74 +752,140 @@ elif selected == "View Results":
     st.markdown('<div class="main-header">📊 View Results</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">Browse and manage analysis results</div>', unsafe_allow_html=True)
     
-    # Load results from storage
+    # Load result summaries from the results store
+    from src.utils.streamlit_utils import (
+        get_results_page,
+        get_results_store,
+        load_result,
+        load_results_aggregates,
+        render_page_controls,
+        search_results_page,
+    )
+    
     results_dir = Path("results")
     results_dir.mkdir(exist_ok=True)
     
-    result_files = list(results_dir.glob("*.json"))
+    store = get_results_store()
+    
+    search_query = st.text_input(
+        "🔎 Search results",
+        placeholder="Search transcripts, summaries, findings and tags...",
+        key="results_search_query"
+    )
     
-    if result_files:
-        st.subheader("Recent Analyses")
+    if search_query:
+        search_page = st.session_state.get("results_search_page", 1)
+        if st.session_state.get("results_search_last") != search_query:
+            search_page = 1
+        st.session_state.results_search_last = search_query
         
-        # Create a list of results
-        for result_file in sorted(result_files, reverse=True)[:10]:
-            with open(result_file) as f:
-                result_data = json.load(f)
-            
-            col1, col2, col3 = st.columns([3, 2, 1])
+        found = search_results_page(store.version(), search_query, search_page, per_page=10)
+        num_pages = max((found["total"] + found["per_page"] - 1) // found["per_page"], 1)
+        st.caption(f"{found['total']} matching results — page {search_page} of {num_pages}")
+        
+        for hit in found["hits"]:
+            col1, col2 = st.columns([5, 1])
             
             with col1:
-                st.markdown(f"**{result_data.get('file_name', 'Unknown')}**")
-                st.caption(result_data.get('timestamp', 'Unknown date'))
+                st.markdown(f"**{hit['file_name'] or 'Unknown'}** · {hit['timestamp'] or 'Unknown date'}")
+                st.markdown(hit["snippet"])
             
             with col2:
-                if "categorization" in result_data:
-                    cat = result_data["categorization"]
-                    st.markdown(f"Category: `{cat.get('primary', 'Unknown')}`")
-            
-            with col3:
-                if st.button("📂 Open", key=f"open_{result_file.stem}"):
-                    st.session_state.analysis_results = result_data
-                    st.rerun()
+                if st.button("📂 Open", key=f"open_hit_{hit['result_file']}"):
+                    results = store.get_file(hit["result_file"])
+                    if results is None:
+                        st.warning("⚠️ This result is no longer available")
+                    else:
+                        st.session_state.analysis_results = results
+                        st.rerun()
             
             st.divider()
+        
+        col_prev, col_next = st.columns(2)
+        with col_prev:
+            if st.button("⬅️ Previous", disabled=search_page <= 1, key="search_prev"):
+                st.session_state.results_search_page = search_page - 1
+                st.rerun()
+        with col_next:
+            if st.button("Next ➡️", disabled=search_page >= num_pages, key="search_next"):
+                st.session_state.results_search_page = search_page + 1
+                st.rerun()
+        
+        st.session_state.results_search_page = search_page
+    
     else:
-        st.info("No results yet. Upload and analyze a video to get started!")
+        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        aggregates = load_results_aggregates(store.version(), month_start.isoformat())
+        categories = [c for c in aggregates["by_category"] if c]
+        category_filter = st.selectbox("Category", ["All categories"] + categories, key="view_results_category")
+        category = None if category_filter == "All categories" else category_filter
+        
+        result_rows, page, has_next = get_results_page("view_results", page_size=10, category=category)
+        
+        if result_rows:
+            st.subheader("Recent Analyses")
+            
+            # Create a list of results
+            for row in result_rows:
+                col1, col2, col3 = st.columns([3, 2, 1])
+                
+                with col1:
+                    st.markdown(f"**{row['file_name'] or 'Unknown'}**")
+                    st.caption(row['timestamp'] or 'Unknown date')
+                
+                with col2:
+                    if row['primary_category']:
+                        st.markdown(f"Category: `{row['primary_category']}`")
+                
+                with col3:
+                    if st.button("📂 Open", key=f"open_{row['id']}"):
+                        st.session_state.analysis_results = load_result(row['id'])
+                        st.rerun()
+                
+                st.divider()
+            
+            render_page_controls("view_results", result_rows, page, has_next)
+        else:
+            st.info("No results yet. Upload and analyze a video to get started!")
 
 elif selected == "History":
     st.markdown('<div class="main-header">🕐 Analysis History</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">Track your analysis activities</div>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
+    from src.utils.streamlit_utils import (
+        create_results_dataframe,
+        get_results_page,
+        get_results_store,
+        load_results_aggregates,
+        render_page_controls,
+    )
+    
+    month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    aggregates = load_results_aggregates(get_results_store().version(), month_start.isoformat())
+    
+    col1, col2, col3 = st.columns(3)
     
     with col1:
-        results_dir = Path("results")
-        result_files = list(results_dir.glob("*.json")) if results_dir.exists() else []
-        st.metric("Total Analyses", len(result_files))
+        st.metric("Total Analyses", aggregates["total"])
     
     with col2:
-        st.metric("This Month", "3")  # Placeholder
+        st.metric("This Month", aggregates["this_month"])
+    
+    with col3:
+        st.metric("Errors", aggregates["by_status"].get("error", 0))
+    
+    if aggregates["by_category"]:
+        st.bar_chart({(category or "Uncategorized"): count for category, count in aggregates["by_category"].items()})
     
     st.divider()
     
     st.subheader("Activity Timeline")
     
-    if result_files:
-        # Load and display recent activities
-        activities_data = []
-        for rf in sorted(result_files, reverse=True)[:20]:
-            with open(rf) as f:
-                data = json.load(f)
-                activities_data.append({
-                    "Date": data.get("timestamp", "Unknown"),
-                    "File": data.get("file_name", "Unknown"),
-                    "Category": data.get("categorization", {}).get("primary", "Unknown"),
-                    "Status": "Complete" if data else "Error"
-                })
-        
-        import pandas as pd
-        df = pd.DataFrame(activities_data)
-        st.dataframe(df, use_container_width=True)
+    if aggregates["total"]:
+        # Display one page of activities from indexed summary columns
+        rows, page, has_next = get_results_page("history", page_size=20)
+        st.dataframe(create_results_dataframe(rows), use_container_width=True)
+        render_page_controls("history", rows, page, has_next)
     else:
         st.info("No history yet.")
 
@@ -686,13 +943,34 @@ elif selected == "Settings":
             help="Where to store activity logs"
         )
         
+        from src.config.app_config import get_config, save_config
+        from src.utils.streamlit_utils import get_storage_manager
+        
+        app_config = get_config()
+        storage_manager = get_storage_manager()
+        
         auto_cleanup = st.checkbox(
             "Auto-cleanup old results",
-            value=False,
-            help="Automatically delete results older than 30 days"
+            value=app_config.storage.auto_cleanup,
+            help=f"Automatically delete results older than {app_config.storage.max_result_age_days} days"
+        )
+        
+        media_quota_mb = st.number_input(
+            "Temp media quota (MB)",
+            min_value=256,
+            value=app_config.storage.media_quota_mb,
+            step=256,
+            help="Least recently used uploads and downloads are deleted beyond this; media of queued or running analyses is kept"
         )
+        st.caption(f"Temp media in use: {storage_manager.media_store.total_size() / 1024 / 1024:.1f} MB")
         
         if st.button("💾 Save Storage Settings", use_container_width=True):
+            app_config.storage.auto_cleanup = auto_cleanup
+            app_config.storage.media_quota_mb = int(media_quota_mb)
+            save_config(app_config)
+            # Applies from the next background sweep
+            storage_manager.quota_bytes = app_config.storage.media_quota_mb * 1024 * 1024
+            storage_manager.max_result_age_days = app_config.storage.max_result_age_days if auto_cleanup else None
             st.success("Settings saved!")
     
     st.divider()
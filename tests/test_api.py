@@ -0,0 +1,118 @@
+"""
+Tests for the HTTP API
+"""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from src.api import create_app
+
+NO_STEPS = {"steps": {step: False for step in ("transcription", "summary", "research", "categorization", "proofreading", "impact")}}
+
+
+def make_video(tmp_path, name="clip.mp4"):
+    video = tmp_path / "uploads" / name
+    video.parent.mkdir(parents=True, exist_ok=True)
+    video.write_bytes(b"video")
+    return video
+
+
+def make_client(tmp_path, max_pending=32):
+    app = create_app(
+        results_dir=tmp_path / "results",
+        upload_dir=tmp_path / "uploads",
+        max_pending=max_pending,
+        start_workers=False,
+    )
+    return TestClient(app)
+
+
+def test_submit_status_and_pending_result(tmp_path):
+    """Test that jobs are queued and their result is 202 until they finish"""
+    video = make_video(tmp_path)
+
+    with make_client(tmp_path) as client:
+        response = client.post("/jobs", json={"video_path": str(video), "config": {"steps": {"summary": False}}})
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+
+        assert client.get(f"/jobs/{job['id']}").json()["video_path"] == str(video.resolve())
+        assert client.get(f"/jobs/{job['id']}/result").status_code == 202
+        assert client.get("/jobs/999").status_code == 404
+        assert client.post("/jobs", json={"video_path": str(tmp_path / "uploads" / "missing.mp4")}).status_code == 400
+
+
+def test_submissions_are_validated(tmp_path):
+    """Test that media outside the upload directory, server-side config keys and bad priorities are refused"""
+    outside = tmp_path / "outside.mp4"
+    outside.write_bytes(b"video")
+    video = make_video(tmp_path)
+
+    with make_client(tmp_path) as client:
+        assert client.post("/jobs", json={"video_path": str(outside)}).status_code == 400
+        escape = str(tmp_path / "uploads" / ".." / "outside.mp4")
+        assert client.post("/jobs", json={"video_path": escape}).status_code == 400
+
+        response = client.post("/jobs", json={"video_path": str(video), "config": {"taxonomy_path": "/etc/passwd"}})
+        assert response.status_code == 400
+        assert "taxonomy_path" in response.json()["detail"]
+        response = client.post("/jobs/upload", params={"filename": "a.mp4", "config": '{"ollama_host": "http://evil"}'}, content=b"x")
+        assert response.status_code == 400
+        assert client.post("/jobs/batch", json={"urls": ["https://example.com/v"], "config": {"whisper_device": "cuda"}}).status_code == 400
+
+        assert client.post("/jobs", json={"video_path": str(video), "priority": "high"}).status_code == 400
+        assert client.post("/jobs/batch", json={"urls": ["https://example.com/v"], "priority": 1.5}).status_code == 400
+        assert client.app.state.pool.queue.pending() == 0
+
+
+def test_backpressure_and_upload(tmp_path):
+    """Test that uploads are streamed to disk and a full queue answers 429"""
+    with make_client(tmp_path, max_pending=1) as client:
+        response = client.post("/jobs/upload", params={"filename": "my clip.mp4"}, content=b"x" * 1000)
+        assert response.status_code == 202
+        uploaded = Path(response.json()["video_path"])
+        assert uploaded.read_bytes() == b"x" * 1000
+        assert uploaded.suffix == ".mp4"
+
+        response = client.post("/jobs/upload", params={"filename": "other.mp4"}, content=b"y")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "30"
+        assert list((tmp_path / "uploads" / "media" / ".incoming").iterdir()) == []
+
+
+def test_events_end_when_job_finishes(tmp_path):
+    """Test that the progress stream closes with a done event"""
+    video = make_video(tmp_path)
+
+    with make_client(tmp_path) as client:
+        job_id = client.post("/jobs", json={"video_path": str(video)}).json()["id"]
+        client.app.state.pool.queue.cancel(job_id)
+
+        body = client.get(f"/jobs/{job_id}/events").text
+        assert body.startswith("event: done")
+        assert client.get("/search", params={"q": "python"}).json()["total"] == 0
+
+
+def test_workers_save_to_the_api_results_dir(tmp_path, monkeypatch):
+    """Test end to end that jobs run by the API's workers are served from its results directory"""
+    monkeypatch.chdir(tmp_path)
+    video = make_video(tmp_path)
+
+    app = create_app(results_dir=tmp_path / "api-results", upload_dir=tmp_path / "uploads", num_workers=1)
+    with TestClient(app) as client:
+        response = client.post("/jobs", json={"video_path": str(video), "config": {**NO_STEPS, "duplicate_policy": "off"}})
+        job_id = response.json()["id"]
+        job = client.app.state.pool.queue.wait(job_id, timeout=60, poll_interval=0.1)
+        assert job["status"] == "done"
+
+        response = client.get(f"/jobs/{job_id}/result")
+        assert response.status_code == 200
+        assert response.json()["file_name"] == "clip.mp4"
+
+    assert (tmp_path / "api-results" / job["result_file"]).exists()
+    assert not (tmp_path / "results").exists()
@@ -0,0 +1,70 @@
+"""
+Tests for the columnar results archive
+"""
+
+import json
+
+import pytest
+
+from src.storage import ResultsStore, search_results
+from src.storage.archive import export_archive, load_archive_dataframe, restore_archive
+
+pytest.importorskip("pyarrow")
+
+
+def write_results(results_dir):
+    config = {"steps": {"transcription": True, "summary": True}, "llm_model": "ollama:llama2:13b"}
+    for i, category in enumerate(["Education", "Cooking", "Education"]):
+        result = {
+            "file_name": f"video_{i}.mp4",
+            "timestamp": f"2024-01-0{i + 1}T10:00:00",
+            "config": config,
+            "transcription": f"transcript number {i}",
+            "categorization": {"primary_category": category, "tags": ["python", "tips"], "categories": []},
+        }
+        with open(results_dir / f"analysis_{i}.json", "w") as f:
+            json.dump(result, f, indent=2)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_roundtrip_is_byte_identical(tmp_path, suffix):
+    """Test that restored JSON files match the originals exactly"""
+    source = tmp_path / "results"
+    source.mkdir()
+    write_results(source)
+
+    archive = tmp_path / f"history{suffix}"
+    assert export_archive(archive, results_dir=source) == 3
+    assert restore_archive(archive, tmp_path / "restored") == 3
+
+    for original in source.glob("*.json"):
+        assert (tmp_path / "restored" / original.name).read_text() == original.read_text()
+
+
+def test_restored_results_are_listed_and_searchable(tmp_path):
+    """Test that results restored into an existing results directory show up in its store and search"""
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    write_results(results_dir)
+    export_archive(tmp_path / "history.parquet", results_dir=results_dir)
+
+    store = ResultsStore.open(results_dir)
+    for result_file in results_dir.glob("*.json"):
+        result_file.unlink()
+    store.delete_files([f"analysis_{i}.json" for i in range(3)])
+    assert store.count() == 0
+
+    assert restore_archive(tmp_path / "history.parquet", results_dir) == 3
+    assert ResultsStore.open(results_dir).count() == 3
+    assert search_results("number", results_dir=results_dir)["total"] == 3
+
+
+def test_summary_columns_are_dictionary_encoded(tmp_path):
+    """Test that analytics load categories and tags without transcripts"""
+    write_results(tmp_path)
+    export_archive(tmp_path / "history.parquet", results_dir=tmp_path)
+
+    df = load_archive_dataframe(tmp_path / "history.parquet")
+    assert "transcription" not in df.columns
+    assert str(df["primary_category"].dtype) == "category"
+    assert df["primary_category"].value_counts()["Education"] == 2
@@ -0,0 +1,57 @@
+"""
+Tests for the corpus document-frequency store
+"""
+
+import multiprocessing
+from collections import Counter
+
+from src.analysis.corpus_stats import CorpusStats, get_corpus_stats, update_corpus_stats
+
+
+def test_idf_is_neutral_for_empty_corpus():
+    """Test that an empty corpus leaves raw frequencies untouched"""
+    stats = CorpusStats()
+    counts = Counter({"python": 3})
+    assert stats.idf("python") == 1.0
+    assert stats.weight_counts(counts) == counts
+
+
+def test_common_terms_weigh_less_than_rare_terms():
+    """Test that terms seen in every document get the lowest IDF"""
+    stats = CorpusStats()
+    stats.add_document("basically we talk about python")
+    stats.add_document("basically we talk about cooking")
+    stats.add_document("basically a video about travel")
+    assert stats.document_frequency("basically") == 3
+    assert stats.idf("basically") < stats.idf("python") < stats.idf("unseen")
+
+
+def test_placeholder_transcriptions_are_ignored():
+    """Test that pipeline error placeholders are not counted"""
+    stats = CorpusStats()
+    stats.add_document("[Transcription unavailable - file not found]")
+    assert stats.num_documents == 0
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    """Test that incremental saves append to the persisted store"""
+    update_corpus_stats(tmp_path, "first document about python")
+    update_corpus_stats(tmp_path, "second document about rust")
+
+    stats = CorpusStats.load(tmp_path / ".index")
+    assert stats.num_documents == 2
+    assert stats.document_frequency("document") == 2
+    assert stats.document_frequency("rust") == 1
+    assert get_corpus_stats(tmp_path).num_documents == 2
+
+
+def test_concurrent_updates_from_processes_are_not_lost(tmp_path):
+    """Test that worker processes updating one store keep every document"""
+    documents = [(str(tmp_path), f"document {i} shared term{i % 3}") for i in range(24)]
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        pool.starmap(update_corpus_stats, documents)
+
+    stats = CorpusStats.load(tmp_path / ".index")
+    assert stats.num_documents == 24
+    assert stats.document_frequency("shared") == 24
+    assert stats.document_frequency("term0") == 8
@@ -0,0 +1,72 @@
+"""
+Tests for the URL download cache
+"""
+
+import os
+
+from src.storage.download_cache import DownloadCache, download_cached
+from src.storage.media_store import MediaStore
+from src.storage.metadata_cache import MetadataCache
+from src.utils.video_downloader import VideoDownloader
+
+
+class CountingDownloader:
+    """Writes a file per URL and counts network downloads."""
+
+    def __init__(self, directory, profile="video", size=100):
+        self.directory = directory
+        self.profile = profile
+        self.size = size
+        self.calls = 0
+
+    def download(self, url, progress_callback=None, profile=None):
+        self.calls += 1
+        path = self.directory / f"download_{self.calls}.mp4"
+        path.write_bytes(os.urandom(self.size))
+        return True, f"Downloaded: {path.name}", str(path)
+
+    def last_metadata(self):
+        return {"caption": f"Clip {self.calls} #demo", "hashtags": ["demo"]}
+
+
+def test_canonical_keys_merge_url_variants():
+    """Test that query strings, short domains and path variants share one key"""
+    assert VideoDownloader.canonical_key("https://www.instagram.com/reel/Cx_1a/?igsh=abc") == "instagram:Cx_1a"
+    assert VideoDownloader.canonical_key("instagr.am/p/Cx_1a") == "instagram:Cx_1a"
+    assert VideoDownloader.canonical_key("https://youtu.be/dQw4w9WgXcQ?si=1") == \
+        VideoDownloader.canonical_key("https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ") == "youtube:dQw4w9WgXcQ"
+    assert VideoDownloader.canonical_key("https://www.tiktok.com/@a.b/video/7212?lang=en") == "tiktok:7212"
+
+
+def test_repeat_url_is_served_from_cache(tmp_path):
+    """Test that another form of a cached URL needs no download, and video serves audio requests"""
+    store = MediaStore(tmp_path / "store")
+    cache = DownloadCache(store)
+    downloader = CountingDownloader(tmp_path)
+
+    first = download_cached(downloader, "https://www.instagram.com/reel/Cx_1a/", store, cache)
+    second = download_cached(downloader, "https://instagr.am/p/Cx_1a/?utm=x", store, cache, profile="audio")
+
+    assert first.success and not first.cached
+    assert second.cached and second.media.path == first.media.path
+    assert second.file_name == "download_1.mp4"
+    assert downloader.calls == 1
+    # The caption captured by the download is found from the media alone
+    assert MetadataCache(store).for_media(first.media.file_hash)["caption"] == "Clip 1 #demo"
+
+
+def test_lru_eviction_under_quota(tmp_path):
+    """Test that the least recently used blobs are deleted once the quota is exceeded"""
+    store = MediaStore(tmp_path / "store")
+    cache = DownloadCache(store, quota_bytes=250)
+    downloader = CountingDownloader(tmp_path, size=100)
+
+    a = download_cached(downloader, "https://youtu.be/aaaaaaaaaaa", store, cache)
+    b = download_cached(downloader, "https://youtu.be/bbbbbbbbbbb", store, cache)
+    assert cache.lookup("https://youtu.be/aaaaaaaaaaa") is not None  # a is now more recent than b
+    c = download_cached(downloader, "https://youtu.be/ccccccccccc", store, cache)
+
+    assert a.media.path.exists() and c.media.path.exists()
+    assert not b.media.path.exists()
+    assert cache.lookup("https://youtu.be/bbbbbbbbbbb") is None
+    assert cache.total_size() == 200
@@ -0,0 +1,107 @@
+"""
+Tests for the concurrent download manager
+"""
+
+import sys
+import threading
+import time
+import types
+
+from src.jobs import JobQueue
+from src.storage.media_store import MediaStore
+from src.utils.download_manager import DownloadManager, PlatformLimit
+
+
+def install_fake_ytdlp(monkeypatch, tmp_path, delay=0.05):
+    """Replace yt_dlp with a fake that records concurrency and instance reuse."""
+    state = {"active": 0, "max_active": 0, "instances": 0}
+    lock = threading.Lock()
+
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            with lock:
+                state["instances"] += 1
+
+        def extract_info(self, url, download):
+            with lock:
+                state["active"] += 1
+                state["max_active"] = max(state["max_active"], state["active"])
+            time.sleep(delay)
+            with lock:
+                state["active"] -= 1
+            return {"id": url.rstrip("/").rsplit("/", 1)[-1], "ext": "mp4"}
+
+        def prepare_filename(self, info):
+            path = tmp_path / f"instagram_{info['id']}.mp4"
+            path.write_bytes(info["id"].encode())
+            return str(path)
+
+    monkeypatch.setitem(sys.modules, "yt_dlp", types.SimpleNamespace(YoutubeDL=FakeYoutubeDL))
+    return state
+
+
+def test_downloads_respect_platform_limits_and_are_queued(tmp_path, monkeypatch):
+    """Test that one platform's limit holds and every finished file becomes a job"""
+    state = install_fake_ytdlp(monkeypatch, tmp_path / "downloads")
+    (tmp_path / "downloads").mkdir()
+    queue = JobQueue(tmp_path / "jobs.db")
+    urls = [f"https://www.instagram.com/reel/{code}/" for code in ("a1", "b2", "c3", "a1")]
+
+    finished = []
+    with DownloadManager(
+        output_dir=str(tmp_path / "downloads"),
+        max_workers=4,
+        platform_limits={"instagram": PlatformLimit(concurrency=1, min_interval=0.0)},
+        media_store=MediaStore(tmp_path / "media"),
+        queue=queue,
+        job_config={"steps": {"transcription": True}},
+    ) as manager:
+        results = manager.download_all(urls + ["ftp://nowhere"], on_complete=finished.append)
+
+    assert [r.success for r in results] == [True, True, True, False]
+    assert state["max_active"] == 1
+    assert state["instances"] <= 3  # at most one YoutubeDL per worker thread
+    assert len(finished) == 4
+
+    jobs = [queue.get(r.job_id) for r in results[:3]]
+    assert all(job["status"] == "queued" for job in jobs)
+    assert all("/media/" in job["video_path"] for job in jobs)
+
+
+def test_youtube_dl_instance_is_reused_per_thread(tmp_path, monkeypatch):
+    """Test that consecutive downloads on one thread share a YoutubeDL instance"""
+    state = install_fake_ytdlp(monkeypatch, tmp_path, delay=0)
+    with DownloadManager(output_dir=str(tmp_path)) as manager:
+        for code in ("x1", "x2", "x3"):
+            assert manager.downloader.download(f"https://www.instagram.com/p/{code}/")[0]
+    assert state["instances"] == 1
+
+
+def test_planned_batches_queue_files_without_streaming(tmp_path, monkeypatch):
+    """Test that planned downloads are queued shortest first, planned without streaming"""
+    from src.utils.download_planner import DownloadPlanner
+
+    install_fake_ytdlp(monkeypatch, tmp_path / "downloads", delay=0)
+    (tmp_path / "downloads").mkdir()
+    queue = JobQueue(tmp_path / "jobs.db")
+    durations = {"long": 900, "short": 15}
+
+    class FakeInfoDownloader:
+        def get_video_info(self, url):
+            return {"duration": durations[url.rstrip("/").rsplit("/", 1)[-1]], "progressive": True}
+
+        def close(self):
+            pass
+
+    with DownloadManager(
+        output_dir=str(tmp_path / "downloads"),
+        media_store=MediaStore(tmp_path / "media"),
+        queue=queue,
+        planner=DownloadPlanner(downloader=FakeInfoDownloader()),
+    ) as manager:
+        results = manager.download_all([f"https://www.instagram.com/reel/{code}/" for code in durations])
+
+    assert all(result.success for result in results)
+    jobs = [queue.claim("w1"), queue.claim("w1")]
+    assert [job["config"]["source_url"] for job in jobs] == [results[1].url, results[0].url]
+    assert all(job["config"]["stream_transcription"] is False for job in jobs)
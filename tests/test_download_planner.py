@@ -0,0 +1,74 @@
+"""
+Tests for metadata-driven download planning
+"""
+
+from src.storage.media_store import MediaStore
+from src.storage.metadata_cache import MetadataCache
+from src.utils.download_planner import SHORT_MEDIA_SECONDS, DownloadPlanner
+
+
+class FakeDownloader:
+    """Serves canned metadata and counts extractor round trips."""
+
+    def __init__(self, infos):
+        self.infos = infos
+        self.calls = 0
+
+    def get_video_info(self, url):
+        self.calls += 1
+        return self.infos.get(url)
+
+    def close(self):
+        pass
+
+
+def reel(code):
+    return f"https://www.instagram.com/reel/{code}/"
+
+
+def test_plans_are_shortest_first_with_matching_priority():
+    """Test that plans come back cheapest first and their priority is the estimate"""
+    infos = {
+        reel("long"): {"duration": 600, "progressive": True},
+        reel("short"): {"duration": 20},
+        reel("mid"): {"duration": 120, "progressive": False},
+    }
+    planner = DownloadPlanner(downloader=FakeDownloader(infos))
+    plans = planner.plan_all([reel("long"), reel("short"), reel("mid"), reel("short")], {})
+
+    assert [plan.url for plan in plans] == [reel("short"), reel("mid"), reel("long")]
+    assert [plan.priority for plan in plans] == sorted(plan.priority for plan in plans)
+    assert all(plan.priority == round(plan.estimated_seconds) for plan in plans)
+    # Only long, progressive media is transcribed while downloading
+    assert [plan.stream_transcription for plan in plans] == [False, False, True]
+    assert plans[2].config["stream_transcription"] is True
+    assert plans[0].duration < SHORT_MEDIA_SECONDS
+
+
+def test_profile_falls_back_to_video_without_separate_audio():
+    """Test that audio-only jobs fetch the full file when no audio stream exists"""
+    infos = {
+        reel("muxed"): {"duration": 30, "audio_only_available": False},
+        reel("split"): {"duration": 30, "audio_only_available": True},
+    }
+    planner = DownloadPlanner(downloader=FakeDownloader(infos))
+    config = {"steps": {"transcription": True}}
+    profiles = {plan.url: plan.config["download_profile"] for plan in planner.plan_all(list(infos), config)}
+
+    assert profiles == {reel("muxed"): "video", reel("split"): "audio"}
+    # Visual steps always need the video
+    assert planner.plan(reel("split"), {"steps": {"keyframes": True}}).profile == "video"
+
+
+def test_metadata_is_cached_across_plans(tmp_path):
+    """Test that re-planning a URL (or another URL for the same video) uses the cache"""
+    downloader = FakeDownloader({reel("abc"): {"duration": 45}})
+    cache = MetadataCache(MediaStore(tmp_path))
+    planner = DownloadPlanner(downloader=downloader, cache=cache)
+
+    planner.plan_all([reel("abc")], {})
+    plan = planner.plan("https://instagram.com/reel/abc/?igsh=share", {})
+
+    assert downloader.calls == 1
+    assert plan.duration == 45
+    assert MetadataCache(MediaStore(tmp_path), ttl_seconds=0).get(reel("abc")) is None
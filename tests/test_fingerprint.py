@@ -0,0 +1,57 @@
+"""
+Tests for media fingerprints and the duplicate index
+"""
+
+import pytest
+
+from src.analysis.fingerprint import fingerprint_samples, fingerprint_similarity, minhash_signature, minhash_similarity
+from src.storage.duplicate_index import DuplicateIndex
+
+TRANSCRIPT = (
+    "Here is exactly how I would learn agent AI in 2026. First, understand system design "
+    "and define roles, handoffs and delegation for every type of agent you build. Then "
+    "practice with small projects and measure everything you ship."
+)
+
+
+def make_audio(seed, noise=0.0):
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(seed)
+    t = np.arange(8000 * 10) / 8000
+    tones = sum(np.sin(2 * np.pi * f * t) * (1 + np.sin(2 * np.pi * r * t)) for f, r in rng.uniform([200, 0.5], [3000, 3], (6, 2)))
+    return tones + noise * np.random.default_rng(99).standard_normal(len(t))
+
+
+def test_audio_fingerprint_survives_noise():
+    """Test that a re-encoded (noisy) copy matches and other audio does not"""
+    original = fingerprint_samples(make_audio(1))
+    noisy = fingerprint_samples(make_audio(1, noise=0.05))
+    other = fingerprint_samples(make_audio(2))
+    assert fingerprint_similarity(original, noisy) > 0.8
+    assert fingerprint_similarity(original, other) < 0.7
+
+
+def test_minhash_similarity():
+    """Test that a lightly edited transcript scores high and an unrelated one low"""
+    base = minhash_signature(TRANSCRIPT)
+    edited = minhash_signature(TRANSCRIPT + " Follow for more.")
+    unrelated = minhash_signature("Tonight we cook pasta with garlic, olive oil and fresh basil from the garden.")
+    assert minhash_similarity(base, edited) > 0.8
+    assert minhash_similarity(base, unrelated) < 0.2
+    assert minhash_signature("[Transcription failed]") is None
+
+
+def test_duplicate_index_lookups(tmp_path):
+    """Test exact, audio and transcript lookups"""
+    index = DuplicateIndex(tmp_path / "fingerprints.db")
+    fingerprint = fingerprint_samples(make_audio(1))
+    index.add({"file_hash": "abc", "audio_fingerprint": fingerprint, "transcription": TRANSCRIPT}, "analysis_1.json")
+    index.add({"file_hash": "def", "transcription": "Tonight we cook pasta with garlic and basil."}, "analysis_2.json")
+
+    assert index.find_media(file_hash="abc")[0]["match"] == "exact"
+    audio_matches = index.find_media(audio_fingerprint=fingerprint_samples(make_audio(1, noise=0.05)))
+    assert [m["result_file"] for m in audio_matches] == ["analysis_1.json"]
+    assert [m["result_file"] for m in index.find_transcript(TRANSCRIPT + " Follow for more.")] == ["analysis_1.json"]
+
+    index.remove(["analysis_1.json"])
+    assert index.find_media(file_hash="abc") == []
@@ -0,0 +1,64 @@
+"""
+Startup import budget: core modules must load fast and leave heavy dependencies unloaded
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time allowed for each entry point, in seconds (generous for slow CI)
+IMPORT_BUDGET = 0.5
+
+HEAVY_MODULES = ("crewai", "langchain", "pandas", "requests", "yt_dlp", "whisper", "torch", "pyarrow", "fastapi")
+
+ENTRY_POINTS = [
+    "src",
+    "src.analysis",
+    "src.analysis.agents",
+    "src.analysis.pipeline",
+    "src.storage",
+    "src.jobs",
+    "src.api",
+    "src.utils.video_downloader",
+]
+
+
+def measure_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and report its cost and what it loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_point_import_budget(module):
+    """Test that importing an entry point stays within budget and loads no heavy dependency"""
+    report = measure_import(module)
+    assert report["heavy"] == []
+    assert report["elapsed"] < IMPORT_BUDGET, f"import {module} took {report['elapsed']:.2f}s"
+
+
+def test_lazy_exports_still_resolve():
+    """Test that names exported lazily are importable and cached on the package"""
+    import src.analysis.agents as agents
+    from src.analysis import AnalysisPipeline, TranscriptionAgent
+
+    assert TranscriptionAgent is agents.TranscriptionAgent
+    assert "TranscriptionAgent" in vars(agents)
+    assert AnalysisPipeline.__name__ == "AnalysisPipeline"
+    with pytest.raises(AttributeError):
+        agents.NotAnAgent
@@ -0,0 +1,64 @@
+"""
+Tests for the analysis job queue and worker pool
+"""
+
+import time
+
+from src.jobs import JobQueue, WorkerPool
+from src.jobs.queue import DONE, QUEUED, RUNNING
+
+NO_STEPS = {"steps": {step: False for step in ("transcription", "summary", "research", "categorization", "proofreading", "impact")}}
+
+
+def test_claim_order_and_lifecycle(tmp_path):
+    """Test that jobs are claimed by priority then submission order and finish once"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    first = queue.submit("a.mp4", {"x": 1})
+    urgent = queue.submit("b.mp4", {}, priority=-1)
+
+    job = queue.claim("w1")
+    assert job["id"] == urgent and job["status"] == RUNNING
+    assert queue.claim("w2")["config"] == {"x": 1}
+    assert queue.claim("w3") is None
+
+    queue.update_progress(first, 0.5, "Summarizing...")
+    assert queue.get(first)["message"] == "Summarizing..."
+    queue.complete(first, "analysis_1.json")
+    queue.fail(first, "too late")
+    assert queue.get(first)["status"] == DONE
+    assert queue.get(first)["result_file"] == "analysis_1.json"
+
+
+def test_stale_jobs_are_requeued_then_failed(tmp_path):
+    """Test recovery of jobs whose worker stopped sending heartbeats"""
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=2)
+    job_id = queue.submit("a.mp4", {})
+    assert queue.cancel(job_id) is True
+
+    job_id = queue.submit("a.mp4", {})
+    queue.claim("w1")
+    assert queue.requeue_stale(timeout=-1) == 1
+    assert queue.get(job_id)["status"] == QUEUED
+
+    queue.claim("w2")
+    queue.requeue_stale(timeout=-1)
+    assert queue.get(job_id)["status"] == "failed"
+
+
+def test_worker_pool_runs_pipeline(tmp_path, monkeypatch):
+    """Test that worker processes pick up a job and record its result file"""
+    monkeypatch.chdir(tmp_path)
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"not really a video")
+
+    pool = WorkerPool(tmp_path / "out", num_workers=1, poll_interval=0.1, temp_dir=tmp_path / "media")
+    pool.start()
+    try:
+        job_id = pool.queue.submit(str(video), {**NO_STEPS, "duplicate_policy": "off"})
+        job = pool.queue.wait(job_id, timeout=60, poll_interval=0.1)
+    finally:
+        pool.stop()
+
+    assert job["status"] == DONE
+    assert (tmp_path / "out" / job["result_file"]).exists()
+    assert not (tmp_path / "results").exists()
@@ -0,0 +1,65 @@
+"""
+Tests for keyframe selection and on-screen text
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analysis.keyframes import analyze_keyframes, merge_on_screen_text, select_keyframes
+from src.analysis.segmentation import sentence_texts
+
+BOX = 64
+
+
+def frame(pattern="blank", seed=0):
+    """A synthetic grayscale frame: blank, blank with a caption bar, or noise."""
+    image = np.full((BOX, BOX), 40, dtype=np.uint8)
+    if pattern == "caption":
+        image[40:52, 8:56] = 230
+    elif pattern == "noise":
+        image = np.random.default_rng(seed).integers(0, 256, (BOX, BOX), dtype=np.uint8)
+    return image
+
+
+def clip(patterns, fps=2.0):
+    """(time, frame) pairs at ``fps`` for a list of patterns."""
+    return [(i / fps, frame(*pattern) if isinstance(pattern, tuple) else frame(pattern)) for i, pattern in enumerate(patterns)]
+
+
+def test_scene_changes_are_kept_once():
+    """Test that only frames where the picture changes are kept, and repeats are dropped"""
+    patterns = ["blank"] * 4 + ["caption"] * 4 + [("noise", 1)] * 2 + ["caption"] * 2
+    keyframes = select_keyframes(clip(patterns))
+
+    # Cover frame, caption appearing, cut to noise; the caption's return is a duplicate
+    assert [k.time for k in keyframes] == [0.0, 2.0, 4.0]
+    assert keyframes[0].score == 1.0 and all(k.score > 0.05 for k in keyframes)
+
+
+def test_budget_keeps_strongest_changes_per_minute():
+    """Test that at most ``per_minute`` frames per minute and ``max_frames`` overall are kept"""
+    # A cut every 5 seconds for three minutes
+    patterns = [("noise", i // 10) for i in range(360)]
+    keyframes = select_keyframes(clip(patterns), per_minute=3, max_frames=7)
+
+    minutes = [int(k.time // 60) for k in keyframes]
+    assert len(keyframes) == 7
+    assert all(minutes.count(minute) <= 3 for minute in set(minutes))
+    assert keyframes == sorted(keyframes, key=lambda k: k.time)
+
+
+def test_on_screen_text_is_cleaned_and_merged():
+    """Test that OCR noise and repeated captions are dropped and the text joins the transcript"""
+    reads = iter(["SALE 50% OFF\n|~\n", "sale 50% off\nLink in bio", "  "])
+    patterns = ["blank"] * 2 + ["caption"] * 2 + [("noise", 1)] * 2
+    keyframes = analyze_keyframes("clip.mp4", ocr=lambda image: next(reads), frames=clip(patterns))
+
+    assert [k.text for k in keyframes] == ["SALE 50% OFF", "Link in bio", ""]
+    assert all(k.image is None for k in keyframes)
+
+    transcription = "Check this out. It is great."
+    text, spans = merge_on_screen_text(transcription, [[0, 15, 0.0, 1.0], [16, 28, 1.0, 2.0]], [k.to_json() for k in keyframes])
+    assert text.startswith(transcription)
+    assert sentence_texts(text, spans) == ["Check this out.", "It is great.", "SALE 50% OFF", "Link in bio"]
+    assert spans[2][2] == keyframes[0].time
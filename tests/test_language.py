@@ -0,0 +1,78 @@
+"""
+Tests for language identification before transcription
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analysis import language
+from src.analysis.agents.transcription_agent import TranscriptionAgent
+from src.analysis.language import speech_sample
+from src.storage.media_store import MediaStore
+from src.storage.metadata_cache import MetadataCache
+
+RATE = 16000
+
+
+class FakeWhisper:
+    """Records the language each transcription was asked for."""
+
+    def __init__(self):
+        self.languages = []
+
+    def transcribe(self, audio, language=None, **kwargs):
+        self.languages.append(language)
+        return {"text": " hello", "segments": []}
+
+
+def test_speech_sample_skips_silence_and_music_intro():
+    """Test that quiet stretches are left out and the sample is capped"""
+    rng = np.random.default_rng(0)
+    quiet = rng.normal(0, 0.001, 20 * RATE)
+    speech = rng.normal(0, 0.3, 40 * RATE)
+    audio = np.concatenate([quiet, speech]).astype(np.float32)
+
+    sample = speech_sample(audio, RATE, seconds=30)
+
+    assert len(sample) == 30 * RATE
+    assert np.sqrt(np.mean(sample ** 2)) > 0.25
+    # Silence alone comes back as-is rather than as an empty sample
+    assert len(speech_sample(np.zeros(5 * RATE, dtype=np.float32), RATE)) == 5 * RATE
+
+
+def test_language_is_detected_once_and_selects_english_model(monkeypatch):
+    """Test that the first window decides the language and English media gets the .en model"""
+    multilingual, english = FakeWhisper(), FakeWhisper()
+    monkeypatch.setattr(TranscriptionAgent, "_model_cache", {"base_cpu": multilingual, "base.en_cpu": english})
+    calls = []
+    monkeypatch.setattr(language, "detect_language", lambda model, sample: calls.append(model) or ("en", 0.93))
+
+    agent = TranscriptionAgent({"english_only_model": True})
+    window = np.random.default_rng(1).normal(0, 0.3, 30 * RATE).astype(np.float32)
+    agent.transcribe_audio(window)
+    agent.transcribe_audio(window)
+
+    assert calls == [multilingual]
+    assert english.languages == ["en", "en"] and multilingual.languages == []
+    assert agent.detected_language == {"code": "en", "probability": 0.93, "model": "base.en"}
+
+
+def test_uncertain_or_cached_languages(monkeypatch, tmp_path):
+    """Test that unsure detections keep the multilingual model and cached languages skip detection"""
+    model = FakeWhisper()
+    monkeypatch.setattr(TranscriptionAgent, "_model_cache", {"small_cpu": model})
+    monkeypatch.setattr(language, "detect_language", lambda model, sample: ("en", 0.55))
+
+    agent = TranscriptionAgent({"whisper_model": "small", "english_only_model": True})
+    agent.transcribe_audio(np.zeros(RATE, dtype=np.float32))
+    assert agent.model_size == "small" and model.languages == ["en"]
+
+    cache = MetadataCache(MediaStore(tmp_path))
+    cache.put_language("a" * 64, "pt", 0.97)
+    cached = TranscriptionAgent({"whisper_model": "small"})
+    stored = cache.get_language("a" * 64)
+    cached.use_language(stored["code"], stored["probability"])
+    cached.transcribe_audio(np.zeros(RATE, dtype=np.float32))
+    assert model.languages == ["en", "pt"]
+    assert cache.get_language("b" * 64) is None
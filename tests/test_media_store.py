@@ -0,0 +1,42 @@
+"""
+Tests for the content-addressed media store
+"""
+
+import hashlib
+import io
+
+from src.storage.media_store import MediaStore, blob_hash
+
+
+def test_streamed_uploads_are_stored_once(tmp_path):
+    """Test that identical uploads share one blob named by their hash"""
+    store = MediaStore(tmp_path)
+    data = b"frame" * 100_000
+
+    first = store.put_fileobj(io.BytesIO(data), "clip.MP4")
+    second = store.put_stream([data[:1000], data[1000:]], "copy.mp4")
+
+    assert first.file_hash == hashlib.sha256(data).hexdigest()
+    assert first.path.suffix == ".mp4"
+    assert not first.reused and second.reused
+    assert second.path == first.path
+    assert blob_hash(first.path) == first.file_hash
+    assert list(store.incoming_dir.iterdir()) == []
+
+
+def test_put_file_links_or_moves_without_copying(tmp_path):
+    """Test that existing files are hard-linked, or moved in when owned"""
+    store = MediaStore(tmp_path / "store")
+    source = tmp_path / "download.webm"
+    source.write_bytes(b"video bytes")
+
+    linked = store.put_file(source)
+    assert source.exists()
+    assert linked.path.stat().st_ino == source.stat().st_ino
+
+    duplicate = tmp_path / "again.webm"
+    duplicate.write_bytes(b"video bytes")
+    moved = store.put_file(duplicate, move=True)
+    assert moved.reused and moved.path == linked.path
+    assert not duplicate.exists()
+    assert blob_hash(source) is None
@@ -0,0 +1,95 @@
+"""
+Tests for the SQLite results store
+"""
+
+import json
+
+from src.storage import ResultsStore
+
+
+def make_result(timestamp, category="Technology & Programming", transcription="we talk about python"):
+    return {
+        "file_name": f"video_{timestamp}.mp4",
+        "timestamp": timestamp,
+        "file_hash": "abc123",
+        "transcription": transcription,
+        "categorization": {"primary_category": category, "categories": [{"name": category, "confidence": 80}]},
+    }
+
+
+def test_add_and_get_roundtrip(tmp_path):
+    """Test that full documents are stored and loaded back unchanged"""
+    store = ResultsStore.open(tmp_path)
+    result = make_result("2024-01-01T10:00:00")
+    result_id = store.add(result, result_file="analysis_1.json")
+
+    assert store.get(result_id) == result
+    row = store.list()[0]
+    assert row["primary_category"] == "Technology & Programming"
+    assert row["confidence"] == 80
+    assert row["status"] == "complete"
+
+
+def test_keyset_pagination_and_counts(tmp_path):
+    """Test that pages follow each other without overlap and filters use indexed columns"""
+    store = ResultsStore.open(tmp_path)
+    for day in range(1, 6):
+        store.add(make_result(f"2024-01-0{day}T10:00:00"), result_file=f"analysis_{day}.json")
+    store.add(make_result("2024-02-01T10:00:00", category="Cooking", transcription="[Transcription failed]"))
+
+    first_page = store.list(limit=3)
+    last = first_page[-1]
+    second_page = store.list(limit=3, before=(last["timestamp"], last["id"]))
+
+    assert [r["timestamp"] for r in first_page] == ["2024-02-01T10:00:00", "2024-01-05T10:00:00", "2024-01-04T10:00:00"]
+    assert len(second_page) == 3
+    assert store.count() == 6
+    assert store.count(since="2024-02-01") == 1
+    assert store.count(category="Cooking", status="error") == 1
+    assert len(store.find_by_hash("abc123")) == 6
+
+
+def test_existing_json_is_imported_once(tmp_path):
+    """Test that opening a store imports the results directory"""
+    with open(tmp_path / "analysis_20240101_100000.json", "w") as f:
+        json.dump(make_result("2024-01-01T10:00:00"), f)
+
+    assert ResultsStore.open(tmp_path).count() == 1
+    assert ResultsStore.open(tmp_path).count() == 1
+
+    store = ResultsStore.open(tmp_path)
+    assert store.delete_files(["analysis_20240101_100000.json"]) == 1
+    assert store.count() == 0
+
+
+def test_version_and_group_counts(tmp_path):
+    """Test that writes bump the version counter and aggregates group indexed columns"""
+    store = ResultsStore.open(tmp_path)
+    assert store.version() == 0
+
+    store.add(make_result("2024-01-01T10:00:00"), result_file="analysis_1.json")
+    store.add(make_result("2024-01-02T10:00:00", category="Cooking"), result_file="analysis_2.json")
+    store.add(make_result("2024-01-03T10:00:00", category="Cooking"), result_file="analysis_3.json")
+    assert store.version() == 3
+    assert store.group_counts("primary_category") == {"Cooking": 2, "Technology & Programming": 1}
+
+    store.delete_files(["analysis_9.json"])
+    assert store.version() == 3
+    store.delete_files(["analysis_1.json"])
+    assert store.version() == 4
+
+
+def test_rebuild_results_command_resyncs_with_directory(tmp_path, capsys):
+    """Test that rebuild-results drops stale rows and imports the JSON files on disk"""
+    from src.storage.__main__ import main
+
+    store = ResultsStore.open(tmp_path)
+    store.add(make_result("2024-01-01T10:00:00"), result_file="analysis_gone.json")
+    with open(tmp_path / "analysis_20240102_100000.json", "w") as f:
+        json.dump(make_result("2024-01-02T10:00:00", category="Cooking"), f)
+
+    main(["rebuild-results", str(tmp_path)])
+
+    assert "rebuilt with 1 results" in capsys.readouterr().out
+    assert store.count() == 1
+    assert store.group_counts("primary_category") == {"Cooking": 1}
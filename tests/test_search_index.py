@@ -0,0 +1,77 @@
+"""
+Tests for the full-text search index
+"""
+
+import json
+
+from src.storage.search_index import SearchIndex, build_match_query, extract_search_fields
+
+
+def make_result(file_name, transcription, tags=()):
+    return {
+        "file_name": file_name,
+        "timestamp": "2024-01-01T10:00:00",
+        "transcription": transcription,
+        "summary": {"summary": transcription[:40], "key_takeaways": []},
+        "research": {"findings": [f"Key insight: {transcription}"]},
+        "categorization": {"tags": list(tags), "categories": [{"name": "Education", "confidence": 60}]},
+    }
+
+
+def test_build_match_query_escapes_operators():
+    """Test that user input cannot inject FTS5 syntax"""
+    assert build_match_query('python AND "rust') == '"python" "and" "rust"*'
+    assert build_match_query("  ?! ") is None
+
+
+def test_ranked_paginated_highlighted_search(tmp_path):
+    """Test that matches are ranked, paged and highlighted"""
+    index = SearchIndex(tmp_path / "search.db")
+    index.add(make_result("a.mp4", "We cook pasta tonight", tags=["cooking"]), "analysis_a.json")
+    index.add(make_result("b.mp4", "Learning python programming with python examples", tags=["python"]), "analysis_b.json")
+    index.add(make_result("c.mp4", "A short python tip"), "analysis_c.json")
+
+    found = index.search("python", per_page=1)
+    assert found["total"] == 2
+    assert found["hits"][0]["result_file"] == "analysis_b.json"
+    assert "**python**" in found["hits"][0]["snippet"].lower()
+
+    second = index.search("python", page=2, per_page=1)
+    assert second["hits"][0]["result_file"] == "analysis_c.json"
+
+    assert index.search("prog")["total"] == 1
+
+
+def test_reindex_and_remove(tmp_path):
+    """Test that saving the same file again replaces its entry and removal drops it"""
+    index = SearchIndex(tmp_path / "search.db")
+    index.add(make_result("a.mp4", "old topic"), "analysis_a.json")
+    index.add(make_result("a.mp4", "new topic"), "analysis_a.json")
+    assert index.search("old")["total"] == 0
+    assert index.search("new")["total"] == 1
+
+    index.remove(["analysis_a.json"])
+    assert index.count() == 0
+
+
+def test_findings_are_indexed(tmp_path):
+    """Test that research findings (plain strings) are searchable"""
+    result = make_result("a.mp4", "We cook pasta tonight")
+    result["research"]["findings"].append("Key insight: Sourdough needs a long proof")
+    assert "Sourdough" in extract_search_fields(result)["findings"]
+
+    index = SearchIndex(tmp_path / "search.db")
+    index.add(result, "analysis_a.json")
+    assert index.search("sourdough")["total"] == 1
+
+
+def test_open_rebuilds_outdated_index(tmp_path):
+    """Test that an index built by an older extract_search_fields is re-indexed on open"""
+    result = make_result("a.mp4", "We cook pasta tonight")
+    (tmp_path / "analysis_a.json").write_text(json.dumps(result))
+    index = SearchIndex.open(tmp_path)
+    with index._connect() as conn:
+        conn.execute("UPDATE documents_fts SET findings = ''")
+        conn.execute("PRAGMA user_version = 1")
+
+    assert SearchIndex.open(tmp_path).search("insight")["total"] == 1
@@ -0,0 +1,39 @@
+"""
+Tests for sentence segmentation
+"""
+
+from src.analysis.segmentation import (
+    split_sentences,
+    sentence_texts,
+    spans_from_json,
+    spans_to_json,
+)
+
+
+def test_split_handles_decimals_abbreviations_and_questions():
+    """Test that decimals and abbreviations do not end sentences"""
+    text = "It costs 3.5 dollars. Dr. Smith agreed! Did he? Yes."
+    assert sentence_texts(text, split_sentences(text)) == [
+        "It costs 3.5 dollars.",
+        "Dr. Smith agreed!",
+        "Did he?",
+        "Yes.",
+    ]
+
+
+def test_whisper_pauses_add_boundaries_and_times():
+    """Test that long pauses between segments split unpunctuated speech"""
+    text = "so we start here and then we move on"
+    segments = [
+        {"start": 0.0, "end": 1.5, "text": " so we start here"},
+        {"start": 3.0, "end": 4.0, "text": " and then we move on"},
+    ]
+    spans = split_sentences(text, segments)
+    assert sentence_texts(text, spans) == ["so we start here", "and then we move on"]
+    assert (spans[1].t_start, spans[1].t_end) == (3.0, 4.0)
+
+
+def test_spans_json_roundtrip():
+    """Test that spans survive the results JSON format"""
+    spans = split_sentences("One. Two.")
+    assert spans_from_json(spans_to_json(spans)) == spans
@@ -0,0 +1,120 @@
+"""
+Tests for temp storage quota enforcement and cleanup
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.jobs.queue import JobQueue
+from src.storage.media_store import MediaStore
+from src.storage.results_store import ResultsStore
+from src.storage.storage_manager import StorageManager, prune_results
+
+
+def store_blobs(store, count, size=100):
+    """Store ``count`` distinct blobs, each used a second after the previous one."""
+    blobs = []
+    for i in range(count):
+        blobs.append(store.put_stream([bytes([i]) * size], f"clip{i}.mp4"))
+        time.sleep(0.01)
+    return blobs
+
+
+def test_index_tracks_size_and_reconciles(tmp_path):
+    """Test that the index follows stores and removals, and reindex repairs drift"""
+    store = MediaStore(tmp_path)
+    a, b = store_blobs(store, 2)
+    assert store.total_size() == 200
+
+    a.path.unlink()  # deleted behind the store's back
+    stray = store.blob_path("f" * 64, ".m4a")
+    stray.parent.mkdir(parents=True, exist_ok=True)
+    stray.write_bytes(b"x" * 50)
+
+    assert store.reindex() == 2
+    assert store.total_size() == 150
+    assert {media.path for media in store.least_recently_used()} == {b.path, stray}
+
+
+def test_eviction_is_lru_and_spares_pinned_media(tmp_path):
+    """Test that the oldest unpinned blobs go first and media of queued jobs and pins stay"""
+    store = MediaStore(tmp_path / "temp")
+    queue = JobQueue.open(tmp_path / "results")
+    manager = StorageManager(store, quota_bytes=300, queue=queue)
+    oldest, queued, pinned, touched, newest = store_blobs(store, 5)
+    store.touch(touched.file_hash)
+    queue.submit(str(queued.path), {})
+
+    with manager.pin(pinned.file_hash):
+        freed = manager.enforce_quota()
+
+    # Touching made "newest" the least recently used after "oldest"
+    assert freed == 200
+    assert not oldest.path.exists() and not newest.path.exists()
+    assert queued.path.exists() and pinned.path.exists() and touched.path.exists()
+    assert store.total_size() == 300
+    assert manager.pinned_hashes() == {queued.file_hash}
+
+
+def test_sweep_removes_leftovers_and_old_results(tmp_path):
+    """Test that old loose temp files and, with auto-cleanup, old results are deleted"""
+    store = MediaStore(tmp_path / "temp")
+    loose = store.root / "instagram_abc.mp4"
+    fresh = store.root / "downloading.mp4.part"
+    loose.write_bytes(b"old")
+    fresh.write_bytes(b"new")
+    day_ago = time.time() - 25 * 3600
+    os.utime(loose, (day_ago, day_ago))
+
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    results = ResultsStore.open(results_dir)
+    for name, age in (("old.json", 40), ("recent.json", 1)):
+        result = {"file_name": name, "timestamp": (datetime.now() - timedelta(days=age)).isoformat()}
+        (results_dir / name).write_text(json.dumps(result))
+        results.add(result, result_file=name)
+
+    manager = StorageManager(store, results_dir=results_dir, max_result_age_days=30)
+    counts = manager.sweep()
+
+    assert counts["loose_files"] == 1 and counts["results"] == 1
+    assert not loose.exists() and fresh.exists()
+    assert not (results_dir / "old.json").exists() and (results_dir / "recent.json").exists()
+    assert prune_results(results_dir, 30) == 0
+
+
+def test_running_url_job_media_survives_eviction(tmp_path, monkeypatch):
+    """Test that the blob a URL job resolved to is spared by another process's sweeper while it runs"""
+    from src.analysis.pipeline import AnalysisPipeline
+    from src.jobs.worker import process_job
+    from src.storage.download_cache import DownloadCache
+    from src.utils.video_downloader import download_profile
+
+    url = "https://www.instagram.com/reel/abc/"
+    config = {"steps": {"transcription": False}, "duplicate_policy": "off"}
+    store = MediaStore(tmp_path / "temp")
+    downloaded, other = store_blobs(store, 2)
+    DownloadCache(store).record(url, downloaded, download_profile(config))
+
+    queue = JobQueue.open(tmp_path / "results")
+    queue.submit(url, config)
+    job = queue.claim("w1")
+
+    seen = {}
+
+    def run(self, video_path, progress_callback=None, transcript=None):
+        # What the Streamlit or API sweeper does while the job analyzes the file
+        sweeper = StorageManager(MediaStore(tmp_path / "temp"), quota_bytes=0, queue=JobQueue.open(tmp_path / "results"))
+        sweeper.enforce_quota()
+        seen["exists"] = Path(video_path).exists()
+        return {}
+
+    monkeypatch.setattr(AnalysisPipeline, "run", run)
+    process_job(queue, job, tmp_path / "results", tmp_path / "temp")
+
+    assert seen["exists"] and downloaded.path.exists()
+    assert not other.path.exists()
+    assert queue.get(job["id"])["media_path"] == str(downloaded.path)
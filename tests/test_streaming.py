@@ -0,0 +1,126 @@
+"""
+Tests for transcribing media while it downloads
+"""
+
+import queue
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analysis import streaming
+from src.analysis.streaming import WindowedTranscriber, stream_transcribe
+from src.storage.media_store import MediaStore
+
+RATE = 1000  # low sample rate keeps the synthetic audio small
+
+
+class RecordingModel:
+    """Fake Whisper: one segment per window, text numbered by call."""
+
+    def __init__(self):
+        self.windows = []
+        self.prompts = []
+
+    def __call__(self, audio, prompt):
+        self.windows.append(len(audio))
+        self.prompts.append(prompt)
+        duration = len(audio) / RATE
+        text = f"window {len(self.windows)}"
+        return {"text": f" {text}", "segments": [{"start": 0.0, "end": duration, "text": text}]}
+
+
+class PassthroughDecoder:
+    """Stands in for ffmpeg: the 'container' bytes already are s16le PCM."""
+
+    def __init__(self, sample_rate=RATE, block_seconds=1.0):
+        self.sample_rate = RATE
+        self._pcm = queue.Queue()
+
+    def write(self, chunk):
+        self._pcm.put(chunk)
+        return True
+
+    def close(self):
+        self._pcm.put(None)
+
+    def blocks(self):
+        while (block := self._pcm.get()) is not None:
+            yield block
+
+    def wait(self):
+        return True
+
+    def kill(self):
+        pass
+
+
+def speech(seconds, pause_at=()):
+    """Noise with silent 200 ms gaps centred on ``pause_at`` seconds."""
+    audio = np.random.default_rng(0).uniform(-0.5, 0.5, int(seconds * RATE)).astype(np.float32)
+    for at in pause_at:
+        audio[int((at - 0.1) * RATE):int((at + 0.1) * RATE)] = 0.0
+    return audio
+
+
+def test_windows_end_in_pauses_and_keep_timestamps():
+    """Test that windows are cut at pauses and segment times are relative to the media start"""
+    model = RecordingModel()
+    transcriber = WindowedTranscriber(model, sample_rate=RATE, window_seconds=30, cut_search_seconds=3)
+    audio = speech(70, pause_at=(28.5, 57.5))
+    for start in range(0, len(audio), RATE):
+        transcriber.push(audio[start:start + RATE])
+    transcriber.flush()
+
+    assert len(model.windows) == 3
+    assert 28.4 <= model.windows[0] / RATE <= 28.6
+    assert abs(transcriber.segments[1]["start"] - model.windows[0] / RATE) < 1e-9
+    assert transcriber.segments[-1]["end"] == pytest.approx(70.0)
+    assert model.prompts[1] == "window 1"
+    assert transcriber.text == "window 1 window 2 window 3"
+
+
+def test_transcription_starts_before_download_finishes(tmp_path, monkeypatch):
+    """Test that the first window is transcribed while later bytes are still downloading"""
+    monkeypatch.setattr(streaming, "PcmDecoder", PassthroughDecoder)
+    pcm = (speech(65) * 32767).astype("<i2").tobytes()
+    first_window = threading.Event()
+    overlapped = []
+
+    def chunks():
+        half = len(pcm) // 2
+        yield pcm[:half]
+        # Hold back the rest until a window has been transcribed
+        overlapped.append(first_window.wait(timeout=10))
+        yield pcm[half:]
+
+    model = RecordingModel()
+
+    def transcribe_window(audio, prompt):
+        first_window.set()
+        return model(audio, prompt)
+
+    store = MediaStore(tmp_path)
+    streamed = stream_transcribe(chunks(), store, "clip.wav", transcribe_window, window_seconds=30)
+
+    assert overlapped == [True]
+    assert streamed.media.path.read_bytes() == pcm
+    assert streamed.file_name == "clip.wav"
+    assert streamed.transcription.startswith("window 1")
+    assert streamed.segments[-1]["end"] == pytest.approx(65.0, abs=0.01)
+
+
+def test_failed_download_leaves_nothing_in_store(tmp_path, monkeypatch):
+    """Test that a download error propagates and the partial file is discarded"""
+    monkeypatch.setattr(streaming, "PcmDecoder", PassthroughDecoder)
+
+    def chunks():
+        yield b"\x00\x00" * RATE
+        raise ConnectionError("connection reset")
+
+    store = MediaStore(tmp_path)
+    with pytest.raises(ConnectionError):
+        stream_transcribe(chunks(), store, "clip.wav", RecordingModel())
+    assert not any(store.incoming_dir.iterdir())
+    assert not list(store.media_dir.glob("??/*"))
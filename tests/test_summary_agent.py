@@ -0,0 +1,115 @@
+"""
+Tests for the summary agent's LLM map-reduce mode
+"""
+
+import time
+
+import pytest
+import requests
+
+from src.analysis.agents.summary_agent import SummaryAgent
+
+TRANSCRIPT = " ".join(
+    f"Part {i} explains how the team ships feature number {i} to production safely." for i in range(60)
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+
+class FakeOllama:
+    """Stands in for requests.Session talking to an Ollama server."""
+
+    def __init__(self, available=True, delay=0.0):
+        self.available = available
+        self.delay = delay
+        self.prompts = []
+
+    def __call__(self):
+        return self
+
+    def get(self, url, timeout=None):
+        if not self.available:
+            raise requests.ConnectionError("connection refused")
+        return FakeResponse(200, {"models": []})
+
+    def post(self, url, json=None, timeout=None):
+        self.prompts.append(json["prompt"])
+        time.sleep(self.delay)
+        if json["prompt"].startswith("Combine"):
+            return FakeResponse(200, {"response": "Merged summary."})
+        return FakeResponse(200, {"response": f"Chunk summary {len(self.prompts)}."})
+
+
+def make_agent(tmp_path, monkeypatch, ollama, budget=60):
+    monkeypatch.setattr(requests, "Session", ollama)
+    return SummaryAgent({
+        "results_dir": str(tmp_path),
+        "summary_mode": "llm",
+        "summary_llm_budget": budget,
+        "summary_chunk_chars": 500,
+    })
+
+
+def test_llm_summary_maps_chunks_and_merges(tmp_path, monkeypatch):
+    """Test that long transcripts are summarized per chunk and then merged"""
+    ollama = FakeOllama()
+    result = make_agent(tmp_path, monkeypatch, ollama).summarize(TRANSCRIPT)
+
+    assert result["summary_mode"] == "llm"
+    assert result["summary"] == "Merged summary."
+    chunk_prompts = [p for p in ollama.prompts if p.startswith("Summarize")]
+    assert len(chunk_prompts) > 1
+    assert ollama.prompts[-1].startswith("Combine")
+
+
+def test_llm_summary_falls_back_when_over_budget(tmp_path, monkeypatch):
+    """Test that a slow model gives way to the extractive summary within the budget"""
+    agent = make_agent(tmp_path, monkeypatch, FakeOllama(delay=2.0), budget=0.2)
+
+    started = time.monotonic()
+    result = agent.summarize(TRANSCRIPT)
+
+    assert time.monotonic() - started < 1.5
+    assert result["summary_mode"] == "extractive"
+    assert "Part" in result["summary"]
+
+
+def test_llm_summary_falls_back_when_server_unavailable(tmp_path, monkeypatch):
+    """Test that an unreachable Ollama server is not queried"""
+    ollama = FakeOllama(available=False)
+    result = make_agent(tmp_path, monkeypatch, ollama).summarize(TRANSCRIPT)
+
+    assert result["summary_mode"] == "extractive"
+    assert result["summary"]
+    assert ollama.prompts == []
+
+
+@pytest.mark.parametrize("mode", ["llm", "extractive"])
+def test_pipeline_applies_configured_summary_mode(tmp_path, monkeypatch, mode):
+    """Test that AnalysisConfig summary settings reach the agent unless the job overrides them"""
+    from src.analysis.pipeline import AnalysisPipeline
+    from src.config.app_config import get_config
+
+    monkeypatch.setattr(get_config().analysis, "summary_mode", mode)
+    monkeypatch.setattr(get_config().analysis, "summary_llm_workers", 5)
+    monkeypatch.setattr(requests, "Session", FakeOllama(available=False))
+    captured = {}
+    monkeypatch.setattr(SummaryAgent, "summarize", lambda self, text, sentence_spans=None: captured.update(vars(self)) or {})
+
+    pipeline = AnalysisPipeline({}, results_dir=tmp_path)
+    pipeline.results = {"transcription": TRANSCRIPT}
+    pipeline._run_summary()
+    assert captured["mode"] == mode
+    assert captured["llm_workers"] == 5
+
+    pipeline = AnalysisPipeline({"summary_mode": "extractive"}, results_dir=tmp_path)
+    pipeline.results = {"transcription": TRANSCRIPT}
+    pipeline._run_summary()
+    assert captured["mode"] == "extractive"
@@ -0,0 +1,102 @@
+"""
+Tests for the compiled category taxonomy
+"""
+
+import json
+
+from src.analysis.taxonomy import compile_taxonomy, load_taxonomy
+
+
+SAMPLE = {
+    "categories": {
+        "Tutorial": {"keywords": ["how to", "step", "guide"]},
+        "Food": {"keywords": ["recipe", "cook"]},
+    },
+    "research_areas": {
+        "Cooking": {"keywords": ["recipe", "cook", "oven"]},
+    },
+}
+
+
+def test_match_counts_words_and_phrases():
+    """Test that single words and multi-word phrases are both matched"""
+    taxonomy = compile_taxonomy(SAMPLE)
+    counts = taxonomy.match("How to cook: step one, step two. Cooking is fun")
+    scores = taxonomy.category_scores(counts)
+    assert scores["Tutorial"] == (3, 2)
+    assert scores["Food"] == (1, 1)
+
+
+def test_match_counts_regular_plurals():
+    """Test that keywords match their plural forms, but not other inflections"""
+    taxonomy = compile_taxonomy(SAMPLE)
+    counts = taxonomy.match("Two recipes, three steps and more guides. Cooking and cooks")
+    assert taxonomy.category_scores(counts) == {"Tutorial": (2, 2), "Food": (2, 2)}
+
+    plural_sample = {"categories": {"AI": {"keywords": ["model", "study", "neural network", "class"]}}}
+    taxonomy = compile_taxonomy(plural_sample)
+    counts = taxonomy.match("Studies of models: neural networks in classes")
+    assert taxonomy.category_scores(counts)["AI"] == (4, 4)
+
+
+def test_research_areas_need_minimum_keywords():
+    """Test research area thresholds and fallback"""
+    taxonomy = compile_taxonomy(SAMPLE)
+    assert taxonomy.matched_research_areas(taxonomy.match("a recipe for the oven")) == ["Cooking"]
+    assert taxonomy.matched_research_areas(taxonomy.match("nothing here")) == ["Content Analysis"]
+
+
+def test_load_uses_cache_and_invalidates_on_edit(tmp_path):
+    """Test that editing the taxonomy file produces a freshly compiled matcher"""
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps(SAMPLE))
+    first = load_taxonomy(path, cache_dir=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("taxonomy-*.pickle"))) == 1
+
+    path.write_text(json.dumps(dict(SAMPLE, fallback_category="Food")))
+    second = load_taxonomy(path, cache_dir=tmp_path / "cache")
+    assert second.source_hash != first.source_hash
+    assert second.fallback_category == "Food"
+
+
+def test_bundled_taxonomy_compiles():
+    """Test that the default taxonomy file is valid"""
+    taxonomy = load_taxonomy()
+    assert "Technology" in taxonomy.categories
+    assert taxonomy.rule_for_domain("Machine Learning") is not None
+
+
+def test_categorization_uses_video_hashtags(tmp_path):
+    """Test that caption and hashtags inform categories and lead the tags"""
+    from src.analysis.agents.categorization_agent import CategorizationAgent
+
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps(SAMPLE))
+    agent = CategorizationAgent({"taxonomy_path": str(path), "taxonomy_cache_dir": str(tmp_path / "cache")})
+    metadata = {"caption": "Grandma's secret #recipe", "hashtags": ["recipe", "HowTo"]}
+
+    result = agent.categorize("You will love this one.", video_metadata=metadata)
+
+    assert result["primary_category"] in ("Food", "Tutorial")
+    assert {c["name"] for c in result["categories"]} == {"Food", "Tutorial"}
+    assert result["tags"][:2] == ["recipe", "howto"]
+    assert agent.categorize("You will love this one.")["primary_category"] != "Food"
+
+
+def test_research_agent_loads_taxonomy_once(tmp_path, monkeypatch):
+    """Test that research areas come from the taxonomy loaded when the agent is built"""
+    from src.analysis.agents import research_agent
+
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps(SAMPLE))
+    loads = []
+    monkeypatch.setattr(research_agent, "load_taxonomy", lambda *args, **kwargs: loads.append(args) or load_taxonomy(*args, **kwargs))
+    agent = research_agent.ResearchAgent({
+        "results_dir": str(tmp_path / "results"),
+        "taxonomy_path": str(path),
+        "taxonomy_cache_dir": str(tmp_path / "cache"),
+    })
+
+    assert agent.identify_research_areas("Preheat the oven for this recipe") == ["Cooking"]
+    assert agent.identify_research_areas("Cook it slowly, then share the recipe") == ["Cooking"]
+    assert len(loads) == 1
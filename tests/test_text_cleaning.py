@@ -0,0 +1,30 @@
+"""
+Tests for the single-pass transcript cleaner
+"""
+
+from src.analysis.text_cleaning import TranscriptCleaner
+
+
+def test_clean_removes_fillers_and_normalizes_punctuation():
+    """Test filler removal, whitespace collapsing and punctuation runs"""
+    text = "Um so this is , you know, basically   great... Really!!!"
+    assert TranscriptCleaner.clean(text) == "so this is, great. Really!"
+
+
+def test_clean_drops_space_before_punctuation():
+    """Test that gaps left by fillers do not leave a space before punctuation"""
+    assert TranscriptCleaner.clean("It works uh . Then um ?") == "It works. Then?"
+
+
+def test_clean_collapses_punctuation_across_removed_fillers():
+    """Test that a filler between two marks leaves a single mark"""
+    assert TranscriptCleaner.clean("Okay. Um. So we start.") == "Okay. So we start."
+    assert TranscriptCleaner.clean("Great! Uh! Really!") == "Great! Really!"
+
+
+def test_streaming_matches_batch_cleaning():
+    """Test that feeding segments yields the same text as cleaning at once"""
+    segments = ["Um hello there you", " know we", " like . . . ship", " it!! ", "!", " Okay. Um", ". done"]
+    cleaner = TranscriptCleaner()
+    streamed = "".join(cleaner.stream(segments))
+    assert streamed == TranscriptCleaner.clean("".join(segments))
@@ -0,0 +1,92 @@
+"""
+Tests for the video downloader's download profiles
+"""
+
+import sys
+import types
+
+import pytest
+
+from src.analysis.agents.transcription_agent import TranscriptionAgent
+from src.utils.video_downloader import FORMAT_SELECTORS, VideoDownloader, download_profile, video_metadata
+
+
+def test_download_profile_follows_visual_steps():
+    """Test that audio-only is chosen unless a step needs frames"""
+    assert download_profile({"steps": {"transcription": True, "summary": True}}) == "audio"
+    assert download_profile({"steps": {"transcription": True, "keyframes": True}}) == "video"
+    assert download_profile({"steps": {"keyframes": True}, "download_profile": "audio"}) == "video"
+    with pytest.raises(ValueError):
+        VideoDownloader(profile="thumbnail")
+
+
+def test_audio_profile_requests_audio_format(tmp_path, monkeypatch):
+    """Test that the audio profile asks yt-dlp for an audio stream and the result is transcribable"""
+    captured = {}
+
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            captured.update(opts)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def extract_info(self, url, download):
+            return {"id": "abc", "ext": "m4a"}
+
+        def prepare_filename(self, info):
+            path = tmp_path / f"tiktok_{info['id']}.{info['ext']}"
+            path.write_bytes(b"audio")
+            return str(path)
+
+    monkeypatch.setitem(sys.modules, "yt_dlp", types.SimpleNamespace(YoutubeDL=FakeYoutubeDL))
+
+    downloader = VideoDownloader(output_dir=str(tmp_path), profile="audio")
+    success, _, file_path = downloader.download("https://www.tiktok.com/@someone/video/123")
+
+    assert success
+    assert captured["format"] == FORMAT_SELECTORS["audio"]
+    assert TranscriptionAgent({})._is_supported_format(file_path)
+    assert downloader.last_metadata()["video_id"] == "abc"
+
+
+def test_video_metadata_collects_caption_hashtags_and_engagement():
+    """Test that hashtags come from the caption and site tags, deduplicated, with counts kept"""
+    info = {
+        "id": "Cx_1a",
+        "description": "Meal prep in 10 minutes #MealPrep #healthy\n#mealprep",
+        "tags": ["Healthy", "quick dinner"],
+        "uploader": "chef",
+        "like_count": 1200,
+        "view_count": None,
+    }
+    metadata = video_metadata(info)
+
+    assert metadata["hashtags"] == ["MealPrep", "healthy", "quickdinner"]
+    assert metadata["caption"].startswith("Meal prep")
+    assert metadata["like_count"] == 1200 and metadata["comment_count"] is None
+    assert metadata["video_id"] == "Cx_1a" and metadata["uploader"] == "chef"
+
+
+def test_video_info_keeps_metadata_fields(monkeypatch):
+    """Test that get_video_info reports the same uploader and duration as video_metadata"""
+    info = {"id": "Cx_1a", "title": "Meal prep", "channel": "chef", "description": "#MealPrep", "ext": "mp4"}
+
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            pass
+
+        def extract_info(self, url, download):
+            return info
+
+    monkeypatch.setitem(sys.modules, "yt_dlp", types.SimpleNamespace(YoutubeDL=FakeYoutubeDL))
+
+    video_info = VideoDownloader().get_video_info("https://www.instagram.com/reel/Cx_1a/")
+
+    assert video_info["uploader"] == "chef"
+    assert video_info["duration"] is None
+    assert video_info["hashtags"] == ["MealPrep"]
+    assert video_info["description"] == "#MealPrep"